@@ -0,0 +1,136 @@
+"""
+End-to-end delivery load test against the local fake Discord API.
+
+Pushes N posts through DispatchDiscordPoster.fan_out to one or more channels
+over the REST or gateway transport and reports messages/sec, p50/p99 send
+latency (including rate-limit waits and retries) and the number of 429s
+served. With --uneven the first channel gets every post and channel i only
+1/(i+1) of them, so the channels' rate-limit buckets drain at different
+speeds. Each channel's time to its last delivery is reported as well: a
+scheduler that mixes up the channels' buckets shows up as 429s, or as light
+channels waiting on the heavy one's budget.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_delivery --posts 200 --transport rest --latency-ms 50
+    python -m benchmarks.bench_delivery --posts 200 --transport gateway --error-rate 0.05
+    python -m benchmarks.bench_delivery --posts 50 --channels 10
+    python -m benchmarks.bench_delivery --posts 100 --channels 4 --uneven
+"""
+
+import argparse
+import functools
+import json
+import os
+import time
+from typing import List
+from benchmarks.fake_discord import CHANNEL_ID, FakeDiscord, patch_discord_py
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _timed(func, latencies: List[float]):
+    """Wrap an async send so each call's duration is recorded."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+    return wrapper
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Delivery load test against a local fake Discord")
+    arg_parser.add_argument("--posts", type=int, default=200)
+    arg_parser.add_argument("--channels", type=int, default=1, help="channels to fan every post out to")
+    arg_parser.add_argument("--uneven", action="store_true", help="give channel i only 1/(i+1) of the posts")
+    arg_parser.add_argument("--transport", choices=("rest", "gateway"), default="rest")
+    arg_parser.add_argument("--latency-ms", type=float, default=50, help="fake server delay per request")
+    arg_parser.add_argument("--jitter-ms", type=float, default=20, help="random extra delay per request")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of sends answered with a spurious 429")
+    arg_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = arg_parser.parse_args()
+    
+    channel_ids = [str(int(CHANNEL_ID) + i) for i in range(args.channels)]
+    fake = FakeDiscord(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, error_rate=args.error_rate,
+                       guild_channels=channel_ids)
+    base_url = fake.start_in_thread()
+    
+    # src.config reads the environment at import time
+    os.environ.update({
+        "DISCORD_API_BASE": base_url + "/api/v10",
+        "DISCORD_BOT_TOKEN": "fake-token",
+        "DISCORD_CHANNEL_ID": CHANNEL_ID,
+        "DISCORD_TRANSPORT": args.transport,
+        "DRY_RUN": "false",
+        "DISPATCH_LINK_PREVIEWS": "false",  # posts link to pages the benchmark does not serve
+    })
+    import discord
+    from src.discord_poster import DispatchDiscordPoster
+    from src.discord_rest import DiscordRestClient
+    from src.post import DispatchPost
+    
+    latencies: List[float] = []
+    if args.transport == "gateway":
+        patch_discord_py(base_url)
+        discord.abc.Messageable.send = _timed(discord.abc.Messageable.send, latencies)
+    else:
+        DiscordRestClient.send_message = _timed(DiscordRestClient.send_message, latencies)
+    
+    posts = [
+        DispatchPost(
+            title=f"Load test post {i}",
+            link=f"https://dispatch.thorcollective.com/p/load-{i}",
+            content_snippet="Threat hunting notes. " * 12,
+            author="Ask-a-Thrunter",
+        )
+        for i in range(args.posts)
+    ]
+    deliveries = {
+        channel_id: posts[:len(posts) // (i + 1)] if args.uneven else posts
+        for i, channel_id in enumerate(channel_ids)
+    }
+    finished = {}
+    
+    def on_posted(channel_id, post, message_id):
+        finished[channel_id] = round(time.perf_counter() - start, 3)
+    
+    start = time.perf_counter()
+    results = DispatchDiscordPoster().fan_out(deliveries, on_posted=on_posted)
+    elapsed = time.perf_counter() - start
+    delivered = sum(results.values())
+    fake.stop_thread()
+    
+    report = {
+        "transport": args.transport,
+        "posts": args.posts,
+        "channels": args.channels,
+        "uneven": args.uneven,
+        "deliveries": sum(len(channel_posts) for channel_posts in deliveries.values()),
+        "delivered": delivered,
+        "messages": fake.stats["messages"],
+        "seconds": round(elapsed, 3),
+        "messages_per_sec": round(fake.stats["messages"] / elapsed, 2),
+        "posts_per_sec": round(delivered / elapsed, 2),
+        "send_p50_ms": round(percentile(latencies, 0.5) * 1000, 1) if latencies else None,
+        "send_p99_ms": round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+        "rate_limited": fake.stats["rate_limited"],
+        "injected_errors": fake.stats["errors"],
+        "channel_seconds": [finished.get(channel_id) for channel_id in channel_ids],
+    }
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for key, value in report.items():
+        print(f"{key:<18} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Snippet extraction cost versus article size: regex cleanup versus html_to_snippet.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_html_snippet
+"""
+
+import html
+import re
+import timeit
+from benchmarks.synthetic import html_body
+from src.html_snippet import html_to_snippet
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def old_snippet(content_snippet: str) -> str:
+    """The previous cleanup from extract_post_data."""
+    content_snippet = re.sub(r'<[^>]+>', '', content_snippet)
+    content_snippet = html.unescape(content_snippet)
+    return content_snippet[:300] + "..." if len(content_snippet) > 300 else content_snippet
+
+
+def _best_us(func, body: str) -> float:
+    number = max(1, 200_000 // len(body))
+    return min(timeit.repeat(lambda: func(body), number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    print(f"{'body size':>10} {'regex (us)':>12} {'html_to_snippet (us)':>22}")
+    for size in SIZES:
+        body = html_body(size)
+        print(f"{size:>10} {_best_us(old_snippet, body):>12.0f} {_best_us(html_to_snippet, body):>22.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Per-post logging overhead: synchronous FileHandler versus the queued setup.
+
+Replays the log lines one delivered post produces (filter, packing and
+send messages) N times and reports the time the calling thread spends per
+post for each configuration, plus how long each takes until everything is
+on disk. --write-delay-ms adds a sleep to every file write to stand in for
+a slow or contended disk. Everything is written to a temporary directory.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging --posts 20000
+    python -m benchmarks.bench_logging --posts 2000 --write-delay-ms 0.5
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Dict
+from src.config import LOG_FORMAT
+from src.logging_setup import configure_logging, stop_logging
+
+# Loggers and messages emitted for each post on its way to Discord
+LOGGERS = ("src.rss_handler", "src.discord_poster", "src.discord_rest")
+
+
+def emit_post(n: int, loggers: Dict[str, logging.Logger]) -> None:
+    """Log what one post produces on the INFO level and below."""
+    loggers["src.rss_handler"].info("Found new post: %s", f"Dispatch post {n}: hunting notes")
+    loggers["src.rss_handler"].debug("Post already posted: %s", f"Dispatch post {n - 1}")
+    loggers["src.discord_poster"].info("Sending message %d/%d with %d embeds to %s", n + 1, n + 1, 1, "42")
+    loggers["src.discord_poster"].debug("Formatted Discord message: %s", "x" * 2000)
+    loggers["src.discord_poster"].info("Message sent with ID: %s", 1400000000000000000 + n)
+
+
+def _reset_root() -> None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def _sync_file(path: str) -> None:
+    """The previous setup: a plain FileHandler written from the calling thread."""
+    handler = logging.FileHandler(path, delay=True)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def _queued(path: str) -> None:
+    listener = configure_logging(log_file=path)
+    # Keep the console quiet so only the file write is measured
+    listener.handlers = tuple(h for h in listener.handlers if isinstance(h, logging.FileHandler))
+
+
+def _queued_unsampled(path: str) -> None:
+    _queued(path)
+    for handler in logging.getLogger().handlers:
+        handler.filters.clear()
+
+
+def _slow_writes(delay: float) -> None:
+    """Make every file write sleep for delay seconds."""
+    emit = logging.FileHandler.emit
+    
+    def slow_emit(self, record):
+        emit(self, record)
+        time.sleep(delay)
+    
+    logging.FileHandler.emit = slow_emit
+
+
+def measure(name: str, setup: Callable[[str], None], posts: int, tmp: str) -> Dict:
+    """
+    Time the calling thread's cost of logging posts under one setup.
+    
+    Args:
+        name: Configuration name
+        setup: Function installing the handlers, given the log file path
+        posts: Number of posts to log
+        tmp: Directory for the log file
+        
+    Returns:
+        Result dictionary
+    """
+    path = os.path.join(tmp, f"{name}.log")
+    setup(path)
+    loggers = {logger_name: logging.getLogger(logger_name) for logger_name in LOGGERS}
+    
+    start = time.perf_counter()
+    for n in range(posts):
+        emit_post(n, loggers)
+    caller = time.perf_counter() - start
+    
+    stop_logging()
+    total = time.perf_counter() - start
+    _reset_root()
+    
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    result = {
+        "setup": name,
+        "us_per_post": caller / posts * 1e6,
+        "drained_s": total,
+        "log_bytes": size,
+    }
+    print(f"{name:<12} {result['us_per_post']:>8.2f} us/post in caller   "
+          f"{total:>6.2f} s until on disk   {size / 1024:>8.0f} KiB written", flush=True)
+    return result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Per-post logging overhead")
+    arg_parser.add_argument("--posts", type=int, default=20_000)
+    arg_parser.add_argument("--write-delay-ms", type=float, default=0,
+                            help="simulated latency of each log file write")
+    args = arg_parser.parse_args()
+    
+    if args.write_delay_ms:
+        _slow_writes(args.write_delay_ms / 1000)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        measure("sync_file", _sync_file, args.posts, tmp)
+        measure("queued_all", _queued_unsampled, args.posts, tmp)
+        measure("queued", _queued, args.posts, tmp)
+
+
+if __name__ == "__main__":
+    main()
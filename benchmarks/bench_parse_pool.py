@@ -0,0 +1,142 @@
+"""
+Feed parsing throughput against the number of parse worker processes.
+
+Parses a corpus of saved feeds with src.parse_pool.parse_feeds, first
+in-process and then over 2, 4, ... worker processes up to the core count,
+and reports feeds, entries and megabytes parsed per second along with the
+speedup over in-process parsing. Pool startup is timed separately, since a
+daemon pays it once. The pool holds DISPATCH_PARSE_WORKERS processes (the
+core count by default), so set it to measure more workers than cores. Also shows how much smaller a worker's compact result
+is than a pickled feedparser result for the same feed.
+
+The corpus is a directory of saved feed documents (*.xml, *.rss, *.atom);
+without one, synthetic Substack-shaped feeds are written to a temporary
+directory and read back.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parse_pool
+    python -m benchmarks.bench_parse_pool --corpus saved_feeds/ --workers 1 2 4 8
+    python -m benchmarks.bench_parse_pool --feeds 200 --entries 20
+"""
+
+import argparse
+import glob
+import json
+import os
+import pickle
+import tempfile
+import time
+from typing import List, Tuple
+import feedparser
+from benchmarks.synthetic import make_feed
+from src.parse_pool import compact_feed, parse_feeds, parse_pool, pool_size, shutdown_parse_pool
+
+CORPUS_PATTERNS = ("*.xml", "*.rss", "*.atom")
+HEADERS = {"Content-Type": "application/rss+xml; charset=utf-8"}
+
+
+def load_corpus(directory: str) -> List[Tuple[bytes, dict]]:
+    """Read every saved feed in a directory."""
+    paths = sorted(path for pattern in CORPUS_PATTERNS for path in glob.glob(os.path.join(directory, pattern)))
+    bodies = []
+    for path in paths:
+        with open(path, "rb") as f:
+            bodies.append((f.read(), HEADERS))
+    return bodies
+
+
+def write_synthetic_corpus(directory: str, feeds: int, entries: int, body_size: int) -> None:
+    """Save synthetic feeds as a corpus."""
+    for i in range(feeds):
+        with open(os.path.join(directory, f"feed-{i:04d}.xml"), "wb") as f:
+            f.write(make_feed(entries, body_size=body_size, start=1_790_000_000 - i * 600))
+
+
+def default_workers() -> List[int]:
+    """1, 2, 4, ... up to the core count (and the core count itself)."""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Parse throughput vs. worker processes")
+    arg_parser.add_argument("--corpus", help="directory of saved feeds (default: synthetic corpus)")
+    arg_parser.add_argument("--feeds", type=int, default=100, help="synthetic feeds")
+    arg_parser.add_argument("--entries", type=int, default=20, help="entries per synthetic feed")
+    arg_parser.add_argument("--body-size", type=int, default=4000, help="characters per synthetic entry body")
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=None, help="worker counts to measure")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="timed rounds per worker count (best is kept)")
+    arg_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = arg_parser.parse_args()
+    
+    if args.corpus:
+        bodies = load_corpus(args.corpus)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_synthetic_corpus(tmp, args.feeds, args.entries, args.body_size)
+            bodies = load_corpus(tmp)
+    if not bodies:
+        print("Corpus is empty")
+        return
+    
+    total_bytes = sum(len(content) for content, _ in bodies)
+    sample = bodies[0][0]
+    report = {
+        "feeds": len(bodies),
+        "corpus_mb": round(total_bytes / 1e6, 2),
+        "cores": os.cpu_count(),
+        "pickled_feedparser_kb": round(len(pickle.dumps(feedparser.parse(sample))) / 1024, 1),
+        "pickled_compact_kb": round(len(pickle.dumps(compact_feed(sample, {}))) / 1024, 1),
+        "runs": [],
+    }
+    
+    baseline = None
+    for workers in sorted({min(workers, pool_size()) for workers in args.workers or default_workers()}):
+        startup = 0.0
+        if workers > 1:
+            start = time.perf_counter()
+            pool = parse_pool()
+            # Make every worker import feedparser before timing starts
+            list(pool.map(compact_feed, [sample] * workers, [{}] * workers))
+            startup = time.perf_counter() - start
+        
+        best = float("inf")
+        entries = 0
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            feeds = parse_feeds(bodies, workers)
+            best = min(best, time.perf_counter() - start)
+            entries = sum(len(feed.entries) for feed in feeds if feed)
+        shutdown_parse_pool()
+        
+        baseline = baseline or best
+        report["runs"].append({
+            "workers": workers,
+            "seconds": round(best, 3),
+            "pool_startup_seconds": round(startup, 3),
+            "feeds_per_second": round(len(bodies) / best, 1),
+            "entries_per_second": round(entries / best),
+            "mb_per_second": round(total_bytes / 1e6 / best, 2),
+            "speedup": round(baseline / best, 2),
+        })
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['feeds']} feeds, {report['corpus_mb']} MB, {report['cores']} cores; one feed pickles to "
+          f"{report['pickled_feedparser_kb']} KiB from feedparser, {report['pickled_compact_kb']} KiB compact")
+    print(f"{'workers':>7} {'seconds':>8} {'startup':>8} {'feeds/s':>8} {'entries/s':>10} {'MB/s':>6} {'speedup':>8}")
+    for run in report["runs"]:
+        print(f"{run['workers']:>7} {run['seconds']:>8.3f} {run['pool_startup_seconds']:>8.3f} "
+              f"{run['feeds_per_second']:>8.1f} {run['entries_per_second']:>10} {run['mb_per_second']:>6.2f} "
+              f"{run['speedup']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
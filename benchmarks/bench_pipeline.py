@@ -0,0 +1,217 @@
+"""
+Microbenchmarks for the fetch-filter-extract-format pipeline, all offline.
+
+Covers feedparser on saved XML, get_latest_dispatch_posts, extract_post_data
+with small and huge HTML bodies, format_dispatch_message with over-length
+content and embed construction for post_multiple_to_discord, on synthetic
+feeds of 10, 1k and 100k entries. Results can be saved as JSON and compared
+against a previous run.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline --output before.json
+    python -m benchmarks.bench_pipeline --compare before.json --max-regression 20
+
+The 100k-entry cases take a few minutes; pass --sizes 10 1000 for a quick run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+import feedparser
+from benchmarks.synthetic import html_body, make_feed
+from src.discord_poster import DispatchDiscordPoster, build_embeds
+from src.embed_packing import pack_embeds
+from src.rss_handler import extract_post_data, get_latest_dispatch_posts
+from src.stream_parser import FeedEntry
+
+SIZES = (10, 1_000, 100_000)
+FEED_BODY_SIZE = 200  # per entry; keeps the 100k-entry feed around 40 MB
+HTML_BODY_SIZES = (1_000, 1_000_000)
+MESSAGE_CONTENT_SIZE = 5_000  # well past Discord's 2000-character message limit
+ROUND_TIME = 0.1  # seconds, target duration of one timing round
+ROUNDS = 5
+
+
+def _bench(name: str, func: Callable[[], object], params: Dict) -> Dict:
+    """
+    Time func() and describe the result.
+    
+    Each round calls func enough times to last about ROUND_TIME; calls slower
+    than that are timed individually and repeated fewer times.
+    
+    Args:
+        name: Benchmark name
+        func: Function to time
+        params: Parameters recorded with the result
+        
+    Returns:
+        Result dictionary with per-call times in seconds
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    
+    if first >= 1:
+        # Too slow to repeat; the first call is the measurement
+        number = 1
+        times = [first]
+    else:
+        number = max(1, int(ROUND_TIME / first)) if first > 0 else 1000
+        times = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+    
+    result = {
+        "name": name,
+        "params": params,
+        "best": min(times),
+        "median": statistics.median(times),
+        "rounds": len(times),
+        "number": number,
+    }
+    label = name + "[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+    print(f"{label:<52} {result['best'] * 1e3:>12.3f} ms", flush=True)
+    return result
+
+
+def run(sizes: List[int]) -> List[Dict]:
+    """
+    Run every benchmark.
+    
+    Args:
+        sizes: Feed sizes in entries
+        
+    Returns:
+        Benchmark results
+    """
+    results = []
+    poster = DispatchDiscordPoster(channel_id="0")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            # Space entries an hour apart so a one-hour window sees one new post
+            path = os.path.join(tmp, f"feed_{size}.xml")
+            with open(path, 'wb') as f:
+                f.write(make_feed(size, body_size=FEED_BODY_SIZE))
+            
+            params = {"entries": size}
+            results.append(_bench("feedparser_parse", lambda: feedparser.parse(path), params))
+            
+            feed = feedparser.parse(path)
+            results.append(_bench("filter_one_new",
+                                  lambda: get_latest_dispatch_posts(feed, hours_back=1), params))
+            results.append(_bench("filter_all_new",
+                                  lambda: get_latest_dispatch_posts(feed, hours_back=size + 1), params))
+            
+            posts = get_latest_dispatch_posts(feed, hours_back=size + 1)
+            results.append(_bench("build_embeds",
+                                  lambda: pack_embeds(build_embeds(posts)), params))
+            del feed, posts
+    
+    for body_size in HTML_BODY_SIZES:
+        entry = FeedEntry(
+            title="Dispatch post: hunting notes",
+            link="https://dispatch.thorcollective.com/p/post",
+            id="post",
+            author="Ask-a-Thrunter",
+            published="Mon, 04 Aug 2025 12:00:00 GMT",
+            summary=html_body(body_size),
+        )
+        results.append(_bench("extract_post_data", lambda: extract_post_data(entry), {"body": body_size}))
+    
+    content = "Threat hunting notes. " * (MESSAGE_CONTENT_SIZE // 22)
+    results.append(_bench(
+        "format_dispatch_message",
+        lambda: poster.format_dispatch_message("Dispatch post", "dispatch.thorcollective.com/p/post", content),
+        {"content": len(content)}
+    ))
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(result: Dict) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results: List[Dict], baseline_path: str, max_regression: Optional[float]) -> bool:
+    """
+    Print the change in best time against a saved run.
+    
+    Args:
+        results: Current results
+        baseline_path: JSON file written by an earlier --output
+        max_regression: Optional allowed slowdown in percent
+        
+    Returns:
+        True if no benchmark regressed beyond max_regression
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    before = {_key(result): result for result in baseline["results"]}
+    
+    print(f"\nCompared with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    ok = True
+    for result in results:
+        old = before.get(_key(result))
+        if not old:
+            continue
+        change = (result["best"] / old["best"] - 1) * 100
+        regressed = max_regression is not None and change > max_regression
+        ok = ok and not regressed
+        label = result["name"] + str(result["params"])
+        print(f"{label:<52} {old['best'] * 1e3:>10.3f} -> {result['best'] * 1e3:>10.3f} ms "
+              f"({change:+.1f}%){'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                            help="feed sizes in entries (default: 10 1000 100000)")
+    arg_parser.add_argument("--output", help="write results as JSON to this file")
+    arg_parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    arg_parser.add_argument("--max-regression", type=float,
+                            help="with --compare, exit non-zero if any benchmark is this many percent slower")
+    args = arg_parser.parse_args()
+    
+    results = run(args.sizes)
+    
+    if args.output:
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "feedparser": feedparser.__version__,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            },
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+    
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
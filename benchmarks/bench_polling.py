@@ -0,0 +1,164 @@
+"""
+Detection latency and poll count: adaptive polling versus a fixed interval.
+
+Replays a synthetic publishing rhythm (posts around the same times every
+week, plus occasional off-schedule posts) against the PollScheduler on a
+simulated clock and against fixed-interval polling. Reports polls per week
+and the mean/p90 time from publication to detection for each, and for the
+scheduler also the latency its own schedule expected. The first
+--train-weeks are used to learn the rhythm and are not scored. --tick rounds
+every poll up to the next multiple of that many seconds, like a cron
+schedule would.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_polling --weeks 8
+    python -m benchmarks.bench_polling --weeks 8 --tick 3600 --fixed-interval 3600
+"""
+
+import argparse
+import calendar
+import random
+import time
+from email.utils import formatdate
+from typing import Dict, List, Tuple
+from src.feeds import FeedConfig
+from src.poll_scheduler import HOUR, WEEK, PollScheduler
+from src.post import DispatchPost
+
+DAY = 24 * HOUR
+# A Monday, 00:00 UTC
+EPOCH = calendar.timegm((2026, 1, 5, 0, 0, 0))
+FEED = FeedConfig(name="Synthetic", url="https://example.invalid/feed", channel_id="1")
+
+
+class SimulatedFeed:
+    """What a poll of the feed returns at a point in time."""
+    
+    def __init__(self, published: List[float]):
+        self.entries = [{'published_parsed': time.gmtime(t)} for t in reversed(published[-20:])]
+        self.feed = {}
+
+
+def publish_times(weeks: int, slots: List[Tuple[int, float]], jitter: float, extra_rate: float,
+                  rng: random.Random) -> List[float]:
+    """
+    Generate publication times.
+    
+    Args:
+        weeks: Number of weeks to generate
+        slots: (weekday, hour) of the regular posts, Monday being 0
+        jitter: Standard deviation of each regular post around its slot, seconds
+        extra_rate: Off-schedule posts per week
+        rng: Random source
+        
+    Returns:
+        Sorted epoch seconds
+    """
+    times = []
+    for week in range(weeks):
+        for weekday, hour in slots:
+            times.append(EPOCH + week * WEEK + weekday * DAY + hour * HOUR + rng.gauss(0, jitter))
+        for _ in range(int(extra_rate) + (rng.random() < extra_rate % 1)):
+            times.append(EPOCH + week * WEEK + rng.uniform(0, WEEK))
+    return sorted(times)
+
+
+def _latencies(published: List[float], polls: List[float], scored_from: float) -> List[float]:
+    """Time from each scored post to the first poll at or after it."""
+    latencies = []
+    poll_index = 0
+    for t in published:
+        while poll_index < len(polls) and polls[poll_index] < t:
+            poll_index += 1
+        if t >= scored_from and poll_index < len(polls):
+            latencies.append(polls[poll_index] - t)
+    return latencies
+
+
+def _round_up(t: float, tick: float) -> float:
+    return t if not tick else (t // tick + 1) * tick if t % tick else t
+
+
+def simulate_fixed(published: List[float], end: float, interval: float) -> List[float]:
+    """Poll times of a fixed-interval schedule."""
+    polls = []
+    t = EPOCH
+    while t <= end:
+        polls.append(t)
+        t += interval
+    return polls
+
+
+def simulate_adaptive(published: List[float], end: float, tick: float) -> Tuple[List[float], PollScheduler]:
+    """Poll times chosen by the scheduler, fed what each poll would have found."""
+    scheduler = PollScheduler()
+    scheduler._feeds = {}  # start from scratch, never the local state directory
+    scheduler._feed_cache = {}
+    
+    polls = []
+    visible = 0
+    t = EPOCH
+    while t <= end:
+        polls.append(t)
+        seen_before = visible
+        while visible < len(published) and published[visible] <= t:
+            visible += 1
+        new_posts = [
+            DispatchPost(f"Post {n}", f"https://example.invalid/p/{n}", pub_date=formatdate(published[n]))
+            for n in range(seen_before, visible)
+        ]
+        interval = scheduler.observe(FEED, SimulatedFeed(published[:visible]), new_posts, now=t)
+        t = _round_up(t + interval, tick)
+    return polls, scheduler
+
+
+def _report(name: str, polls: List[float], latencies: List[float], scored_from: float, weeks: float) -> Dict:
+    scored_polls = sum(1 for t in polls if t >= scored_from)
+    ordered = sorted(latencies)
+    result = {
+        "schedule": name,
+        "polls_per_week": scored_polls / weeks,
+        "mean_latency_min": sum(ordered) / len(ordered) / 60 if ordered else 0.0,
+        "p90_latency_min": ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))] / 60 if ordered else 0.0,
+    }
+    print(f"{name:<22} {result['polls_per_week']:>7.1f} polls/week   "
+          f"latency mean {result['mean_latency_min']:>6.1f}m   p90 {result['p90_latency_min']:>6.1f}m", flush=True)
+    return result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Adaptive versus fixed-interval polling")
+    arg_parser.add_argument("--weeks", type=int, default=8, help="scored weeks")
+    arg_parser.add_argument("--train-weeks", type=int, default=4)
+    arg_parser.add_argument("--fixed-interval", type=float, default=3600, help="seconds, baseline schedule")
+    arg_parser.add_argument("--tick", type=float, default=0, help="round polls up to this many seconds (cron)")
+    arg_parser.add_argument("--jitter-min", type=float, default=20, help="spread of regular posts, minutes")
+    arg_parser.add_argument("--extra-per-week", type=float, default=0.5, help="off-schedule posts per week")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    args = arg_parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    total_weeks = args.train_weeks + args.weeks
+    # Tuesday and Thursday afternoons, Saturday morning
+    slots = [(1, 14.0), (3, 14.0), (5, 9.5)]
+    published = publish_times(total_weeks, slots, args.jitter_min * 60, args.extra_per_week, rng)
+    end = EPOCH + total_weeks * WEEK
+    scored_from = EPOCH + args.train_weeks * WEEK
+    print(f"{sum(1 for t in published if t >= scored_from)} scored posts over {args.weeks} weeks")
+    
+    fixed = simulate_fixed(published, end, args.fixed_interval)
+    _report(f"fixed {args.fixed_interval / 60:.0f}m", fixed, _latencies(published, fixed, scored_from),
+            scored_from, args.weeks)
+    
+    adaptive, scheduler = simulate_adaptive(published, end, args.tick)
+    _report("adaptive", adaptive, _latencies(published, adaptive, scored_from), scored_from, args.weeks)
+    samples = scheduler._feeds[FEED.url]['latency']
+    expected = sum(sample[0] for sample in samples) / len(samples) / 60 if samples else 0.0
+    achieved = sum(sample[1] for sample in samples) / len(samples) / 60 if samples else 0.0
+    print(f"scheduler report       expected {expected:.1f}m, achieved {achieved:.1f}m "
+          f"over its last {len(samples)} detections")
+
+
+if __name__ == "__main__":
+    main()
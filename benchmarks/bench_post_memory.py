@@ -0,0 +1,49 @@
+"""
+Memory held by extracted posts: dicts versus DispatchPost, plus the size of
+the JSON-lines serialization.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_post_memory
+"""
+
+import io
+import tracemalloc
+from src.post import DispatchPost, dump_posts
+
+COUNTS = (1_000, 100_000)
+
+
+def _fields(i: int) -> dict:
+    return {
+        "title": f"Dispatch post {i}",
+        "link": f"https://dispatch.thorcollective.com/p/post-{i}",
+        "guid": f"https://dispatch.thorcollective.com/p/post-{i}",
+        "content_snippet": f"Snippet {i} " * 25,
+        "author": "THOR Collective",
+        "pub_date": "Mon, 01 Jan 2024 12:00:00 GMT",
+    }
+
+
+def _traced_kib(build) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del items
+    return used / 1024
+
+
+def main() -> None:
+    print(f"{'posts':>8} {'dicts (KiB)':>12} {'DispatchPost (KiB)':>19} {'JSON lines (KiB)':>17}")
+    for count in COUNTS:
+        dicts = _traced_kib(lambda: [_fields(i) for i in range(count)])
+        posts = _traced_kib(lambda: [DispatchPost(**_fields(i)) for i in range(count)])
+        buffer = io.StringIO()
+        dump_posts((DispatchPost(**_fields(i)) for i in range(count)), buffer)
+        print(f"{count:>8} {dicts:>12.0f} {posts:>19.0f} {len(buffer.getvalue().encode()) / 1024:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Measure the cold-start cost of a "nothing new" monitor run.
+
+Starts a local feed server that answers 304 Not Modified, runs
+``python -X importtime -m src.main`` against it in a fresh interpreter and
+reports the total import time. Exits non-zero if the imports exceed the
+budget or if Discord/feed-parsing modules were loaded on the no-op path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup --budget-ms 400
+"""
+
+import argparse
+import http.server
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+IMPORT_BUDGET_MS = 400
+REPEAT = 3
+
+# Modules the no-op path must not load
+DEFERRED_MODULES = ('discord', 'feedparser', 'requests', 'dateutil')
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _NotModifiedHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(304)
+        self.send_header('ETag', '"bench"')
+        self.end_headers()
+    
+    def log_message(self, *args):
+        pass
+
+
+def _run_once(env: dict, cwd: str):
+    """Run the monitor once and return (wall seconds, import µs, loaded module names)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'src.main'],
+        env=env, cwd=cwd, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.stderr.write(result.stdout + result.stderr)
+        raise SystemExit(f"Monitor run failed with exit code {result.returncode}")
+    
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        # Only top-level imports; nested ones are included in their parent's total
+        if len(match.group(3)) == 1:
+            total_us += int(match.group(2))
+    return wall, total_us, modules
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS,
+                            help=f"maximum total import time in ms (default: {IMPORT_BUDGET_MS})")
+    args = arg_parser.parse_args()
+    
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _NotModifiedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/feed"
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        state_dir = os.path.join(tmp, 'state')
+        os.makedirs(state_dir)
+        with open(os.path.join(state_dir, 'feed_cache.json'), 'w') as f:
+            json.dump({url: {'etag': '"bench"', 'content_length': 0, 'bytes_saved': 0}}, f)
+        feeds_file = os.path.join(tmp, 'feeds.json')
+        with open(feeds_file, 'w') as f:
+            json.dump([{'name': 'bench', 'url': url}], f)
+        
+        env = {k: v for k, v in os.environ.items() if not k.startswith(('DISCORD_', 'DISPATCH_'))}
+        env.update({
+            'PYTHONPATH': REPO_ROOT,
+            'DISPATCH_FEEDS_FILE': feeds_file,
+            'DISPATCH_STATE_DIR': state_dir,
+            'DRY_RUN': 'false'
+        })
+        
+        runs = [_run_once(env, tmp) for _ in range(REPEAT)]
+    
+    server.shutdown()
+    
+    wall = min(run[0] for run in runs)
+    import_ms = min(run[1] for run in runs) / 1000
+    loaded = sorted({name.split('.')[0] for run in runs for name in run[2]} & set(DEFERRED_MODULES))
+    
+    print(f"No-op run wall time (best of {REPEAT}): {wall * 1000:.0f} ms")
+    print(f"Total import time (best of {REPEAT}):   {import_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    
+    failed = False
+    if loaded:
+        print(f"FAIL: no-op run imported deferred modules: {', '.join(loaded)}")
+        failed = True
+    if import_ms > args.budget_ms:
+        print("FAIL: import time budget exceeded")
+        failed = True
+    
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
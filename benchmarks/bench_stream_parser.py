@@ -0,0 +1,59 @@
+"""
+Compare feedparser with the streaming parser on feeds of 50, 500 and 5000 items.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stream_parser
+"""
+
+import time
+import tracemalloc
+import feedparser
+from benchmarks.synthetic import chunked, make_feed
+from src.stream_parser import iter_feed_entries
+
+SIZES = (50, 500, 5000)
+NEW_ENTRIES = 2  # typical run: one or two new posts, then an already-posted one
+
+
+def _measure(func, repeat: int):
+    """Return (best seconds, peak traced bytes) for func()."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    print(f"{'items':>6} {'parser':<24} {'time (ms)':>10} {'peak (KiB)':>11}")
+    for size in SIZES:
+        data = make_feed(size)
+        repeat = 3 if size < 5000 else 1
+        
+        def full_feedparser():
+            return feedparser.parse(data).entries
+        
+        def full_stream():
+            return list(iter_feed_entries(chunked(data)))
+        
+        def early_stop_stream():
+            for i, _ in enumerate(iter_feed_entries(chunked(data))):
+                if i >= NEW_ENTRIES:
+                    break
+        
+        for name, func in (("feedparser", full_feedparser),
+                           ("stream (full)", full_stream),
+                           ("stream (early stop)", early_stop_stream)):
+            seconds, peak = _measure(func, repeat)
+            print(f"{size:>6} {name:<24} {seconds * 1000:>10.1f} {peak / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-entry cost of timestamp normalization: the old inline path versus src.timestamps.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_timestamps
+"""
+
+import os
+import time
+import timeit
+import feedparser
+from benchmarks.synthetic import make_feed
+from src.timestamps import entry_timestamp, parse_timestamp
+
+ENTRIES = 500
+NUMBER = 20
+
+
+def old_entry_timestamp(entry):
+    """The previous inline logic from get_latest_dispatch_posts."""
+    entry_time = None
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        import time
+        entry_time = time.mktime(entry.published_parsed)
+    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        import time
+        entry_time = time.mktime(entry.updated_parsed)
+    elif hasattr(entry, 'published'):
+        try:
+            from dateutil import parser
+            entry_time = parser.parse(entry.published).timestamp()
+        except:
+            pass
+    return entry_time
+
+
+def old_text_timestamp(text):
+    from dateutil import parser
+    return parser.parse(text).timestamp()
+
+
+def _per_entry_ns(func, items) -> float:
+    seconds = min(timeit.repeat(lambda: [func(item) for item in items], number=NUMBER, repeat=3))
+    return seconds / NUMBER / len(items) * 1e9
+
+
+def main() -> None:
+    entries = feedparser.parse(make_feed(ENTRIES, body_size=0)).entries
+    rss_dates = [entry.published for entry in entries]
+    iso_dates = [time.strftime('%Y-%m-%dT%H:%M:%SZ', entry.published_parsed) for entry in entries]
+    
+    print(f"{'path':<44} {'ns/entry':>10}")
+    for name, func, items in (
+        ("old: mktime(published_parsed)", old_entry_timestamp, entries),
+        ("new: entry_timestamp (struct_time)", entry_timestamp, entries),
+        ("old: dateutil.parse RFC 822 text", old_text_timestamp, rss_dates),
+        ("new: parse_timestamp RFC 822 text", parse_timestamp, rss_dates),
+        ("old: dateutil.parse ISO 8601 text", old_text_timestamp, iso_dates),
+        ("new: parse_timestamp ISO 8601 text", parse_timestamp, iso_dates),
+    ):
+        print(f"{name:<44} {_per_entry_ns(func, items):>10.0f}")
+    
+    # Show the local-time skew of the old path on a runner outside UTC
+    os.environ['TZ'] = 'America/New_York'
+    time.tzset()
+    skew = old_entry_timestamp(entries[0]) - entry_timestamp(entries[0])
+    print(f"\nOld path skew with TZ=America/New_York: {skew / 3600:+.1f} h (new path: 0.0 h)")
+
+
+if __name__ == "__main__":
+    main()
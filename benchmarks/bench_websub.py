@@ -0,0 +1,116 @@
+"""
+Push-to-post latency of WebSub delivery against a local fake hub and fake Discord.
+
+Starts the fake hub (which also serves the topic feed), the fake Discord API
+and the real WebSubReceiver wired to the monitor's delivery path, lets the
+receiver discover the hub and verify its subscription, then publishes N
+posts and reports the time from each push to its Discord delivery. State
+goes to a temporary directory.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_websub --posts 20 --interval 1
+    python -m benchmarks.bench_websub --posts 5 --bad-signatures
+"""
+
+import argparse
+import json
+import os
+import socket
+import tempfile
+import time
+from benchmarks.bench_delivery import percentile
+from benchmarks.fake_discord import CHANNEL_ID, FakeDiscord
+from benchmarks.fake_hub import FakeHub
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="WebSub push-to-post latency")
+    arg_parser.add_argument("--posts", type=int, default=20)
+    arg_parser.add_argument("--interval", type=float, default=1.0, help="seconds between published posts")
+    arg_parser.add_argument("--latency-ms", type=float, default=50, help="fake Discord delay per request")
+    arg_parser.add_argument("--bad-signatures", action="store_true", help="hub signs with the wrong secret")
+    arg_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = arg_parser.parse_args()
+    
+    fake = FakeDiscord(latency=args.latency_ms / 1000)
+    discord_url = fake.start_in_thread()
+    hub = FakeHub(bad_signatures=args.bad_signatures)
+    hub.start_in_thread()
+    port = _free_port()
+    tmp = tempfile.TemporaryDirectory()
+    feeds_file = os.path.join(tmp.name, "feeds.json")
+    with open(feeds_file, "w", encoding="utf-8") as f:
+        json.dump([{"name": "fake-hub", "url": hub.topic_url}], f)
+    
+    # src.config reads the environment at import time
+    os.environ.update({
+        "DISCORD_API_BASE": discord_url + "/api/v10",
+        "DISCORD_BOT_TOKEN": "fake-token",
+        "DISCORD_CHANNEL_ID": CHANNEL_ID,
+        "DISCORD_TRANSPORT": "rest",
+        "DRY_RUN": "false",
+        "DISPATCH_STATE_DIR": os.path.join(tmp.name, "state"),
+        "DISPATCH_FEEDS_FILE": feeds_file,
+        "DISPATCH_METRICS_TEXTFILE": "",
+        "DISPATCH_RUN_SUMMARY": "",
+        "DISPATCH_LOG_FILE": "",
+        "DISPATCH_LINK_PREVIEWS": "false",  # posts link to pages the benchmark does not serve
+    })
+    from src.feeds import load_feed_registry
+    from src.main import deliver_pushed_feed
+    from src.websub import WebSubReceiver
+    
+    receiver = WebSubReceiver(load_feed_registry(), deliver_pushed_feed, callback_url=f"http://127.0.0.1:{port}")
+    start = time.perf_counter()
+    receiver.start_in_thread("127.0.0.1", port)
+    if not _wait(lambda: hub.subscriptions, 10):
+        print("Subscription was never verified")
+        return
+    subscribed = time.perf_counter() - start
+    
+    for _ in range(args.posts):
+        hub.publish_post_threadsafe()
+        time.sleep(args.interval)
+    _wait(lambda: receiver.stats["posts"] + receiver.stats["rejected"] >= args.posts, 30)
+    receiver.stop_thread()
+    fake.stop_thread()
+    hub.stop_thread()
+    tmp.cleanup()
+    
+    latencies = list(receiver.latencies)
+    report = {
+        "posts_published": args.posts,
+        "subscribe_seconds": round(subscribed, 3),
+        "pushes_accepted": receiver.stats["pushes"],
+        "pushes_rejected": receiver.stats["rejected"],
+        "posts_delivered": receiver.stats["posts"],
+        "messages": fake.stats["messages"],
+        "push_to_post_p50_ms": round(percentile(latencies, 0.5) * 1000, 1) if latencies else None,
+        "push_to_post_p99_ms": round(percentile(latencies, 0.99) * 1000, 1) if latencies else None,
+    }
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for key, value in report.items():
+        print(f"{key:<22} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Local stand-in for the parts of the Discord API the poster uses.
+
+Serves the REST routes used by both transports (channel lookup, message
+send/edit, and the login and gateway discovery calls discord.py makes) plus a
+minimal gateway websocket that completes the HELLO/IDENTIFY/READY handshake
+and acknowledges heartbeats. Message sends carry realistic per-channel
+rate-limit headers, answer 429 once a bucket or the global limit is exhausted,
+and can be slowed down or made to fail at random. Like Discord, a send with
+``enforce_nonce`` returns the message already created with the same nonce
+instead of posting it twice.
+
+Run it on its own and point the bot at it:
+
+    python -m benchmarks.fake_discord --port 8080 --latency-ms 50
+    DISCORD_API_BASE=http://127.0.0.1:8080/api/v10 DISCORD_BOT_TOKEN=fake python -m src.main
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from aiohttp import WSMsgType, web
+
+API_PREFIX = "/api/v10"
+BOT_USER = {"id": "100000000000000001", "username": "dispatch-bot", "discriminator": "0000",
+            "global_name": None, "avatar": None, "bot": True}
+GUILD_ID = "200000000000000001"
+CHANNEL_ID = "400000000000000001"  # text channel announced in the fake guild
+
+# Discord's send-message limits
+CHANNEL_LIMIT = 5  # messages per channel per window
+CHANNEL_WINDOW = 5.0  # seconds
+GLOBAL_LIMIT = 50  # requests per second across all routes
+
+
+def _json_response(data, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    """JSON response with the exact content type discord.py checks for (no charset)."""
+    return web.Response(body=json.dumps(data).encode(), status=status,
+                        headers={"Content-Type": "application/json", **(headers or {})})
+
+
+class _Bucket:
+    """Fixed-window counter for one rate-limit bucket."""
+    
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = 0.0
+    
+    def take(self, now: float) -> bool:
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+class FakeDiscord:
+    """
+    Fake Discord API server.
+    
+    Attributes:
+        messages: Sent message payloads, as (channel_id, payload) pairs
+        stats: Request counters (requests, messages, edits, rate_limited, errors,
+            server_errors, nonce_replays, gateway_sessions)
+    """
+    
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, channel_limit: int = CHANNEL_LIMIT,
+                 channel_window: float = CHANNEL_WINDOW, global_limit: int = GLOBAL_LIMIT,
+                 error_rate: float = 0.0, missing_channels: Optional[List[str]] = None,
+                 guild_channels: Optional[List[str]] = None, server_error_rate: float = 0.0):
+        """
+        Configure the fake.
+        
+        Args:
+            latency: Added delay per REST request, in seconds
+            jitter: Random extra delay of up to this many seconds
+            channel_limit: Messages allowed per channel per window
+            channel_window: Channel bucket window, in seconds
+            global_limit: Requests allowed per second across all routes
+            error_rate: Fraction of message sends answered with a spurious 429
+            missing_channels: Channel IDs that answer 404 Unknown Channel
+            guild_channels: Text channel IDs announced over the gateway, so
+                discord.py finds them in its cache (defaults to CHANNEL_ID)
+            server_error_rate: Fraction of message writes answered with a 502
+                HTML page; half of the failed sends still create the message,
+                as when a proxy loses Discord's response
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.channel_limit = channel_limit
+        self.channel_window = channel_window
+        self.global_limit = global_limit
+        self.error_rate = error_rate
+        self.server_error_rate = server_error_rate
+        self.missing_channels = set(missing_channels or [])
+        self.guild_channels = guild_channels if guild_channels is not None else [CHANNEL_ID]
+        self.messages: List[tuple] = []
+        self.stats: Dict[str, int] = {"requests": 0, "messages": 0, "edits": 0, "rate_limited": 0,
+                                      "errors": 0, "server_errors": 0, "nonce_replays": 0,
+                                      "gateway_sessions": 0}
+        self._nonces: Dict[Tuple[str, str], Dict] = {}
+        self._ids = itertools.count(300000000000000001)
+        self._channel_buckets: Dict[str, _Bucket] = {}
+        self._global = _Bucket(global_limit, 1.0)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+    
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get(API_PREFIX + "/users/@me", self._get_me)
+        app.router.add_get(API_PREFIX + "/oauth2/applications/@me", self._get_application)
+        app.router.add_get(API_PREFIX + "/gateway", self._get_gateway)
+        app.router.add_get(API_PREFIX + "/gateway/bot", self._get_gateway)
+        app.router.add_get(API_PREFIX + "/channels/{channel_id}", self._get_channel)
+        app.router.add_post(API_PREFIX + "/channels/{channel_id}/messages", self._send_message)
+        app.router.add_patch(API_PREFIX + "/channels/{channel_id}/messages/{message_id}", self._edit_message)
+        app.router.add_get("/gateway", self._gateway)
+        return app
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving on the running event loop.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            
+        Returns:
+            Base URL of the fake, e.g. ``http://127.0.0.1:8080``
+        """
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+    
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Serve from a background thread, for driving synchronous callers.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            
+        Returns:
+            Base URL of the fake
+        """
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start(host, port))
+            started.set()
+            self._loop.run_forever()
+        
+        threading.Thread(target=run, name="fake-discord", daemon=True).start()
+        started.wait()
+        return self.base_url
+    
+    def stop_thread(self) -> None:
+        """Stop a fake started with start_in_thread."""
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+    
+    async def _delay(self) -> None:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def _rate_limited(self, retry_after: float, is_global: bool, scope: str,
+                      bucket_headers: Optional[Dict[str, str]] = None) -> web.Response:
+        self.stats["rate_limited"] += 1
+        headers = dict(bucket_headers or {})
+        headers.update({"Retry-After": str(max(1, int(retry_after + 0.999))), "X-RateLimit-Scope": scope})
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        body = {"message": "You are being rate limited.", "retry_after": round(retry_after, 3), "global": is_global}
+        return _json_response(body, status=429, headers=headers)
+    
+    def _channel_bucket(self, channel_id: str) -> _Bucket:
+        bucket = self._channel_buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._channel_buckets[channel_id] = _Bucket(self.channel_limit, self.channel_window)
+        return bucket
+    
+    def _bucket_headers(self, bucket: _Bucket, now: float) -> Dict[str, str]:
+        reset_after = max(0.0, bucket.reset_at - now)
+        return {
+            "X-RateLimit-Limit": str(bucket.limit),
+            "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": "fake-channel-messages",
+        }
+    
+    def _channel(self, channel_id: str) -> Dict:
+        return {"id": channel_id, "type": 0, "guild_id": GUILD_ID, "name": f"channel-{channel_id}",
+                "position": 0, "permission_overwrites": [], "nsfw": False, "parent_id": None}
+    
+    def _guild(self) -> Dict:
+        return {
+            "id": GUILD_ID, "name": "Fake Guild", "icon": None, "owner_id": BOT_USER["id"],
+            "roles": [{"id": GUILD_ID, "name": "@everyone", "permissions": "2048", "position": 0,
+                       "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+            "emojis": [], "stickers": [], "features": [], "member_count": 1, "large": False,
+            "members": [], "threads": [], "presences": [], "voice_states": [], "unavailable": False,
+            "channels": [self._channel(channel_id) for channel_id in self.guild_channels],
+        }
+    
+    def _message(self, channel_id: str, payload: Dict, message_id: Optional[str] = None) -> Dict:
+        return {
+            "id": message_id or str(next(self._ids)),
+            "channel_id": channel_id,
+            "type": 0,
+            "content": payload.get("content", ""),
+            "embeds": payload.get("embeds", []),
+            "author": BOT_USER,
+            "attachments": [],
+            "mentions": [],
+            "mention_roles": [],
+            "mention_everyone": False,
+            "pinned": False,
+            "tts": False,
+            "flags": 0,
+            "components": [],
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "edited_timestamp": None,
+        }
+    
+    async def _get_me(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        return _json_response(BOT_USER)
+    
+    async def _get_application(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        return _json_response({
+            "id": BOT_USER["id"], "name": "Dispatch", "icon": None, "description": "",
+            "bot_public": False, "bot_require_code_grant": False, "verify_key": "0" * 64,
+            "owner": BOT_USER, "flags": 0,
+        })
+    
+    async def _get_gateway(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        url = f"ws://{request.host}/gateway"
+        return _json_response({"url": url, "shards": 1, "session_start_limit": {
+            "total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}})
+    
+    async def _get_channel(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        await self._delay()
+        channel_id = request.match_info["channel_id"]
+        if channel_id in self.missing_channels:
+            return _json_response({"message": "Unknown Channel", "code": 10003}, status=404)
+        return _json_response(self._channel(channel_id))
+    
+    async def _send_message(self, request: web.Request) -> web.Response:
+        return await self._write_message(request, edit=False)
+    
+    async def _edit_message(self, request: web.Request) -> web.Response:
+        return await self._write_message(request, edit=True)
+    
+    async def _write_message(self, request: web.Request, edit: bool) -> web.Response:
+        self.stats["requests"] += 1
+        await self._delay()
+        channel_id = request.match_info["channel_id"]
+        if channel_id in self.missing_channels:
+            return _json_response({"message": "Unknown Channel", "code": 10003}, status=404)
+        
+        now = time.monotonic()
+        if not self._global.take(now):
+            return self._rate_limited(self._global.reset_at - now, True, "global")
+        bucket = self._channel_bucket(channel_id)
+        if self.error_rate and random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return self._rate_limited(0.25, False, "shared")
+        if not bucket.take(now):
+            return self._rate_limited(bucket.reset_at - now, False, "user", self._bucket_headers(bucket, now))
+        
+        payload = await request.json()
+        nonce = (channel_id, str(payload["nonce"])) if payload.get("enforce_nonce") and payload.get("nonce") else None
+        if not edit and nonce in self._nonces:
+            self.stats["nonce_replays"] += 1
+            return _json_response(self._nonces[nonce], headers=self._bucket_headers(bucket, now))
+        
+        failed = self.server_error_rate and random.random() < self.server_error_rate
+        if failed and random.random() < 0.5:
+            self.stats["server_errors"] += 1
+            return web.Response(status=502, text="<html><body>502 Bad Gateway</body></html>", content_type="text/html")
+        
+        if edit:
+            self.stats["edits"] += 1
+            message = self._message(channel_id, payload, request.match_info["message_id"])
+        else:
+            self.stats["messages"] += 1
+            message = self._message(channel_id, payload)
+            if nonce:
+                self._nonces[nonce] = message
+        self.messages.append((channel_id, payload))
+        if failed:
+            self.stats["server_errors"] += 1
+            return web.Response(status=502, text="<html><body>502 Bad Gateway</body></html>", content_type="text/html")
+        return _json_response(message, headers=self._bucket_headers(bucket, now))
+    
+    async def _gateway(self, request: web.Request) -> web.WebSocketResponse:
+        """Minimal gateway: HELLO, READY and GUILD_CREATE after IDENTIFY, heartbeat ACKs."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats["gateway_sessions"] += 1
+        sequence = itertools.count(1)
+        
+        await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": 41250}, "s": None, "t": None}))
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            op = json.loads(msg.data).get("op")
+            if op == 1:
+                await ws.send_str(json.dumps({"op": 11, "d": None, "s": None, "t": None}))
+            elif op == 2:
+                ready = {
+                    "v": 10, "user": BOT_USER, "guilds": [{"id": GUILD_ID, "unavailable": True}],
+                    "session_id": "fake-session", "resume_gateway_url": f"ws://{request.host}/gateway",
+                    "application": {"id": BOT_USER["id"], "flags": 0},
+                }
+                await ws.send_str(json.dumps({"op": 0, "t": "READY", "s": next(sequence), "d": ready}))
+                await ws.send_str(json.dumps({"op": 0, "t": "GUILD_CREATE", "s": next(sequence), "d": self._guild()}))
+        return ws
+
+
+def patch_discord_py(base_url: str) -> None:
+    """
+    Point discord.py's REST and gateway clients at a fake.
+    
+    Args:
+        base_url: Base URL returned by FakeDiscord.start
+    """
+    import discord.gateway
+    import discord.http
+    import yarl
+    
+    discord.http.Route.BASE = base_url + API_PREFIX
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(base_url.replace("http", "ws", 1) + "/gateway")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Local fake Discord API")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8080)
+    arg_parser.add_argument("--latency-ms", type=float, default=0, help="added delay per request")
+    arg_parser.add_argument("--jitter-ms", type=float, default=0, help="random extra delay per request")
+    arg_parser.add_argument("--error-rate", type=float, default=0, help="fraction of sends answered with a spurious 429")
+    arg_parser.add_argument("--server-error-rate", type=float, default=0, help="fraction of sends answered with a 502")
+    args = arg_parser.parse_args()
+    
+    fake = FakeDiscord(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, error_rate=args.error_rate,
+                       server_error_rate=args.server_error_rate)
+    
+    async def serve() -> None:
+        print(f"Fake Discord API at {await fake.start(args.host, args.port)}{API_PREFIX}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await fake.stop()
+            print(json.dumps(fake.stats))
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
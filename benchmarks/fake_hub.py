@@ -0,0 +1,288 @@
+"""
+Local stand-in for a WebSub hub, and for the feed it distributes.
+
+Serves a feed at /feed that advertises the hub in both its Link headers and
+an <atom:link rel="hub">, accepts subscription requests at /hub (answering
+202 and then verifying the subscriber's intent with a challenge, like a real
+hub), and publishes new feed bodies to every verified subscriber with an
+X-Hub-Signature HMAC. Leases can be granted shorter than asked for to
+exercise renewal, and signatures can be corrupted to exercise rejection.
+
+Run it on its own and point the bot at it:
+
+    python -m benchmarks.fake_hub --port 8090 --publish-every 30
+    echo '[{"name": "fake", "url": "http://127.0.0.1:8090/feed"}]' > feeds.json
+    DISPATCH_WEBSUB_CALLBACK=http://127.0.0.1:8080 python -m src.main --daemon --websub
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from email.utils import formatdate
+from typing import Dict, List, Optional, Tuple
+import aiohttp
+from aiohttp import web
+
+FEED_ITEMS = 10  # newest posts kept in the topic feed
+
+
+class FakeHub:
+    """
+    Fake WebSub hub plus the topic feed it serves.
+    
+    Attributes:
+        subscriptions: Verified subscriptions by (topic, callback), as
+            {'secret', 'expires', 'lease_seconds'}
+        stats: Counters (subscribe_requests, verifications, failed_verifications,
+            unsubscribes, deliveries, delivery_errors)
+    """
+    
+    def __init__(self, max_lease: Optional[int] = None, bad_signatures: bool = False,
+                 algorithm: str = "sha256"):
+        """
+        Configure the fake.
+        
+        Args:
+            max_lease: Longest lease granted, in seconds (None grants what is asked)
+            bad_signatures: Sign every delivery with the wrong secret
+            algorithm: Signature algorithm (sha1, sha256, sha384 or sha512)
+        """
+        self.max_lease = max_lease
+        self.bad_signatures = bad_signatures
+        self.algorithm = algorithm
+        self.posts: List[Tuple[int, float]] = []  # (number, publication time), oldest first
+        self.feed_body = b""
+        self.subscriptions: Dict[Tuple[str, str], Dict] = {}
+        self.stats: Dict[str, int] = {"subscribe_requests": 0, "verifications": 0, "failed_verifications": 0,
+                                      "unsubscribes": 0, "deliveries": 0, "delivery_errors": 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.base_url = ""
+    
+    @property
+    def hub_url(self) -> str:
+        return self.base_url + "/hub"
+    
+    @property
+    def topic_url(self) -> str:
+        return self.base_url + "/feed"
+    
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/feed", self._get_feed)
+        app.router.add_post("/hub", self._hub_request)
+        return app
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving on the running event loop.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            
+        Returns:
+            Base URL of the fake, e.g. ``http://127.0.0.1:8090``
+        """
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        self.feed_body = self.render_feed()
+        return self.base_url
+    
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+    
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Serve from a background thread, for driving synchronous callers.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            
+        Returns:
+            Base URL of the fake
+        """
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start(host, port))
+            started.set()
+            self._loop.run_forever()
+        
+        threading.Thread(target=run, name="fake-hub", daemon=True).start()
+        started.wait()
+        return self.base_url
+    
+    def stop_thread(self) -> None:
+        """Stop a fake started with start_in_thread."""
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+    
+    def render_feed(self) -> bytes:
+        """Render the topic feed, newest post first, advertising the hub like Substack does."""
+        items = "".join(
+            f"<item><title>Dispatch post {number}: hunting notes</title>"
+            f"<link>https://dispatch.thorcollective.com/p/pushed-{number}</link>"
+            f"<guid isPermaLink=\"false\">pushed-{number}</guid>"
+            f"<pubDate>{formatdate(published, usegmt=True)}</pubDate>"
+            f"<description>Summary of pushed post {number}.</description></item>"
+            for number, published in reversed(self.posts[-FEED_ITEMS:])
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            '<title>THOR Collective Dispatch</title><link>https://dispatch.thorcollective.com</link>'
+            f'<atom:link rel="hub" href="{self.hub_url}"/><atom:link rel="self" href="{self.topic_url}"/>'
+            + items + "</channel></rss>"
+        ).encode("utf-8")
+    
+    async def publish_post(self) -> List[int]:
+        """
+        Add a new post to the topic feed and push the feed to every subscriber.
+        
+        Returns:
+            HTTP status of each delivery
+        """
+        self.posts.append((len(self.posts) + 1, time.time()))
+        return await self.publish(self.render_feed())
+    
+    def publish_post_threadsafe(self) -> List[int]:
+        """Publish a new post from another thread of a fake started with start_in_thread."""
+        return asyncio.run_coroutine_threadsafe(self.publish_post(), self._loop).result()
+    
+    async def publish(self, body: bytes) -> List[int]:
+        """
+        Replace the topic feed and push it to every verified subscriber.
+        
+        Args:
+            body: New feed document
+            
+        Returns:
+            HTTP status of each delivery
+        """
+        self.feed_body = body
+        now = time.time()
+        deliveries = [
+            self._deliver(callback, subscription, body)
+            for (topic, callback), subscription in self.subscriptions.items()
+            if topic == self.topic_url and subscription['expires'] > now
+        ]
+        return list(await asyncio.gather(*deliveries))
+    
+    async def _deliver(self, callback: str, subscription: Dict, body: bytes) -> int:
+        secret = "wrong" if self.bad_signatures else subscription['secret']
+        signature = hmac.new(secret.encode(), body, getattr(hashlib, self.algorithm)).hexdigest()
+        headers = {
+            "Content-Type": "application/rss+xml",
+            "Link": f'<{self.hub_url}>; rel="hub", <{self.topic_url}>; rel="self"',
+            "X-Hub-Signature": f"{self.algorithm}={signature}",
+        }
+        try:
+            async with self._session.post(callback, data=body, headers=headers) as response:
+                self.stats["deliveries"] += 1
+                return response.status
+        except aiohttp.ClientError:
+            self.stats["delivery_errors"] += 1
+            return 0
+    
+    async def _get_feed(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.feed_body, content_type="application/rss+xml",
+                            headers={"Link": f'<{self.hub_url}>; rel="hub", <{self.topic_url}>; rel="self"'})
+    
+    async def _hub_request(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        mode = form.get("hub.mode")
+        topic = form.get("hub.topic")
+        callback = form.get("hub.callback")
+        if mode not in ("subscribe", "unsubscribe") or not topic or not callback:
+            return web.Response(status=400, text="hub.mode, hub.topic and hub.callback are required")
+        if topic != self.topic_url:
+            return web.Response(status=404, text="unknown topic")
+        
+        self.stats["subscribe_requests"] += 1
+        lease = int(form.get("hub.lease_seconds") or 864000)
+        if self.max_lease:
+            lease = min(lease, self.max_lease)
+        asyncio.create_task(self._verify_intent(mode, topic, callback, lease, form.get("hub.secret")))
+        return web.Response(status=202)
+    
+    async def _verify_intent(self, mode: str, topic: str, callback: str, lease: int, secret: Optional[str]) -> None:
+        """Confirm a (un)subscription with the subscriber, as the spec requires."""
+        challenge = secrets.token_hex(16)
+        params = {"hub.mode": mode, "hub.topic": topic, "hub.challenge": challenge}
+        if mode == "subscribe":
+            params["hub.lease_seconds"] = str(lease)
+        try:
+            async with self._session.get(callback, params=params) as response:
+                confirmed = response.status == 200 and await response.text() == challenge
+        except aiohttp.ClientError:
+            confirmed = False
+        
+        if not confirmed:
+            self.stats["failed_verifications"] += 1
+            return
+        self.stats["verifications"] += 1
+        if mode == "subscribe":
+            self.subscriptions[(topic, callback)] = {"secret": secret or "", "expires": time.time() + lease,
+                                                     "lease_seconds": lease}
+        else:
+            self.stats["unsubscribes"] += 1
+            self.subscriptions.pop((topic, callback), None)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Local fake WebSub hub")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8090)
+    arg_parser.add_argument("--max-lease", type=int, default=None, help="longest lease granted, seconds")
+    arg_parser.add_argument("--publish-every", type=float, default=0, help="publish a new post every N seconds")
+    args = arg_parser.parse_args()
+    
+    hub = FakeHub(max_lease=args.max_lease)
+    
+    async def serve() -> None:
+        await hub.start(args.host, args.port)
+        print(f"Fake WebSub hub at {hub.hub_url}, topic {hub.topic_url}")
+        try:
+            while True:
+                if args.publish_every:
+                    await asyncio.sleep(args.publish_every)
+                    statuses = await hub.publish_post()
+                    print(f"Published to {len(statuses)} subscribers: {statuses}", flush=True)
+                else:
+                    await asyncio.Event().wait()
+        finally:
+            await hub.stop()
+            print(json.dumps(hub.stats))
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
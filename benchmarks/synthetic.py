@@ -0,0 +1,76 @@
+"""Synthetic RSS feeds for offline benchmarks."""
+
+import time
+from email.utils import formatdate
+from typing import Iterator, Optional
+
+_PARAGRAPH = (
+    "<p>Threat hunting is an iterative process. <b>Hypotheses</b> are formed, tested against "
+    "telemetry &amp; refined, and the <a href=\"https://dispatch.thorcollective.com\">results</a> "
+    "feed back into detection engineering.</p>\n"
+)
+
+
+def html_body(size: int) -> str:
+    """
+    Build an HTML article body of roughly the given size.
+    
+    Args:
+        size: Target size in characters
+        
+    Returns:
+        HTML string
+    """
+    return (_PARAGRAPH * (size // len(_PARAGRAPH) + 1))[:size]
+
+
+def make_feed(entries: int, body_size: int = 4000, start: Optional[float] = None,
+              spacing: int = 3600) -> bytes:
+    """
+    Build an RSS 2.0 feed shaped like a Substack feed, newest entry first.
+    
+    Args:
+        entries: Number of <item> elements
+        body_size: Size of each content:encoded body in characters
+        start: Publication time of the newest entry (defaults to now)
+        spacing: Seconds between consecutive entries
+        
+    Returns:
+        Feed document as UTF-8 bytes
+    """
+    start = time.time() if start is None else start
+    body = html_body(body_size)
+    items = []
+    for i in range(entries):
+        items.append(
+            f"<item><title><![CDATA[Dispatch post {i}: hunting notes]]></title>"
+            f"<link>https://dispatch.thorcollective.com/p/post-{i}</link>"
+            f"<guid isPermaLink=\"false\">post-{i}</guid>"
+            f"<dc:creator><![CDATA[Ask-a-Thrunter]]></dc:creator>"
+            f"<pubDate>{formatdate(start - i * spacing, usegmt=True)}</pubDate>"
+            f"<description><![CDATA[Summary of post {i}: what we hunted and what we found.]]></description>"
+            f"<content:encoded><![CDATA[{body}]]></content:encoded></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+        '<title>THOR Collective Dispatch</title><link>https://dispatch.thorcollective.com</link>'
+        '<description>Synthetic benchmark feed</description>'
+        + "".join(items) + "</channel></rss>"
+    ).encode('utf-8')
+
+
+def chunked(data: bytes, size: int = 16 * 1024) -> Iterator[bytes]:
+    """
+    Split bytes into chunks, as they would arrive from the network.
+    
+    Args:
+        data: Bytes to split
+        size: Chunk size
+        
+    Yields:
+        Consecutive chunks
+    """
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
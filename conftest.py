@@ -0,0 +1,16 @@
+"""Shared pytest fixtures."""
+
+import pytest
+import src.state
+from src.retry import set_run_deadline
+
+# Manual script that posts to a live Discord channel, not a unit test
+collect_ignore = ["test_discord_embed.py"]
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """Keep every test's state files in its own temporary directory."""
+    monkeypatch.setattr(src.state, "STATE_DIR", str(tmp_path))
+    yield tmp_path
+    set_run_deadline(None)
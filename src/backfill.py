@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from src.config import ARCHIVE_API_PATH, ARCHIVE_PAGE_SIZE, ARCHIVE_CONCURRENCY, SNIPPET_LENGTH, USER_AGENT
+from src.feeds import FeedConfig
+from src.html_snippet import html_to_snippet
+from src.post import DispatchPost
+from src.retry import attempt_timeout, retry_async
+from src.timestamps import parse_timestamp
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+def archive_url(feed_url: str) -> str:
+    """
+    Get the archive listing endpoint for the site a feed belongs to.
+    
+    Args:
+        feed_url: RSS feed URL, e.g. ``https://dispatch.thorcollective.com/feed``
+        
+    Returns:
+        Archive API URL on the same site
+    """
+    parts = urlsplit(feed_url)
+    return urlunsplit((parts.scheme, parts.netloc, ARCHIVE_API_PATH, '', ''))
+
+
+def archive_post(item: Dict) -> Optional[DispatchPost]:
+    """
+    Convert an archive listing item into a post.
+    
+    The canonical URL doubles as the GUID, which is what the feed uses, so
+    backfilled posts de-duplicate against ones the monitor already posted.
+    
+    Args:
+        item: Archive API item
+        
+    Returns:
+        Normalized post, or None if the item has no URL
+    """
+    link = item.get('canonical_url')
+    if not link:
+        return None
+    
+    bylines = item.get('publishedBylines') or []
+    author = bylines[0].get('name') if bylines else None
+    content = item.get('description') or item.get('subtitle') or item.get('truncated_body_text') or ''
+    
+    return DispatchPost(
+        title=item.get('title') or 'No Title',
+        link=link,
+        guid=link,
+        content_snippet=html_to_snippet(content, SNIPPET_LENGTH),
+        author=author or "THOR Collective",
+        pub_date=item.get('post_date', '')
+    )
+
+
+def crawl_archive(feed: FeedConfig, since: float, concurrency: int = ARCHIVE_CONCURRENCY,
+                  page_size: int = ARCHIVE_PAGE_SIZE) -> Optional[List[DispatchPost]]:
+    """
+    Collect every post published since a date from a feed's archive listing.
+    
+    Args:
+        feed: Feed whose site to crawl
+        since: Oldest publication time to include, in epoch seconds
+        concurrency: Maximum number of archive pages in flight
+        page_size: Posts requested per page
+        
+    Returns:
+        Posts sorted oldest first, or None if the archive could not be read
+    """
+    return asyncio.run(crawl_archive_async(feed, since, concurrency, page_size))
+
+
+async def crawl_archive_async(feed: FeedConfig, since: float, concurrency: int = ARCHIVE_CONCURRENCY,
+                              page_size: int = ARCHIVE_PAGE_SIZE) -> Optional[List[DispatchPost]]:
+    """
+    Page through the archive listing, newest first, with bounded concurrency.
+    
+    Pages are requested in waves of ``concurrency`` consecutive offsets; the
+    crawl ends after the wave that reaches a post older than ``since`` or the
+    end of the archive.
+    
+    Args:
+        feed: Feed whose site to crawl
+        since: Oldest publication time to include, in epoch seconds
+        concurrency: Maximum number of archive pages in flight
+        page_size: Posts requested per page
+        
+    Returns:
+        Posts sorted oldest first, or None if the archive could not be read
+    """
+    import aiohttp
+    
+    url = archive_url(feed.url)
+    found: List[Tuple[float, DispatchPost]] = []
+    offset = 0
+    pages = 0
+    start = time.monotonic()
+    
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+        while True:
+            offsets = [offset + i * page_size for i in range(concurrency)]
+            wave = await asyncio.gather(*(_fetch_page(session, url, o, page_size, feed.timeout) for o in offsets))
+            if any(page is None for page in wave):
+                return None
+            pages += len(wave)
+            
+            finished = False
+            for page in wave:
+                for item in page:
+                    published = parse_timestamp(item.get('post_date'))
+                    if published is None:
+                        continue
+                    if published < since:
+                        finished = True
+                        continue
+                    post = archive_post(item)
+                    if post:
+                        found.append((published, post))
+                if len(page) < page_size:
+                    finished = True
+            
+            if finished:
+                break
+            offset += concurrency * page_size
+    
+    found.sort(key=lambda pair: pair[0])
+    logger.info(f"Found {len(found)} archived posts in {feed.name} across {pages} pages "
+                f"in {time.monotonic() - start:.2f}s")
+    return [post for _, post in found]
+
+
+async def _fetch_page(session: "aiohttp.ClientSession", url: str, offset: int, limit: int,
+                      timeout: float) -> Optional[List[Dict]]:
+    """
+    Fetch one page of the archive listing.
+    
+    Args:
+        session: Shared HTTP session
+        url: Archive API URL
+        offset: Number of posts to skip
+        limit: Page size
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Archive items (empty past the end of the archive), or None if error
+    """
+    import aiohttp
+    
+    params = {'sort': 'new', 'offset': str(offset), 'limit': str(limit)}
+    
+    async def get_page():
+        async with session.get(url, params=params,
+                               timeout=aiohttp.ClientTimeout(total=attempt_timeout(timeout))) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    
+    try:
+        items = await retry_async(get_page, f"Fetching archive page at offset {offset}")
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out after {timeout}s fetching archive page at offset {offset}: {url}")
+        return None
+    except Exception as e:
+        logger.error(f"Error fetching archive page at offset {offset} from {url}: {e}")
+        return None
+    
+    if not isinstance(items, list):
+        logger.error(f"Unexpected archive response at offset {offset} from {url}")
+        return None
+    return items
@@ -3,18 +3,160 @@ import os
 # THOR Collective Dispatch RSS feed
 DISPATCH_RSS_URL = "https://dispatch.thorcollective.com/feed"
 
+# Optional registry of additional feeds to watch (JSON list)
+FEEDS_FILE = os.environ.get("DISPATCH_FEEDS_FILE", "feeds.json")
+
 # Environment variables
 DISCORD_BOT_TOKEN = os.environ.get("DISCORD_BOT_TOKEN")
 DISCORD_CHANNEL_ID = os.environ.get("DISCORD_CHANNEL_ID")
+# Comma-separated channels every feed is mirrored to unless the registry says
+# otherwise (defaults to DISCORD_CHANNEL_ID)
+DISCORD_CHANNEL_IDS = [
+    channel_id.strip()
+    for channel_id in os.environ.get("DISCORD_CHANNEL_IDS", DISCORD_CHANNEL_ID or "").split(",")
+    if channel_id.strip()
+]
 DRY_RUN = os.environ.get("DRY_RUN", "false").lower() == "true"
 
-# Retry settings
+# Discord transport: "rest" sends over HTTPS only, "gateway" logs in through discord.py
+DISCORD_TRANSPORT = os.environ.get("DISCORD_TRANSPORT", "rest").lower()
+DISCORD_API_BASE = os.environ.get("DISCORD_API_BASE", "https://discord.com/api/v10")
+RATE_LIMIT_MAX_RETRIES = 3  # 429 retries per request, each waiting exactly retry_after
+
+# Daemon mode polling
+POLL_INTERVAL = float(os.environ.get("DISPATCH_POLL_INTERVAL", "60"))  # seconds
+POLL_JITTER = 0.1  # +/- fraction of the interval
+
+# Adaptive polling: each feed is polled tightly around the times it usually
+# publishes and backs off exponentially while it is quiet. Feeds that are not
+# due are skipped, so runs can be scheduled more often than feeds are fetched.
+POLL_ADAPTIVE = os.environ.get("DISPATCH_ADAPTIVE_POLLING", "true").lower() == "true"
+POLL_SCHEDULE_FILE = "poll_schedule.json"
+POLL_MIN_INTERVAL = float(os.environ.get("DISPATCH_POLL_MIN_INTERVAL", "300"))  # seconds, in publish windows
+POLL_MAX_INTERVAL = float(os.environ.get("DISPATCH_POLL_MAX_INTERVAL", str(4 * 3600)))  # seconds, backoff cap
+POLL_DUE_SLACK = 60  # seconds; feeds due this soon are polled now
+POLL_HISTORY_WEEKS = 12  # publish times older than this are forgotten
+POLL_HOT_SPAN = 3600  # seconds either side of a past publish time (same weekday and hour)
+POLL_HOT_MIN_POSTS = 2  # past posts that make a time of week a likely publish window
+
+# WebSub (PubSubHubbub) push receiver, started with --daemon --websub
+WEBSUB_CALLBACK_URL = os.environ.get("DISPATCH_WEBSUB_CALLBACK", "")  # public base URL the hub can reach
+WEBSUB_BIND = os.environ.get("DISPATCH_WEBSUB_BIND", "0.0.0.0:8080")  # host:port the receiver listens on
+WEBSUB_HUB = os.environ.get("DISPATCH_WEBSUB_HUB", "")  # hub for feeds that do not advertise one
+WEBSUB_STATE_FILE = "websub.json"
+WEBSUB_LEASE_SECONDS = 10 * 24 * 3600  # requested lease; the hub may grant a shorter one
+WEBSUB_RENEW_FRACTION = 0.1  # resubscribe when this much of the lease is left
+WEBSUB_RETRY_BASE = 60  # seconds before retrying a failed subscription, doubled per attempt
+WEBSUB_RETRY_MAX = 3600  # seconds
+WEBSUB_CHECK_INTERVAL = 60  # seconds between lease checks
+WEBSUB_MAX_BODY = 5 * 1024 * 1024  # bytes accepted per pushed feed body
+
+# Local state persisted between runs (cached by the workflow)
+STATE_DIR = os.environ.get("DISPATCH_STATE_DIR", ".dispatch_state")
+FEED_CACHE_FILE = "feed_cache.json"
+
+# Index of already-posted entries
+SEEN_INDEX_FILE = "seen_posts.log"
+SEEN_FEEDS_FILE = "seen_feeds.json"  # feeds the index has been seeded from
+SEEN_INDEX_MAX_ENTRIES = 50000
+SEEN_MAX_AGE_HOURS = 7 * 24  # never post entries older than this, even if unseen
+
+# Posted Discord messages and content digests, for editing posts that change
+POSTED_MESSAGES_FILE = "posted_messages.json"
+EDIT_TRACK_HOURS = 7 * 24  # stop watching posts for edits after this long
+# Edits are found by diffing every tracked entry still in the feed, so while
+# this is on the streaming parser reads on past the first posted entry down to
+# the oldest tracked post
+EDIT_POSTS = os.environ.get("DISPATCH_EDIT_POSTS", "true").lower() == "true"
+
+# Write-ahead queue of posts waiting for Discord to confirm delivery
+DELIVERY_QUEUE_FILE = "delivery_queue.log"
+DELIVERY_MAX_ATTEMPTS = 8  # failed attempts before a post is dead-lettered
+DELIVERY_BACKOFF_BASE = 60  # seconds, doubled after each failed attempt
+DELIVERY_BACKOFF_MAX = 6 * 3600  # seconds
+
+# Backfill: replay older posts from the publication's archive listing
+ARCHIVE_API_PATH = "/api/v1/archive"  # Substack archive endpoint on the feed's site
+ARCHIVE_PAGE_SIZE = 12  # posts per archive page
+ARCHIVE_CONCURRENCY = 4  # archive pages in flight
+BACKFILL_CHECKPOINT_FILE = "backfill_checkpoint.json"
+
+# Length of the plain-text preview taken from each post
+SNIPPET_LENGTH = 300  # characters
+
+# Link previews: og:image and og:description read from each post's page and
+# cached on disk, so reruns and backfills fetch every article at most once
+PREVIEWS_ENABLED = os.environ.get("DISPATCH_LINK_PREVIEWS", "true").lower() == "true"
+PREVIEW_CACHE_FILE = "preview_cache.json"
+PREVIEW_CACHE_MAX_ENTRIES = 5000  # least recently used pages are evicted beyond this
+PREVIEW_CACHE_TTL = 7 * 24 * 3600  # seconds a fetched preview is reused
+PREVIEW_FAILURE_TTL = 3600  # seconds before a page that failed or timed out is tried again
+PREVIEW_CONCURRENCY = 8  # pages in flight
+PREVIEW_TIMEOUT = 5  # seconds per page
+PREVIEW_BUDGET = 15  # seconds for all pages of one delivery; the rest keep the defaults
+PREVIEW_MAX_BYTES = 256 * 1024  # only the page's <head> is read, up to this much
+
+# Retry settings: transient failures (timeouts, connection errors, 429 and 5xx)
+# are retried with exponential backoff and full jitter, waiting a random time up
+# to RETRY_DELAY * 2^attempt, capped at RETRY_MAX_DELAY
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
+RETRY_MAX_DELAY = 30  # seconds
+# Retries are only made while they fit the run deadline, which leaves the rest of
+# the workflow's five-minute timeout for setup and saving state
+RUN_DEADLINE = float(os.environ.get("DISPATCH_RUN_DEADLINE", "180"))  # seconds
+DISCORD_REQUEST_TIMEOUT = 30  # seconds per Discord REST request
+
+# Circuit breaker: feeds that keep failing are left alone for a while
+BREAKER_FILE = "circuit_breakers.json"
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failed fetches that open the circuit
+BREAKER_COOLDOWN = 30 * 60  # seconds, doubled each time the circuit re-opens
+BREAKER_MAX_COOLDOWN = 6 * 3600  # seconds
+
+# Per-run metrics: Prometheus textfile and JSON summary (empty disables)
+METRICS_TEXTFILE = os.environ.get("DISPATCH_METRICS_TEXTFILE", "dispatch_metrics.prom")
+RUN_SUMMARY_FILE = os.environ.get("DISPATCH_RUN_SUMMARY", "run_summary.json")
+# Seconds each stage may take per run before a warning is logged; the whole
+# run has to fit the workflow's five-minute timeout
+STAGE_BUDGETS = {
+    "fetch": 30,
+    "parse": 10,
+    "filter": 5,
+    "enrich": 15,
+    "discord_connect": 30,
+    "fan_out": 60,
+    "run": RUN_DEADLINE,
+}
 
 # Logging configuration
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL = "INFO"
+LOG_FILE = os.environ.get("DISPATCH_LOG_FILE", "dispatch_monitor.log")  # JSON lines; empty for console only
+LOG_MAX_BYTES = 5 * 1024 * 1024  # rotate the log file at this size
+LOG_BACKUP_COUNT = 3  # rotated files to keep
+# Repetitive INFO/DEBUG messages from these loggers are sampled: the first
+# LOG_SAMPLE_BURST of each message per LOG_SAMPLE_WINDOW seconds are kept,
+# then one in N
+LOG_SAMPLE_BURST = 20
+LOG_SAMPLE_WINDOW = 60  # seconds
+LOG_SAMPLING = {
+    "src.discord_poster": 10,
+    "src.rss_handler": 10,
+    "src.feed_fetcher": 10,
+    "src.rate_limiter": 10,
+}
 
-# HTTP headers for RSS requests
-USER_AGENT = "Mozilla/5.0 (compatible; THOR-Dispatch-Bot/1.0)"
\ No newline at end of file
+# HTTP settings for RSS requests
+USER_AGENT = "Mozilla/5.0 (compatible; THOR-Dispatch-Bot/1.0)"
+FETCH_TIMEOUT = 30  # seconds
+FEED_TIMEOUT = 15  # seconds, per feed when fetching the registry concurrently
+FETCH_CONCURRENCY = 10
+# "feedparser" parses whole documents; "stream" parses while downloading and
+# stops at the first entry that is too old or already posted (or, with
+# EDIT_POSTS on, older than the oldest post watched for edits)
+FEED_PARSER = os.environ.get("DISPATCH_FEED_PARSER", "feedparser").lower()
+STREAM_CHUNK_SIZE = 16 * 1024  # bytes
+# Whole-document parsing runs in worker processes when many feeds are fetched
+# at once, so aggregated feed sets use every core instead of one
+PARSE_WORKERS = int(os.environ.get("DISPATCH_PARSE_WORKERS", "0"))  # 0: one per core; 1: parse in-process
+PARSE_POOL_MIN_FEEDS = 8  # fewer feeds than this are parsed in-process, where workers cost more than they save
@@ -0,0 +1,341 @@
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import IO, Dict, Iterable, List, Mapping, Optional
+from src.config import DELIVERY_QUEUE_FILE, DELIVERY_MAX_ATTEMPTS, DELIVERY_BACKOFF_BASE, DELIVERY_BACKOFF_MAX
+from src.post import DispatchPost
+from src.state import state_path
+
+logger = logging.getLogger(__name__)
+
+# Log record types
+_ENQUEUE = "E"
+_ACK = "A"
+_FAIL = "F"
+_DEAD = "D"
+
+# Don't bother compacting logs smaller than this
+_COMPACT_MIN_LINES = 64
+
+
+def delivery_key(channel_id: Optional[str], post: DispatchPost) -> str:
+    """
+    Get the queue key for a post bound for a channel.
+    
+    Args:
+        channel_id: Discord channel ID
+        post: Post to deliver
+        
+    Returns:
+        Queue key
+    """
+    return f"{channel_id or ''}/{post.guid}"
+
+
+class Delivery:
+    """A queued post and its delivery attempts."""
+    
+    __slots__ = ('channel_id', 'post', 'attempts', 'next_attempt', 'dead')
+    
+    def __init__(self, channel_id: Optional[str], post: DispatchPost, attempts: int = 0,
+                 next_attempt: float = 0.0, dead: bool = False):
+        self.channel_id = channel_id
+        self.post = post
+        self.attempts = attempts
+        self.next_attempt = next_attempt
+        self.dead = dead
+
+
+class DeliveryQueue:
+    """
+    Crash-safe, write-ahead queue of posts waiting to be delivered to Discord.
+    
+    Posts are enqueued (and fsynced) before they are sent and acknowledged with
+    their Discord message ID once delivered. Anything left pending, for example
+    after a Discord outage or a crash mid-run, is retried on later runs with
+    exponential backoff until DELIVERY_MAX_ATTEMPTS is reached, after which it
+    is kept as a dead letter and never retried automatically.
+    
+    Like the seen index, the queue is an append-only log mirrored in memory.
+    Acknowledgements are handed to the OS immediately but only fsynced by
+    sync(), so only a power loss between a send and the next sync can repeat
+    posts.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_attempts: int = DELIVERY_MAX_ATTEMPTS,
+                 backoff_base: float = DELIVERY_BACKOFF_BASE, backoff_max: float = DELIVERY_BACKOFF_MAX):
+        """
+        Load the queue from disk.
+        
+        Args:
+            path: Log file path (defaults to the state directory)
+            max_attempts: Failed attempts before a post is dead-lettered
+            backoff_base: Delay after the first failed attempt, in seconds
+            backoff_max: Upper bound for the retry delay, in seconds
+        """
+        self.path = path or state_path(DELIVERY_QUEUE_FILE)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._items: "OrderedDict[str, Delivery]" = OrderedDict()
+        self._log: Optional[IO[str]] = None
+        self._log_lines = 0
+        self._load()
+    
+    def _load(self) -> None:
+        """Replay the log into memory."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, IndexError, TypeError):
+                        # A torn final line from a crash mid-write
+                        logger.warning(f"Skipping unreadable delivery queue record in {self.path}")
+                        continue
+                    self._log_lines += 1
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not read delivery queue {self.path}: {e}")
+            return
+        
+        if self._items:
+            logger.info(f"Loaded {len(self)} pending and {len(self.dead_letters())} dead-lettered "
+                        f"deliveries from {self.path}")
+    
+    def _apply(self, record: list) -> None:
+        """Apply one log record to the in-memory state."""
+        kind = record[0]
+        if kind == _ENQUEUE:
+            post = DispatchPost.from_fields(record[2])
+            self._items[delivery_key(record[1], post)] = Delivery(record[1], post)
+            return
+        
+        item = self._items.get(record[1])
+        if item is None:
+            return
+        if kind == _ACK:
+            del self._items[record[1]]
+        elif kind == _FAIL:
+            item.attempts = record[2]
+            item.next_attempt = record[3]
+        elif kind == _DEAD:
+            item.attempts = record[2]
+            item.dead = True
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+    
+    def __len__(self) -> int:
+        """Number of deliveries still pending (excluding dead letters)."""
+        return sum(1 for item in self._items.values() if not item.dead)
+    
+    def enqueue(self, channel_id: Optional[str], posts: Iterable[DispatchPost]) -> bool:
+        """
+        Durably record posts before sending them.
+        
+        Posts that are already queued (pending or dead) are skipped. The whole
+        batch is written with a single fsync.
+        
+        Args:
+            channel_id: Discord channel the posts are bound for
+            posts: Posts to deliver
+            
+        Returns:
+            True if the posts are queued, False if the queue could not be written
+        """
+        return self.enqueue_all({channel_id: posts})
+    
+    def enqueue_all(self, deliveries: Mapping[Optional[str], Iterable[DispatchPost]]) -> bool:
+        """
+        Durably record posts bound for several channels with a single fsync.
+        
+        Either every delivery is queued or, if the log cannot be written, none.
+        
+        Args:
+            deliveries: Posts to deliver by channel ID
+            
+        Returns:
+            True if the posts are queued, False if the queue could not be written
+        """
+        added = OrderedDict()
+        for channel_id, posts in deliveries.items():
+            for post in posts:
+                key = delivery_key(channel_id, post)
+                if key not in self._items:
+                    added[key] = Delivery(channel_id, post)
+        
+        if not added:
+            return True
+        records = [[_ENQUEUE, item.channel_id, item.post.to_fields()] for item in added.values()]
+        if not self._write(records, sync=True):
+            return False
+        
+        self._items.update(added)
+        return True
+    
+    def due(self, now: Optional[float] = None) -> Dict[Optional[str], List[DispatchPost]]:
+        """
+        Get the pending deliveries whose backoff has expired.
+        
+        Args:
+            now: Current time in epoch seconds (defaults to time.time())
+            
+        Returns:
+            Posts to retry grouped by channel ID, oldest first
+        """
+        now = time.time() if now is None else now
+        due = {}
+        for item in self._items.values():
+            if not item.dead and item.next_attempt <= now:
+                due.setdefault(item.channel_id, []).append(item.post)
+        return due
+    
+    def ack(self, channel_id: Optional[str], post: DispatchPost, message_id: Optional[int]) -> None:
+        """
+        Mark a post as delivered.
+        
+        The record is fsynced by the next sync().
+        
+        Args:
+            channel_id: Discord channel the post was sent to
+            post: Delivered post
+            message_id: ID of the Discord message carrying the post, or None if
+                it was delivered by an earlier run
+        """
+        key = delivery_key(channel_id, post)
+        if self._items.pop(key, None) is not None:
+            self._write([[_ACK, key, message_id]], flush=True)
+    
+    def fail(self, channel_id: Optional[str], posts: Iterable[DispatchPost], now: Optional[float] = None) -> None:
+        """
+        Schedule a retry for every given post that is still pending.
+        
+        Posts that were acknowledged in the meantime are ignored, so callers can
+        pass the whole batch they attempted. The records are synced to disk.
+        
+        Args:
+            channel_id: Discord channel the posts were bound for
+            posts: Posts from the failed attempt
+            now: Current time in epoch seconds (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        records = []
+        for post in posts:
+            key = delivery_key(channel_id, post)
+            item = self._items.get(key)
+            if item is None or item.dead:
+                continue
+            
+            item.attempts += 1
+            if item.attempts >= self.max_attempts:
+                item.dead = True
+                records.append([_DEAD, key, item.attempts])
+                logger.error(f"Giving up on delivering '{post.title}' to channel {channel_id} "
+                             f"after {item.attempts} attempts")
+                continue
+            
+            delay = min(self.backoff_base * 2 ** (item.attempts - 1), self.backoff_max)
+            item.next_attempt = now + delay
+            records.append([_FAIL, key, item.attempts, item.next_attempt])
+            logger.warning(f"Delivery of '{post.title}' failed (attempt {item.attempts}), "
+                           f"retrying in {delay:.0f}s")
+        
+        if records:
+            self._write(records, sync=True)
+    
+    def dead_letters(self) -> List[Delivery]:
+        """
+        Get the deliveries that exhausted their attempts.
+        
+        Returns:
+            Dead-lettered deliveries, oldest first
+        """
+        return [item for item in self._items.values() if item.dead]
+    
+    def sync(self) -> None:
+        """Flush buffered records to disk."""
+        if self._log is None:
+            return
+        try:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        except OSError as e:
+            logger.error(f"Could not sync delivery queue {self.path}: {e}")
+    
+    def close(self) -> None:
+        """Sync and close the log, compacting it if it is mostly acknowledged records."""
+        if self._log is not None:
+            self.sync()
+            self._log.close()
+            self._log = None
+        
+        if self._log_lines > max(_COMPACT_MIN_LINES, 2 * len(self._items)):
+            self.compact()
+    
+    def compact(self) -> bool:
+        """
+        Rewrite the log so it only describes pending and dead-lettered deliveries.
+        
+        Returns:
+            True if compacted successfully, False otherwise
+        """
+        records = []
+        for key, item in self._items.items():
+            records.append([_ENQUEUE, item.channel_id, item.post.to_fields()])
+            if item.dead:
+                records.append([_DEAD, key, item.attempts])
+            elif item.attempts:
+                records.append([_FAIL, key, item.attempts, item.next_attempt])
+        
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(self._encode(record) for record in records)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not compact delivery queue {self.path}: {e}")
+            return False
+        
+        logger.info(f"Compacted delivery queue from {self._log_lines} to {len(records)} lines")
+        self._log_lines = len(records)
+        return True
+    
+    def _write(self, records: List[list], flush: bool = False, sync: bool = False) -> bool:
+        """
+        Append records to the log.
+        
+        Args:
+            records: Records to append
+            flush: Whether to hand the records to the OS before returning
+            sync: Whether to fsync before returning
+            
+        Returns:
+            True if written successfully, False otherwise
+        """
+        try:
+            if self._log is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._log = open(self.path, 'a', encoding='utf-8')
+            self._log.writelines(self._encode(record) for record in records)
+            self._log_lines += len(records)
+            if flush or sync:
+                self._log.flush()
+            if sync:
+                os.fsync(self._log.fileno())
+        except OSError as e:
+            logger.error(f"Could not append to delivery queue {self.path}: {e}")
+            return False
+        return True
+    
+    @staticmethod
+    def _encode(record: list) -> str:
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
@@ -1,27 +1,210 @@
 import discord
 import asyncio
 import logging
-from typing import Optional
-from src.config import DISCORD_BOT_TOKEN, DISCORD_CHANNEL_ID, DRY_RUN
+import secrets
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, TypeVar
+from src.config import DISCORD_BOT_TOKEN, DISCORD_CHANNEL_ID, DISCORD_TRANSPORT, DRY_RUN
+from src.discord_rest import DiscordRestClient, DiscordRestError, embed_payload
+from src.embed_packing import pack_embeds, trim_embed
+from src.enrichment import LinkPreview, fetch_previews
+from src.feeds import ChannelTarget
+from src.metrics import metrics
+from src.post import EMBED_DESCRIPTION_LENGTH, DispatchPost
+from src.posted_messages import MessageEdit
+from src.retry import retry_async
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
 
-class DispatchDiscordPoster:
+
+def batch_message(count: int, target: Optional[ChannelTarget] = None) -> str:
+    """
+    Get the message text that accompanies a batch of post embeds.
+    
+    Args:
+        count: Number of posts in the message
+        target: Optional channel whose mention prefixes the text
+        
+    Returns:
+        Message text
+    """
+    if count == 1:
+        message = "**New THOR Collective Dispatch Post!** 🚀"
+    else:
+        message = f"**{count} New THOR Collective Dispatch Posts!** 🚀"
+    if target and target.mention:
+        return f"{target.mention} {message}"
+    return message
+
+
+def build_embeds(posts: List[DispatchPost], target: Optional[ChannelTarget] = None,
+                 previews: Optional[Dict[str, LinkPreview]] = None) -> List[dict]:
+    """
+    Build the embed data for each post, trimmed to Discord's limits.
+    
+    A post's link preview supplies its thumbnail, and its description when the
+    feed gave no snippet. Channel overrides take precedence over both.
+    
+    Args:
+        posts: Posts to send
+        target: Optional channel whose formatting overrides are applied
+        previews: Optional link previews by post URL
+        
+    Returns:
+        Embed data dictionaries in post order
+    """
+    overrides = {}
+    if target:
+        overrides = {key: value for key, value in
+                     (('color', target.color), ('footer', target.footer), ('thumbnail', target.thumbnail))
+                     if value is not None}
+    previews = previews or {}
+    return [trim_embed({**post.to_embed_data(), **preview_fields(post, previews.get(post.link)), **overrides})
+            for post in posts]
+
+
+def preview_fields(post: DispatchPost, preview: Optional[LinkPreview]) -> dict:
+    """
+    Get the embed fields a post's link preview replaces.
+    
+    Args:
+        post: Post being sent
+        preview: Link preview of the post's page, if any
+        
+    Returns:
+        Embed data to merge over the post's defaults
+    """
+    if not preview:
+        return {}
+    fields = {}
+    if preview.image:
+        fields['thumbnail'] = preview.image
+    if preview.description and not post.content_snippet:
+        fields['description'] = preview.description[:EMBED_DESCRIPTION_LENGTH]
+    return fields
+
+
+class ChannelJob(NamedTuple):
+    """The embeds bound for one channel in a fan-out."""
+    channel_id: Optional[str]
+    target: Optional[ChannelTarget]
+    embeds: List[dict]
+    on_sent: Optional[Callable[[int, int], None]]
+
+
+class DiscordConnection:
+    """
+    Discord client running on a background event loop.
+    
+    Used by daemon mode so every poll reuses one gateway session instead of
+    logging in and waiting for on_ready for each batch of posts. One-off
+    gateway sends open one for the send and close it afterwards.
+    """
+    
     def __init__(self):
-        """Initialize Discord bot client."""
+        """Create the client and the event loop it will run on."""
         self.bot_token = DISCORD_BOT_TOKEN
-        self.channel_id = DISCORD_CHANNEL_ID
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="discord-connection", daemon=True)
+        self._session = None
+        
+        intents = discord.Intents.default()
+        intents.message_content = True
+        self.client = discord.Client(intents=intents)
+    
+    def start(self, timeout: float = 60) -> bool:
+        """
+        Connect to Discord and wait until the client is ready.
+        
+        Args:
+            timeout: Seconds to wait for the gateway to become ready
+            
+        Returns:
+            True if connected, False otherwise
+        """
+        if not self.bot_token:
+            logger.warning("Discord bot token not configured")
+            return False
+        
+        self._thread.start()
+        logger.info("Connecting to Discord...")
+        connect_start = time.monotonic()
+        self._session = asyncio.run_coroutine_threadsafe(self.client.start(self.bot_token), self.loop)
+        
+        try:
+            self.run(self._wait_until_ready(), timeout=timeout)
+        except discord.LoginFailure:
+            logger.error("Discord login failed - check bot token")
+            self.close()
+            return False
+        except Exception as e:
+            logger.error(f"Discord session failed to connect: {e}")
+            self.close()
+            return False
+        
+        metrics.record('discord_connect', time.monotonic() - connect_start)
+        logger.info(f"Discord session connected as: {self.client.user}")
+        return True
+    
+    async def _wait_until_ready(self) -> None:
+        """Wait for on_ready, failing fast if the session task dies first."""
+        session = asyncio.wrap_future(self._session)
+        ready = asyncio.ensure_future(self.client.wait_until_ready())
+        done, _ = await asyncio.wait({session, ready}, return_when=asyncio.FIRST_COMPLETED)
+        if ready not in done:
+            ready.cancel()
+            session.result()  # re-raise the login/connect error
+            raise RuntimeError("Discord session closed before becoming ready")
+    
+    @property
+    def is_ready(self) -> bool:
+        return self.client.is_ready() and not self.client.is_closed()
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the connection's event loop and wait for its result.
+        
+        Args:
+            coro: Coroutine to run
+            timeout: Optional seconds to wait
+            
+        Returns:
+            The coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+    
+    def close(self) -> None:
+        """Log out and stop the background event loop."""
+        if not self._thread.is_alive():
+            return
+        try:
+            if not self.client.is_closed():
+                self.run(self.client.close(), timeout=10)
+        except Exception as e:
+            logger.error(f"Error closing Discord session: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=10)
+        logger.info("Discord session closed")
+
+
+class DispatchDiscordPoster:
+    def __init__(self, channel_id: Optional[str] = None, connection: Optional[DiscordConnection] = None):
+        """
+        Initialize Discord bot client.
+        
+        Args:
+            channel_id: Target channel (defaults to DISCORD_CHANNEL_ID)
+            connection: Optional persistent session to post through
+        """
+        self.bot_token = DISCORD_BOT_TOKEN
+        self.channel_id = channel_id or DISCORD_CHANNEL_ID
+        self.connection = connection
         
         if not self.bot_token:
             logger.warning("Discord bot token not configured")
-            self.client = None
-        else:
-            # Configure intents for the bot
-            intents = discord.Intents.default()
-            intents.message_content = True
-            self.client = discord.Client(intents=intents)
-            logger.info("Discord client initialized")
     
     def format_dispatch_message(self, title: str, link: str, content_snippet: str) -> str:
         """
@@ -56,59 +239,196 @@ class DispatchDiscordPoster:
                 clean_content = clean_content[:available_space] + "..."
                 message = base_message + clean_content + footer
         
-        logger.debug(f"Formatted Discord message: {message}")
+        logger.debug("Formatted Discord message: %s", message)
         return message
     
-    def post_multiple_to_discord(self, posts: list) -> int:
+    def post_multiple_to_discord(self, posts: List[DispatchPost],
+                                 on_posted: Optional[Callable[[DispatchPost, int], None]] = None) -> int:
         """
-        Post multiple Dispatch updates to Discord in a single session.
+        Post multiple Dispatch updates to this poster's channel in a single session.
+        
+        Embeds are packed into as few messages as Discord allows (up to 10
+        embeds and 6000 characters per message).
         
         Args:
-            posts: List of post dictionaries with title, link, content_snippet, author
-            
+            posts: Posts to send
+            on_posted: Optional callback invoked with (post, message_id) after
+                each post is confirmed by Discord
+                
         Returns:
-            Number of successfully posted messages
+            Number of successfully posted posts
         """
+        callback = (lambda channel_id, post, message_id: on_posted(post, message_id)) if on_posted else None
+        return self.fan_out({self.channel_id: posts}, on_posted=callback).get(self.channel_id, 0)
+    
+    def fan_out(self, deliveries: Dict[Optional[str], List[DispatchPost]],
+                targets: Optional[Dict[Optional[str], ChannelTarget]] = None,
+                on_posted: Optional[Callable[[Optional[str], DispatchPost, int], None]] = None) -> Dict[Optional[str], int]:
+        """
+        Send posts to several channels concurrently over one Discord session.
+        
+        Each channel gets its posts in order, packed into as few messages as
+        possible and formatted with its target's overrides. Channels are sent
+        to in parallel, so only Discord's per-channel and global rate limits
+        bound the fan-out: ten channels take about as long as one.
+        
+        Args:
+            deliveries: Posts to send, oldest first, by channel ID
+            targets: Optional channel targets by channel ID, for formatting overrides
+            on_posted: Optional callback invoked with (channel_id, post,
+                message_id) after each post is confirmed by Discord
+                
+        Returns:
+            Number of posts delivered per channel
+        """
+        targets = targets or {}
+        deliveries = {channel_id: posts for channel_id, posts in deliveries.items() if posts}
+        
         if not self.bot_token or DRY_RUN:
             logger.info(f"Skipping Discord posts (dry_run={DRY_RUN}, token={bool(self.bot_token)})")
             if DRY_RUN:
-                for post in posts:
-                    message = self.format_dispatch_message(post['title'], post['link'], post['content_snippet'])
-                    logger.info(f"[DRY RUN] Would post to Discord:\n{message}")
-            return len(posts)
-        
-        # Prepare all embeds
-        embeds_to_send = []
-        for post in posts:
-            link = post['link']
-            if not link.startswith('http'):
-                link = f"https://{link}"
+                for channel_id, posts in deliveries.items():
+                    for post in posts:
+                        message = self.format_dispatch_message(post.title, post.link, post.content_snippet)
+                        logger.info(f"[DRY RUN] Would post to Discord channel {channel_id}:\n{message}")
+            return {channel_id: len(posts) for channel_id, posts in deliveries.items()}
+        
+        previews = fetch_previews(post.link for posts in deliveries.values() for post in posts)
+        jobs = [
+            ChannelJob(channel_id, targets.get(channel_id), build_embeds(posts, targets.get(channel_id), previews),
+                       self._on_sent(channel_id, posts, on_posted))
+            for channel_id, posts in deliveries.items()
+        ]
+        
+        with metrics.span('fan_out'):
+            counts = self._run_jobs(jobs)
+        
+        results = {job.channel_id: counts.get(job.channel_id, 0) for job in jobs}
+        if len(results) > 1:
+            for channel_id, delivered in results.items():
+                logger.info("Channel %s: %d/%d posts delivered", channel_id, delivered, len(deliveries[channel_id]))
+        return results
+    
+    def edit_messages(self, edits: List[MessageEdit],
+                      targets: Optional[Dict[Optional[str], ChannelTarget]] = None) -> Set[Tuple[str, str]]:
+        """
+        Rewrite already-posted messages with their posts' current content.
+        
+        Edits always go over the REST API: a PATCH needs no gateway session.
+        They are sent concurrently, paced by the rate limiter like new posts.
+        
+        Args:
+            edits: Messages to rewrite
+            targets: Optional channel targets by channel ID, for formatting overrides
             
-            embed_data = {
-                'title': post['title'].strip(),
-                'description': post['content_snippet'].strip()[:500],
-                'url': link,
-                'author': post.get('author') or 'Ask-a-Thrunter',
-                'author_url': 'https://dispatch.thorcollective.com',
-                'thumbnail': 'https://pbs.twimg.com/profile_images/1719421917473927168/Aaifurr1_400x400.jpg',
-                'footer': 'THOR Collective Dispatch'
-            }
-            embeds_to_send.append(embed_data)
-        
-        # Run the async posting function with a single client
+        Returns:
+            (channel_id, message_id) of every message edited successfully
+        """
+        targets = targets or {}
+        if not self.bot_token or DRY_RUN:
+            for edit in edits:
+                logger.info(f"[DRY RUN] Would edit message {edit.message_id} in channel {edit.channel_id}: "
+                            f"{', '.join(post.title for post in edit.posts)}")
+            return {(edit.channel_id, edit.message_id) for edit in edits} if DRY_RUN else set()
+        
+        previews = fetch_previews(post.link for edit in edits for post in edit.posts)
         try:
-            intents = discord.Intents.default()
-            intents.message_content = True
-            client = discord.Client(intents=intents)
+            with metrics.span('edit'):
+                return asyncio.run(self._edit_messages_rest(edits, targets, previews))
+        except Exception as e:
+            logger.error(f"Error editing Discord messages: {e}")
+            return set()
+    
+    async def _edit_messages_rest(self, edits: List[MessageEdit], targets: Dict[Optional[str], ChannelTarget],
+                                  previews: Dict[str, LinkPreview]) -> Set[Tuple[str, str]]:
+        """
+        Async function to PATCH several messages concurrently over the REST API.
+        
+        Args:
+            edits: Messages to rewrite
+            targets: Channel targets by channel ID
+            previews: Link previews by post URL
+            
+        Returns:
+            (channel_id, message_id) of every message edited successfully
+        """
+        async def edit_one(rest: DiscordRestClient, edit: MessageEdit) -> bool:
+            target = targets.get(edit.channel_id)
+            payload = [embed_payload(embed) for embed in build_embeds(edit.posts, target, previews)]
+            try:
+                # Edits are idempotent, so they are always safe to retry
+                await retry_async(
+                    lambda: rest.edit_message(edit.channel_id, edit.message_id,
+                                              content=batch_message(len(edit.posts), target), embeds=payload),
+                    f"Editing message {edit.message_id}"
+                )
+            except Exception as e:
+                logger.error(f"Failed to edit message {edit.message_id} in channel {edit.channel_id}: {e}")
+                return False
+            logger.info("Edited message %s in channel %s", edit.message_id, edit.channel_id)
+            metrics.incr('messages_edited')
+            return True
+        
+        async with DiscordRestClient(self.bot_token) as rest:
+            results = await asyncio.gather(*(edit_one(rest, edit) for edit in edits))
+        return {(edit.channel_id, edit.message_id) for edit, ok in zip(edits, results) if ok}
+    
+    @staticmethod
+    def _on_sent(channel_id: Optional[str], posts: List[DispatchPost],
+                 on_posted: Optional[Callable[[Optional[str], DispatchPost, int], None]]) -> Optional[Callable[[int, int], None]]:
+        """Map a channel's (embed index, message_id) confirmations back to its posts."""
+        if not on_posted:
+            return None
+        return lambda i, message_id: on_posted(channel_id, posts[i], message_id)
+    
+    def _run_jobs(self, jobs: List[ChannelJob]) -> Dict[Optional[str], int]:
+        """
+        Send every channel job over the configured transport.
+        
+        Args:
+            jobs: Embeds to send per channel
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self._post_multiple_messages_with_client(client, embeds_to_send))
-            loop.close()
-            return result
+        Returns:
+            Number of embeds delivered per channel (empty if the session failed)
+        """
+        # Send over plain HTTPS without a gateway login
+        if DISCORD_TRANSPORT == 'rest':
+            try:
+                return asyncio.run(self._post_multiple_messages_rest(jobs))
+            except Exception as e:
+                logger.error(f"Error running REST Discord posts: {e}")
+                return {}
+        
+        return self._run_gateway(lambda client: self._post_multiple_messages_gateway(client, jobs), {})
+    
+    def _run_gateway(self, send: Callable[[discord.Client], Awaitable[T]], default: T) -> T:
+        """
+        Run a send through discord.py.
+        
+        The persistent session is used when running as a daemon; otherwise a
+        connection is opened for this send and closed afterwards.
+        
+        Args:
+            send: Function building the send coroutine for a ready client
+            default: Result when the session fails
+            
+        Returns:
+            The send's result, or default
+        """
+        connection = self.connection
+        if not (connection and connection.is_ready):
+            connection = DiscordConnection()
+            if not connection.start():
+                return default
+        
+        try:
+            return connection.run(send(connection.client))
         except Exception as e:
-            logger.error(f"Error running async Discord posts: {e}")
-            return 0
+            logger.error(f"Error posting through Discord session: {e}")
+            return default
+        finally:
+            if connection is not self.connection:
+                connection.close()
     
     def post_to_discord(self, title: str, link: str, content_snippet: str, author: str = None) -> bool:
         """
@@ -130,382 +450,277 @@ class DispatchDiscordPoster:
                 logger.info(f"[DRY RUN] Would post to Discord:\n{message}")
             return True
         
-        # Ensure URL is properly formatted
-        if not link.startswith('http'):
-            link = f"https://{link}"
+        post = DispatchPost(title, link, content_snippet=content_snippet, author=author)
+        return self.post_multiple_to_discord([post]) == 1
+    
+    async def _post_multiple_messages_rest(self, jobs: List[ChannelJob]) -> Dict[Optional[str], int]:
+        """
+        Async function to post to several channels concurrently over the REST API only.
         
-        # Create embed data for rich formatting with all the necessary fields
-        embed_data = {
-            'title': title.strip(),
-            'description': content_snippet.strip()[:500],  # Discord embed description limit
-            'url': link,
-            'author': author or 'Ask-a-Thrunter',  # Use provided author or default
-            'author_url': 'https://dispatch.thorcollective.com',  # Author URL
-            'thumbnail': 'https://pbs.twimg.com/profile_images/1719421917473927168/Aaifurr1_400x400.jpg',  # THOR Collective logo
-            'footer': 'THOR Collective Dispatch'
-        }
-        
-        # Main message
-        message = "**New THOR Collective Dispatch Post!** 🚀"
+        All channels share one HTTP session and rate limiter, so sends are
+        paced by each channel's bucket and by the global limit.
         
-        # Run the async posting function with a fresh client
-        try:
-            # Create a new client for this message
-            intents = discord.Intents.default()
-            intents.message_content = True
-            client = discord.Client(intents=intents)
+        Args:
+            jobs: Embeds to send per channel
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self._post_message_with_client(client, message, embed_data))
-            loop.close()
-            return result
-        except Exception as e:
-            logger.error(f"Error running async Discord post: {e}")
-            return False
+        Returns:
+            Number of successfully posted embeds per channel
+        """
+        async with DiscordRestClient(self.bot_token) as rest:
+            counts = await asyncio.gather(*(self._send_embeds_rest(rest, job) for job in jobs))
+            
+            stats = rest.rate_limiter.stats()
+            logger.info(f"Rate limiter stats: {stats}")
+            metrics.incr('rate_limited', stats['rate_limited'])
+            metrics.incr('rate_limit_wait_seconds', stats['total_wait'])
+        
+        return {job.channel_id: count for job, count in zip(jobs, counts)}
     
-    async def _post_multiple_messages_with_client(self, client: discord.Client, embeds_to_send: list) -> int:
+    async def _send_embeds_rest(self, rest: DiscordRestClient, job: ChannelJob) -> int:
         """
-        Async function to post multiple messages to Discord with a single client.
+        Send one channel's embeds, packed into as few messages as possible, over REST.
         
         Args:
-            client: Discord client instance
-            embeds_to_send: List of embed data dictionaries
+            rest: Open REST client
+            job: Embeds to send and their channel
             
         Returns:
-            Number of successfully posted messages
+            Number of successfully posted embeds
         """
-        try:
-            if not self.channel_id:
-                logger.error("Discord channel ID not configured")
-                return 0
-                
+        if not job.channel_id:
+            logger.error("Discord channel ID not configured")
+            return 0
+        
+        embeds_sent = 0
+        batches = pack_embeds(job.embeds)
+        
+        for n, batch in enumerate(batches):
+            payload = [embed_payload(job.embeds[i]) for i in batch]
+            # One nonce per message, so a retry after a lost response cannot post it twice
+            nonce = secrets.token_hex(12)
             try:
-                channel_id_int = int(self.channel_id)
-            except ValueError:
-                logger.error(f"Invalid channel ID format: {self.channel_id}")
-                return 0
-            
-            ready_event = asyncio.Event()
-            messages_sent = 0
-            
-            @client.event
-            async def on_ready():
-                nonlocal messages_sent
-                logger.info(f"Bot connected as: {client.user}")
-                
-                channel = client.get_channel(channel_id_int)
-                if not channel:
-                    logger.error(f"Could not find channel with ID: {self.channel_id}")
-                    logger.info("Available channels:")
-                    for guild in client.guilds:
-                        for ch in guild.text_channels:
-                            logger.info(f"  - {ch.name} (ID: {ch.id})")
-                else:
-                    logger.info(f"Found channel: {channel.name} in {channel.guild.name}")
-                    
-                    # Send all embeds with rate limit handling
-                    for i, embed_data in enumerate(embeds_to_send):
-                        try:
-                            embed = discord.Embed(
-                                title=embed_data.get('title', ''),
-                                description=embed_data.get('description', ''),
-                                url=embed_data.get('url', ''),
-                                color=0x0099ff
-                            )
-                            
-                            if embed_data.get('author'):
-                                embed.set_author(
-                                    name=embed_data.get('author'),
-                                    url=embed_data.get('author_url', '')
-                                )
-                            
-                            if embed_data.get('thumbnail'):
-                                embed.set_thumbnail(url=embed_data.get('thumbnail'))
-                            
-                            if embed_data.get('footer'):
-                                embed.set_footer(text=embed_data.get('footer'))
-                            
-                            embed.timestamp = discord.utils.utcnow()
-                            
-                            logger.info(f"Sending embed {i+1}/{len(embeds_to_send)}: {embed.title}")
-                            
-                            message = "**New THOR Collective Dispatch Post!** 🚀"
-                            sent_message = await channel.send(content=message, embed=embed)
-                            logger.info(f"Message sent with ID: {sent_message.id}")
-                            messages_sent += 1
-                            
-                            # Add delay between messages to avoid rate limiting
-                            if i < len(embeds_to_send) - 1:
-                                await asyncio.sleep(2)  # 2 second delay between posts
-                                
-                        except discord.HTTPException as e:
-                            logger.error(f"Failed to send embed {i+1}: {e}")
-                            if "rate limited" in str(e).lower():
-                                logger.info("Rate limited, waiting 5 seconds...")
-                                await asyncio.sleep(5)
-                                # Try again
-                                try:
-                                    sent_message = await channel.send(content=message, embed=embed)
-                                    messages_sent += 1
-                                except:
-                                    logger.error(f"Failed to retry embed {i+1}")
-                    
-                    logger.info(f"Successfully posted {messages_sent}/{len(embeds_to_send)} messages to Discord")
-                
-                await asyncio.sleep(1)
-                ready_event.set()
-                await client.close()
+                logger.info("Sending message %d/%d with %d embeds to %s", n + 1, len(batches), len(batch), job.channel_id)
+                with metrics.span('send'):
+                    sent_message = await retry_async(
+                        lambda: rest.send_message(job.channel_id, content=batch_message(len(batch), job.target),
+                                                  embeds=payload, nonce=nonce),
+                        f"Sending message {n+1} to {job.channel_id}"
+                    )
+                logger.info("Message sent with ID: %s", sent_message['id'])
+                metrics.incr('messages_sent')
+                metrics.incr('posts_sent', len(batch))
+                embeds_sent += len(batch)
+                if job.on_sent:
+                    for i in batch:
+                        job.on_sent(i, int(sent_message['id']))
             
-            logger.info("Connecting to Discord...")
-            await client.start(self.bot_token)
-            
-            await ready_event.wait()
-            return messages_sent
-            
-        except discord.LoginFailure:
-            logger.error("Discord login failed - check bot token")
-            return 0
-        except discord.Forbidden:
-            logger.error("Bot doesn't have permission to send messages in this channel")
-            return 0
-        except Exception as e:
-            logger.error(f"Unexpected error posting to Discord: {e}")
-            return 0
-        finally:
-            if client and not client.is_closed():
-                await client.close()
+            except DiscordRestError as e:
+                metrics.incr('send_errors')
+                if not await self._log_rest_error(rest, e, job.channel_id):
+                    break
+                logger.error(f"Failed to send message {n+1} to {job.channel_id}: {e}")
+            except Exception as e:
+                # Out of retries or out of time: the rest stays queued for the next run
+                metrics.incr('send_errors')
+                logger.error(f"Failed to send message {n+1} to {job.channel_id}, giving up for this run: {e!r}")
+                break
+        
+        logger.info("Successfully posted %d/%d posts to Discord channel %s in %d messages",
+                    embeds_sent, len(job.embeds), job.channel_id, len(batches))
+        return embeds_sent
     
-    async def _post_message_with_client(self, client: discord.Client, message: str, embed_data: Optional[dict] = None) -> bool:
+    async def _post_message_rest(self, message: str) -> bool:
         """
-        Async function to post message to Discord with a specific client.
+        Async function to post a single text message over the REST API only.
         
         Args:
-            client: Discord client instance
-            message: Formatted message to post
-            embed_data: Optional embed data for rich formatting
+            message: Message text to post
             
         Returns:
             True if posted successfully, False otherwise
         """
-        try:
-            # Get the channel ID
-            if not self.channel_id:
-                logger.error("Discord channel ID not configured")
-                return False
-                
+        if not self.channel_id:
+            logger.error("Discord channel ID not configured")
+            return False
+        
+        nonce = secrets.token_hex(12)
+        async with DiscordRestClient(self.bot_token) as rest:
             try:
-                channel_id_int = int(self.channel_id)
-            except ValueError:
-                logger.error(f"Invalid channel ID format: {self.channel_id}")
+                sent_message = await retry_async(
+                    lambda: rest.send_message(self.channel_id, content=message, nonce=nonce),
+                    f"Sending message to {self.channel_id}"
+                )
+            except DiscordRestError as e:
+                await self._log_rest_error(rest, e, self.channel_id)
                 return False
+            except Exception as e:
+                logger.error(f"Failed to send message to {self.channel_id}: {e!r}")
+                return False
+        
+        logger.info("Message sent with ID: %s", sent_message['id'])
+        logger.info("Successfully posted to Discord")
+        return True
+    
+    async def _log_rest_error(self, rest: DiscordRestClient, error: DiscordRestError, channel_id: str) -> bool:
+        """
+        Log a REST error in the same terms as the gateway path.
+        
+        Args:
+            rest: Open REST client, used to look up the channel for diagnostics
+            error: The error returned by Discord
+            channel_id: Channel the request was sent to
             
-            # Create event for when bot is ready
-            ready_event = asyncio.Event()
-            message_sent = False
-            
-            @client.event
-            async def on_ready():
-                nonlocal message_sent
-                logger.info(f"Bot connected as: {client.user}")
-                
-                # Get the channel
-                channel = client.get_channel(channel_id_int)
-                if not channel:
-                    logger.error(f"Could not find channel with ID: {self.channel_id}")
-                    # List available channels for debugging
-                    logger.info("Available channels:")
-                    for guild in client.guilds:
-                        for ch in guild.text_channels:
-                            logger.info(f"  - {ch.name} (ID: {ch.id})")
-                else:
-                    logger.info(f"Found channel: {channel.name} in {channel.guild.name}")
-                    
-                    # Send with embed if provided
-                    if embed_data:
-                        embed = discord.Embed(
-                            title=embed_data.get('title', ''),
-                            description=embed_data.get('description', ''),
-                            url=embed_data.get('url', ''),
-                            color=0x0099ff  # Use hex color instead of discord.Color
-                        )
-                        
-                        # Add author information
-                        if embed_data.get('author'):
-                            embed.set_author(
-                                name=embed_data.get('author'),
-                                url=embed_data.get('author_url', '')
-                            )
-                        
-                        # Add thumbnail  
-                        if embed_data.get('thumbnail'):
-                            embed.set_thumbnail(url=embed_data.get('thumbnail'))
-                        
-                        # Add footer
-                        if embed_data.get('footer'):
-                            embed.set_footer(text=embed_data.get('footer'))
-                        
-                        # Add timestamp
-                        embed.timestamp = discord.utils.utcnow()
-                        
-                        # Log embed details for debugging
-                        logger.info(f"Sending embed with title: {embed.title}")
-                        logger.info(f"Embed URL: {embed.url}")
-                        logger.info(f"Embed author: {embed.author.name if embed.author else 'None'}")
-                        logger.info(f"Embed thumbnail: {embed.thumbnail.url if embed.thumbnail else 'None'}")
-                        
-                        # Send the message with embed
-                        sent_message = await channel.send(content=message, embed=embed)
-                        logger.info(f"Message sent with ID: {sent_message.id}")
-                    else:
-                        await channel.send(message)
-                    
-                    logger.info("Successfully posted to Discord")
-                    message_sent = True
-                
-                # Wait a moment to ensure message is fully sent
-                await asyncio.sleep(1)
-                ready_event.set()
-                await client.close()
+        Returns:
+            True if later messages may still succeed, False if the error is fatal
+        """
+        if error.status == 401:
+            logger.error("Discord login failed - check bot token")
+            return False
+        if error.status in (403, 404):
+            try:
+                channel = await rest.get_channel(channel_id)
+                logger.error(f"Bot doesn't have permission to send messages in channel: {channel.get('name')}")
+            except DiscordRestError:
+                logger.error(f"Could not find channel with ID: {channel_id}")
+            return False
+        logger.error(f"Discord HTTP error: {error}")
+        return True
+    
+    async def _post_multiple_messages_gateway(self, client: discord.Client,
+                                              jobs: List[ChannelJob]) -> Dict[Optional[str], int]:
+        """
+        Async function to post to several channels concurrently through a gateway session.
+        
+        Args:
+            client: Ready Discord client
+            jobs: Embeds to send per channel
             
-            # Start the client
-            logger.info("Connecting to Discord...")
-            await client.start(self.bot_token)
+        Returns:
+            Number of successfully posted embeds per channel
+        """
+        counts = await asyncio.gather(*(self._send_job_gateway(client, job) for job in jobs))
+        return {job.channel_id: count for job, count in zip(jobs, counts)}
+    
+    async def _send_job_gateway(self, client: discord.Client, job: ChannelJob) -> int:
+        """
+        Resolve one channel through a gateway session and send its embeds.
+        
+        Args:
+            client: Ready Discord client
+            job: Embeds to send and their channel
             
-            # Wait for ready event
-            await ready_event.wait()
-            return message_sent
+        Returns:
+            Number of successfully posted embeds
+        """
+        channel = await self._resolve_channel(client, job.channel_id)
+        if not channel:
+            return 0
+        return await self._send_embeds(channel, job.embeds, job.on_sent, job.target)
+    
+    @staticmethod
+    async def _resolve_channel(client: discord.Client, channel_id: Optional[str]) -> Optional[discord.abc.Messageable]:
+        """
+        Look up a channel in the gateway cache, fetching it if it is not cached.
+        
+        Args:
+            client: Ready Discord client
+            channel_id: Channel to look up
             
-        except discord.LoginFailure:
-            logger.error("Discord login failed - check bot token")
-            return False
+        Returns:
+            The channel, or None if it is not configured or not found
+        """
+        if not channel_id:
+            logger.error("Discord channel ID not configured")
+            return None
+        try:
+            channel_id_int = int(channel_id)
+        except ValueError:
+            logger.error(f"Invalid channel ID format: {channel_id}")
+            return None
+        
+        try:
+            return client.get_channel(channel_id_int) or await client.fetch_channel(channel_id_int)
         except discord.Forbidden:
-            logger.error("Bot doesn't have permission to send messages in this channel")
-            return False
+            logger.error(f"Bot doesn't have permission to access channel: {channel_id}")
         except discord.HTTPException as e:
-            logger.error(f"Discord HTTP error: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error posting to Discord: {e}")
-            return False
-        finally:
-            if client and not client.is_closed():
-                await client.close()
+            logger.error(f"Could not find channel with ID: {channel_id} ({e})")
+        return None
     
-    async def _post_message_async(self, message: str, embed_data: Optional[dict] = None) -> bool:
+    async def _send_embeds(self, channel: discord.abc.Messageable, embeds_to_send: list,
+                           on_sent: Optional[Callable[[int, int], None]] = None,
+                           target: Optional[ChannelTarget] = None) -> int:
         """
-        Async function to post message to Discord.
+        Send embeds, packed into as few messages as possible, to a resolved channel.
         
         Args:
-            message: Formatted message to post
-            embed_data: Optional embed data for rich formatting
+            channel: Target Discord channel
+            embeds_to_send: List of embed data dictionaries
+            on_sent: Optional callback invoked with (index, message_id) per sent embed
+            target: Optional channel target whose mention prefixes each message
             
         Returns:
-            True if posted successfully, False otherwise
+            Number of successfully posted embeds
         """
-        try:
-            # Get the channel ID
-            if not self.channel_id:
-                logger.error("Discord channel ID not configured")
-                return False
-                
+        embeds_sent = 0
+        batches = pack_embeds(embeds_to_send)
+        
+        # discord.py schedules sends from the rate-limit headers itself, so
+        # messages go out back-to-back and 429s are waited out inside send()
+        for n, batch in enumerate(batches):
             try:
-                channel_id_int = int(self.channel_id)
-            except ValueError:
-                logger.error(f"Invalid channel ID format: {self.channel_id}")
-                return False
-            
-            # Create event for when bot is ready
-            ready_event = asyncio.Event()
-            message_sent = False
-            
-            @self.client.event
-            async def on_ready():
-                nonlocal message_sent
-                logger.info(f"Bot connected as: {self.client.user}")
+                embeds = [self._build_embed(embeds_to_send[i]) for i in batch]
                 
-                # Get the channel
-                channel = self.client.get_channel(channel_id_int)
-                if not channel:
-                    logger.error(f"Could not find channel with ID: {self.channel_id}")
-                    # List available channels for debugging
-                    logger.info("Available channels:")
-                    for guild in self.client.guilds:
-                        for ch in guild.text_channels:
-                            logger.info(f"  - {ch.name} (ID: {ch.id})")
-                else:
-                    logger.info(f"Found channel: {channel.name} in {channel.guild.name}")
-                    
-                    # Send with embed if provided
-                    if embed_data:
-                        embed = discord.Embed(
-                            title=embed_data.get('title', ''),
-                            description=embed_data.get('description', ''),
-                            url=embed_data.get('url', ''),
-                            color=0x0099ff  # Use hex color instead of discord.Color
-                        )
-                        
-                        # Add author information
-                        if embed_data.get('author'):
-                            embed.set_author(
-                                name=embed_data.get('author'),
-                                url=embed_data.get('author_url', '')
-                            )
-                        
-                        # Add thumbnail  
-                        if embed_data.get('thumbnail'):
-                            embed.set_thumbnail(url=embed_data.get('thumbnail'))
-                        
-                        # Add footer
-                        if embed_data.get('footer'):
-                            embed.set_footer(text=embed_data.get('footer'))
-                        
-                        # Add timestamp
-                        embed.timestamp = discord.utils.utcnow()
-                        
-                        # Log embed details for debugging
-                        logger.info(f"Sending embed with title: {embed.title}")
-                        logger.info(f"Embed URL: {embed.url}")
-                        logger.info(f"Embed author: {embed.author.name if embed.author else 'None'}")
-                        logger.info(f"Embed thumbnail: {embed.thumbnail.url if embed.thumbnail else 'None'}")
-                        
-                        # Send the message with embed
-                        sent_message = await channel.send(content=message, embed=embed)
-                        logger.info(f"Message sent with ID: {sent_message.id}")
-                    else:
-                        await channel.send(message)
-                    
-                    logger.info("Successfully posted to Discord")
-                    message_sent = True
+                logger.info("Sending message %d/%d with %d embeds to %s", n + 1, len(batches), len(batch), channel.id)
                 
-                # Wait a moment to ensure message is fully sent
-                await asyncio.sleep(1)
-                ready_event.set()
-                await self.client.close()
-            
-            # Start the client
-            logger.info("Connecting to Discord...")
-            await self.client.start(self.bot_token)
+                with metrics.span('send'):
+                    sent_message = await channel.send(content=batch_message(len(batch), target), embeds=embeds)
+                logger.info("Message sent with ID: %s", sent_message.id)
+                metrics.incr('messages_sent')
+                metrics.incr('posts_sent', len(batch))
+                embeds_sent += len(batch)
+                if on_sent:
+                    for i in batch:
+                        on_sent(i, sent_message.id)
             
-            # Wait for ready event
-            await ready_event.wait()
-            return message_sent
+            except discord.HTTPException as e:
+                metrics.incr('send_errors')
+                logger.error(f"Failed to send message {n+1} to {channel.id}: {e}")
+        
+        logger.info("Successfully posted %d/%d posts to Discord channel %s in %d messages",
+                    embeds_sent, len(embeds_to_send), channel.id, len(batches))
+        return embeds_sent
+    
+    def _build_embed(self, embed_data: dict) -> discord.Embed:
+        """
+        Build a Discord embed from embed data.
+        
+        Args:
+            embed_data: Embed data dictionary
             
-        except discord.LoginFailure:
-            logger.error("Discord login failed - check bot token")
-            return False
-        except discord.Forbidden:
-            logger.error("Bot doesn't have permission to send messages in this channel")
-            return False
-        except discord.HTTPException as e:
-            logger.error(f"Discord HTTP error: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error posting to Discord: {e}")
-            return False
-        finally:
-            if self.client and not self.client.is_closed():
-                await self.client.close()
+        Returns:
+            Discord embed
+        """
+        embed = discord.Embed(
+            title=embed_data.get('title', ''),
+            description=embed_data.get('description', ''),
+            url=embed_data.get('url', ''),
+            color=embed_data.get('color', 0x0099ff)
+        )
+        
+        if embed_data.get('author'):
+            embed.set_author(
+                name=embed_data.get('author'),
+                url=embed_data.get('author_url', '')
+            )
+        
+        if embed_data.get('thumbnail'):
+            embed.set_thumbnail(url=embed_data.get('thumbnail'))
+        
+        if embed_data.get('footer'):
+            embed.set_footer(text=embed_data.get('footer'))
+        
+        embed.timestamp = discord.utils.utcnow()
+        return embed
     
     def send_error_notification(self, error_msg: str) -> bool:
         """
@@ -523,17 +738,35 @@ class DispatchDiscordPoster:
         
         error_message = f"⚠️ **Dispatch Monitor Error** ⚠️\n\n{error_msg}"
         
-        try:
-            # Create a new client for this message
-            intents = discord.Intents.default()
-            intents.message_content = True
-            client = discord.Client(intents=intents)
+        if DISCORD_TRANSPORT == 'rest':
+            try:
+                return asyncio.run(self._post_message_rest(error_message))
+            except Exception as e:
+                logger.error(f"Error sending error notification: {e}")
+                return False
+        
+        return self._run_gateway(lambda client: self._post_message_gateway(client, error_message), False)
+    
+    async def _post_message_gateway(self, client: discord.Client, message: str) -> bool:
+        """
+        Async function to post a single text message through a gateway session.
+        
+        Args:
+            client: Ready Discord client
+            message: Message text to post
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self._post_message_with_client(client, error_message))
-            loop.close()
-            return result
-        except Exception as e:
-            logger.error(f"Error sending error notification: {e}")
-            return False
\ No newline at end of file
+        Returns:
+            True if posted successfully, False otherwise
+        """
+        channel = await self._resolve_channel(client, self.channel_id)
+        if not channel:
+            return False
+        try:
+            sent_message = await channel.send(content=message)
+        except discord.HTTPException as e:
+            logger.error(f"Failed to send message to {self.channel_id}: {e}")
+            return False
+        
+        logger.info("Message sent with ID: %s", sent_message.id)
+        logger.info("Successfully posted to Discord")
+        return True
\ No newline at end of file
@@ -0,0 +1,195 @@
+import aiohttp
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from src.config import DISCORD_API_BASE, DISCORD_REQUEST_TIMEOUT, RATE_LIMIT_MAX_RETRIES, USER_AGENT
+from src.metrics import metrics
+from src.rate_limiter import RateLimiter, route_key
+from src.retry import attempt_timeout, remaining_time
+
+logger = logging.getLogger(__name__)
+
+
+class DiscordRestError(Exception):
+    """Error response from the Discord REST API."""
+    
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+class DiscordRestClient:
+    """
+    Minimal Discord REST client authenticated with the bot token.
+    
+    Sends messages with plain HTTPS requests, without opening a gateway
+    websocket or building a guild cache. The API base URL is configurable so
+    the client can be pointed at a local stand-in server.
+    """
+    
+    def __init__(self, bot_token: str, api_base: str = DISCORD_API_BASE,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize the REST client.
+        
+        Args:
+            bot_token: Discord bot token
+            api_base: Base URL of the Discord API
+            rate_limiter: Optional scheduler shared with other clients
+        """
+        self.bot_token = bot_token
+        self.api_base = api_base.rstrip('/')
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> "DiscordRestClient":
+        self._session = aiohttp.ClientSession(headers={
+            'Authorization': f"Bot {self.bot_token}",
+            'User-Agent': f"DiscordBot ({USER_AGENT})"
+        })
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+    
+    async def request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make an authenticated API request.
+        
+        The request is scheduled by the rate limiter; a 429 is retried after
+        exactly the ``retry_after`` Discord returned, up to RATE_LIMIT_MAX_RETRIES
+        and only while the wait fits the run deadline. Other failures are left
+        to the caller's retry policy.
+        
+        Args:
+            method: HTTP method
+            path: API path, e.g. /channels/123/messages
+            payload: Optional JSON body
+            
+        Returns:
+            Decoded JSON response
+            
+        Raises:
+            DiscordRestError: If Discord returns an error status
+        """
+        route = route_key(method, path)
+        attempt = 0
+        
+        while True:
+            await self.rate_limiter.acquire(route)
+            timeout = aiohttp.ClientTimeout(total=attempt_timeout(DISCORD_REQUEST_TIMEOUT))
+            async with self._session.request(method, f"{self.api_base}{path}", json=payload,
+                                             timeout=timeout) as response:
+                self.rate_limiter.update(route, response.headers)
+                try:
+                    data = await response.json(content_type=None) if response.status != 204 else {}
+                except ValueError:
+                    # Proxies in front of Discord answer outages with HTML pages
+                    if response.status < 400:
+                        raise
+                    data = {}
+            
+            if response.status < 400:
+                return data
+            
+            data = data if isinstance(data, dict) else {}
+            if response.status == 429:
+                retry_after = float(data.get('retry_after') or response.headers.get('Retry-After') or 1)
+                is_global = bool(data.get('global')) or response.headers.get('X-RateLimit-Global') == 'true'
+                shared = response.headers.get('X-RateLimit-Scope') == 'shared'
+                self.rate_limiter.rate_limited_for(route, retry_after, is_global, shared)
+                if attempt < RATE_LIMIT_MAX_RETRIES and retry_after < remaining_time():
+                    attempt += 1
+                    metrics.incr('retries')
+                    continue
+            
+            raise DiscordRestError(response.status, data.get('message', response.reason or ''),
+                                   data.get('retry_after'))
+    
+    async def get_channel(self, channel_id: str) -> Dict[str, Any]:
+        """
+        Look up a channel by ID.
+        
+        Args:
+            channel_id: Discord channel ID
+            
+        Returns:
+            Channel object
+        """
+        return await self.request('GET', f"/channels/{channel_id}")
+    
+    async def send_message(self, channel_id: str, content: str = '',
+                           embeds: Optional[List[Dict[str, Any]]] = None,
+                           nonce: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send a message to a channel.
+        
+        Args:
+            channel_id: Discord channel ID
+            content: Message text
+            embeds: Optional list of embed payloads
+            nonce: Optional unique ID (up to 25 characters); Discord returns the
+                message already sent with the same nonce instead of posting
+                again, which makes retrying a send safe
+            
+        Returns:
+            Created message object
+        """
+        payload: Dict[str, Any] = {'content': content}
+        if embeds:
+            payload['embeds'] = embeds
+        if nonce:
+            payload['nonce'] = nonce
+            payload['enforce_nonce'] = True
+        return await self.request('POST', f"/channels/{channel_id}/messages", payload)
+    
+    async def edit_message(self, channel_id: str, message_id: str, content: str = '',
+                           embeds: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Replace the text and embeds of a message the bot sent.
+        
+        Args:
+            channel_id: Discord channel ID
+            message_id: ID of the message to edit
+            content: New message text
+            embeds: New list of embed payloads
+            
+        Returns:
+            Updated message object
+        """
+        payload: Dict[str, Any] = {'content': content, 'embeds': embeds or []}
+        return await self.request('PATCH', f"/channels/{channel_id}/messages/{message_id}", payload)
+
+
+def embed_payload(embed_data: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Convert embed data into a Discord API embed object.
+    
+    Args:
+        embed_data: Embed data dictionary as built by DispatchDiscordPoster
+        
+    Returns:
+        Embed object ready to be sent as JSON
+    """
+    embed: Dict[str, Any] = {
+        'title': embed_data.get('title', ''),
+        'description': embed_data.get('description', ''),
+        'url': embed_data.get('url', ''),
+        'color': embed_data.get('color', 0x0099ff),
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    }
+    
+    if embed_data.get('author'):
+        embed['author'] = {'name': embed_data['author'], 'url': embed_data.get('author_url', '')}
+    
+    if embed_data.get('thumbnail'):
+        embed['thumbnail'] = {'url': embed_data['thumbnail']}
+    
+    if embed_data.get('footer'):
+        embed['footer'] = {'text': embed_data['footer']}
+    
+    return embed
@@ -0,0 +1,102 @@
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Discord embed limits
+EMBED_TITLE_LIMIT = 256
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_AUTHOR_LIMIT = 256
+EMBED_FOOTER_LIMIT = 2048
+EMBED_TOTAL_LIMIT = 6000  # combined across every embed in one message
+EMBEDS_PER_MESSAGE = 10
+
+# Fields that count towards the total character budget
+_COUNTED_FIELDS = (
+    ('title', EMBED_TITLE_LIMIT),
+    ('description', EMBED_DESCRIPTION_LIMIT),
+    ('author', EMBED_AUTHOR_LIMIT),
+    ('footer', EMBED_FOOTER_LIMIT),
+)
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to at most limit characters, marking the cut with an ellipsis."""
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rstrip() + "…"
+
+
+def trim_embed(embed_data: Dict[str, str]) -> Dict[str, str]:
+    """
+    Trim embed fields to Discord's per-field and per-embed limits.
+    
+    The field limits add up to more than EMBED_TOTAL_LIMIT, so once every
+    field fits its own limit the description is shortened further until
+    the whole embed fits.
+    
+    Args:
+        embed_data: Embed data dictionary
+        
+    Returns:
+        Copy of the embed data with over-length fields truncated
+    """
+    trimmed = dict(embed_data)
+    for field, limit in _COUNTED_FIELDS:
+        if trimmed.get(field):
+            trimmed[field] = _truncate(trimmed[field], limit)
+    
+    # The other fields total at most 2560 characters, so the description can
+    # always absorb the excess
+    excess = embed_length(trimmed) - EMBED_TOTAL_LIMIT
+    if excess > 0:
+        description = trimmed['description']
+        trimmed['description'] = _truncate(description, len(description) - excess)
+    return trimmed
+
+
+def embed_length(embed_data: Dict[str, str]) -> int:
+    """
+    Count the characters an embed uses from the per-message budget.
+    
+    Args:
+        embed_data: Embed data dictionary
+        
+    Returns:
+        Number of counted characters
+    """
+    return sum(len(embed_data.get(field) or '') for field, _ in _COUNTED_FIELDS)
+
+
+def pack_embeds(embeds_to_send: List[Dict[str, str]]) -> List[List[int]]:
+    """
+    Group embeds into as few messages as Discord allows.
+    
+    Embeds keep their order and are packed greedily, up to EMBEDS_PER_MESSAGE
+    per message and EMBED_TOTAL_LIMIT characters across a message. Callers
+    should trim embeds first.
+    
+    Args:
+        embeds_to_send: List of trimmed embed data dictionaries
+        
+    Returns:
+        Lists of indices into embeds_to_send, one list per message
+    """
+    groups: List[List[int]] = []
+    current: List[int] = []
+    current_length = 0
+    
+    for i, embed_data in enumerate(embeds_to_send):
+        length = embed_length(embed_data)
+        if current and (len(current) >= EMBEDS_PER_MESSAGE or current_length + length > EMBED_TOTAL_LIMIT):
+            groups.append(current)
+            current = []
+            current_length = 0
+        current.append(i)
+        current_length += length
+    
+    if current:
+        groups.append(current)
+    
+    logger.debug("Packed %d embeds into %d messages", len(embeds_to_send), len(groups))
+    return groups
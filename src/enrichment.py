@@ -0,0 +1,295 @@
+import asyncio
+import codecs
+import logging
+import time
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from src.config import (
+    PREVIEW_BUDGET, PREVIEW_CACHE_FILE, PREVIEW_CACHE_MAX_ENTRIES, PREVIEW_CACHE_TTL, PREVIEW_CONCURRENCY,
+    PREVIEW_FAILURE_TTL, PREVIEW_MAX_BYTES, PREVIEW_TIMEOUT, PREVIEWS_ENABLED, USER_AGENT
+)
+from src.metrics import metrics
+from src.retry import remaining_time
+from src.state import load_state, save_state
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Longest values kept per page, so the entry cap also bounds the cache file's size
+MAX_IMAGE_URL_LENGTH = 2048
+MAX_DESCRIPTION_LENGTH = 500
+
+# Tags after which no more <meta> tags are expected
+_END_OF_HEAD = frozenset({'body', 'article', 'main'})
+
+_CHUNK_SIZE = 16 * 1024
+
+
+class LinkPreview(NamedTuple):
+    """Open Graph preview of an article page; empty fields keep the embed defaults."""
+    image: str = ''
+    description: str = ''
+
+
+class _OpenGraphParser(HTMLParser):
+    """HTML parser that collects og:image and og:description from a page's head."""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.properties: Dict[str, str] = {}
+        self.done = False
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            attributes = dict(attrs)
+            key = (attributes.get('property') or attributes.get('name') or '').lower()
+            content = attributes.get('content')
+            if key in ('og:image', 'og:description') and content and key not in self.properties:
+                self.properties[key] = content.strip()
+        elif tag in _END_OF_HEAD:
+            self.done = True
+    
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+    
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+
+
+def parse_preview(html: str, page_url: str) -> LinkPreview:
+    """
+    Extract the Open Graph preview from an HTML document.
+    
+    Args:
+        html: Page markup (the head is enough)
+        page_url: URL of the page, for resolving relative image URLs
+        
+    Returns:
+        Preview with whichever fields the page declares
+    """
+    parser = _OpenGraphParser()
+    parser.feed(html)
+    return _preview_from(parser.properties, page_url)
+
+
+def _preview_from(properties: Dict[str, str], page_url: str) -> LinkPreview:
+    image = properties.get('og:image', '')
+    if image:
+        image = urljoin(page_url, image)
+        if urlparse(image).scheme not in ('http', 'https') or len(image) > MAX_IMAGE_URL_LENGTH:
+            image = ''
+    return LinkPreview(image, properties.get('og:description', '')[:MAX_DESCRIPTION_LENGTH])
+
+
+class PreviewCache:
+    """
+    Size-capped LRU cache of link previews, persisted in the state directory.
+    
+    Entries are keyed by page URL and expire after PREVIEW_CACHE_TTL, or after
+    PREVIEW_FAILURE_TTL for pages that could not be fetched. When the cache is
+    saved, the least recently used entries beyond the size cap are evicted.
+    """
+    
+    def __init__(self, name: str = PREVIEW_CACHE_FILE, max_entries: int = PREVIEW_CACHE_MAX_ENTRIES):
+        """
+        Load the cache.
+        
+        Args:
+            name: State file name
+            max_entries: Most pages kept
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict] = load_state(name)
+        self._dirty = False
+    
+    def get(self, url: str, now: Optional[float] = None) -> Optional[LinkPreview]:
+        """
+        Look up a fresh preview and mark it as recently used.
+        
+        Args:
+            url: Page URL
+            now: Current time (defaults to time.time())
+            
+        Returns:
+            Cached preview (empty for pages that failed recently), or None if
+            the page has to be fetched
+        """
+        now = time.time() if now is None else now
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        ttl = PREVIEW_CACHE_TTL if entry.get('ok') else PREVIEW_FAILURE_TTL
+        if now - entry.get('fetched', 0) >= ttl:
+            return None
+        entry['used'] = now
+        self._dirty = True
+        return LinkPreview(entry.get('image', ''), entry.get('description', ''))
+    
+    def put(self, url: str, preview: Optional[LinkPreview], now: Optional[float] = None) -> None:
+        """
+        Store a fetched preview, or None for a page that could not be fetched.
+        
+        Args:
+            url: Page URL
+            preview: Preview read from the page
+            now: Current time (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        entry = {'fetched': now, 'used': now, 'ok': preview is not None}
+        if preview:
+            entry.update(image=preview.image, description=preview.description)
+        self.entries[url] = entry
+        self._dirty = True
+    
+    def save(self) -> bool:
+        """
+        Evict least recently used entries beyond the cap and write the cache.
+        
+        Returns:
+            True if written (or unchanged), False otherwise
+        """
+        if not self._dirty:
+            return True
+        excess = len(self.entries) - self.max_entries
+        if excess > 0:
+            for url in sorted(self.entries, key=lambda url: self.entries[url].get('used', 0))[:excess]:
+                del self.entries[url]
+            metrics.incr('preview_cache_evictions', excess)
+        self._dirty = False
+        return save_state(self.name, self.entries)
+
+
+def fetch_previews(urls: Iterable[str], cache: Optional[PreviewCache] = None) -> Dict[str, LinkPreview]:
+    """
+    Get the link preview of every page, from the cache or fetched concurrently.
+    
+    Must be called outside a running event loop. Pages that fail, time out or
+    do not fit the time budget are left out, so their embeds keep the defaults.
+    
+    Args:
+        urls: Page URLs
+        cache: Preview cache (loaded from and saved to the state directory if omitted)
+        
+    Returns:
+        Previews by page URL
+    """
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not PREVIEWS_ENABLED or not urls:
+        return {}
+    
+    cache = cache or PreviewCache()
+    previews: Dict[str, LinkPreview] = {}
+    missing: List[str] = []
+    for url in urls:
+        cached = cache.get(url)
+        if cached is None:
+            missing.append(url)
+        elif cached.image or cached.description:
+            previews[url] = cached
+    metrics.incr('preview_cache_hits', len(urls) - len(missing))
+    
+    if missing:
+        try:
+            with metrics.span('enrich'):
+                fetched = asyncio.run(_fetch_missing(missing, cache))
+        except Exception as e:
+            logger.error(f"Error fetching link previews: {e}")
+            fetched = {}
+        previews.update((url, preview) for url, preview in fetched.items() if preview.image or preview.description)
+    
+    cache.save()
+    return previews
+
+
+async def _fetch_missing(urls: List[str], cache: PreviewCache) -> Dict[str, LinkPreview]:
+    """
+    Fetch pages over one pooled session within PREVIEW_BUDGET seconds.
+    
+    Args:
+        urls: Pages missing from the cache
+        cache: Preview cache, updated with every page that was attempted
+        
+    Returns:
+        Previews of the pages that were fetched successfully
+    """
+    import aiohttp
+    
+    start = time.monotonic()
+    deadline = start + min(PREVIEW_BUDGET, remaining_time())
+    semaphore = asyncio.Semaphore(PREVIEW_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=PREVIEW_CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+        results = await asyncio.gather(*(_fetch_preview(session, semaphore, url, deadline) for url in urls))
+    
+    fetched = {}
+    for url, (attempted, preview) in zip(urls, results):
+        if attempted:
+            cache.put(url, preview)
+        if preview:
+            fetched[url] = preview
+    logger.info(f"Fetched {len(fetched)}/{len(urls)} link previews in {time.monotonic() - start:.2f}s")
+    return fetched
+
+
+async def _fetch_preview(session: "aiohttp.ClientSession", semaphore: asyncio.Semaphore,
+                         url: str, deadline: float) -> Tuple[bool, Optional[LinkPreview]]:
+    """
+    Read the head of one page and extract its preview.
+    
+    Args:
+        session: Shared HTTP session
+        semaphore: Concurrency limiter
+        url: Page URL
+        deadline: time.monotonic() by which every page must be done
+        
+    Returns:
+        (attempted, preview): attempted is False when the budget ran out before
+        the page could be requested; preview is None if the fetch failed
+    """
+    import aiohttp
+    
+    async with semaphore:
+        timeout = min(PREVIEW_TIMEOUT, deadline - time.monotonic())
+        if timeout <= 0:
+            metrics.incr('previews_skipped')
+            return False, None
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                if 'html' not in (response.content_type or ''):
+                    metrics.incr('previews_fetched')
+                    return True, LinkPreview()
+                preview = await _read_preview(response, url)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out after {timeout:.1f}s fetching link preview for {url}")
+            metrics.incr('previews_failed')
+            return True, None
+        except Exception as e:
+            logger.warning(f"Could not fetch link preview for {url}: {e}")
+            metrics.incr('previews_failed')
+            return True, None
+    
+    metrics.incr('previews_fetched')
+    return True, preview
+
+
+async def _read_preview(response: "aiohttp.ClientResponse", url: str) -> LinkPreview:
+    """Parse a page while it downloads, stopping at the end of its head."""
+    try:
+        decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parser = _OpenGraphParser()
+    received = 0
+    async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+        received += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or received >= PREVIEW_MAX_BYTES:
+            break
+    metrics.incr('bytes_fetched', received)
+    return _preview_from(parser.properties, str(response.url) or url)
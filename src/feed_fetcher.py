@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Tuple
+from src.config import FEED_CACHE_FILE, FETCH_CONCURRENCY, STREAM_CHUNK_SIZE, USER_AGENT
+from src.feeds import FeedConfig
+from src.metrics import metrics
+from src.parse_pool import parse_in_pool, parse_pool, parse_workers
+from src.retry import attempt_timeout, retry_async
+from src.rss_handler import (
+    FEED_UNCHANGED, conditional_headers, parse_feed_content, record_feed_validators, record_not_modified
+)
+from src.state import load_state, save_state
+from src.stream_parser import FeedStreamParser, StreamedFeed
+
+if TYPE_CHECKING:
+    import aiohttp
+    import feedparser
+
+logger = logging.getLogger(__name__)
+
+FetchResult = Tuple[FeedConfig, Optional["feedparser.FeedParserDict"]]
+StopCondition = Callable[[FeedConfig], Callable[[Dict], bool]]
+
+
+def fetch_all_feeds(feeds: List[FeedConfig], concurrency: int = FETCH_CONCURRENCY,
+                    stop_at: Optional[StopCondition] = None) -> List[FetchResult]:
+    """
+    Fetch every feed in the registry concurrently.
+    
+    Args:
+        feeds: Feeds to fetch
+        concurrency: Maximum number of downloads in flight
+        stop_at: Optional factory returning, per feed, a predicate for the entry
+            at which to stop reading. Enables the streaming parser.
+        
+    Returns:
+        (feed, result) pairs in registry order, where result is a parsed feed,
+        FEED_UNCHANGED or None if the fetch failed
+    """
+    return asyncio.run(fetch_feeds_async(feeds, concurrency, stop_at))
+
+
+async def fetch_feeds_async(feeds: List[FeedConfig], concurrency: int = FETCH_CONCURRENCY,
+                            stop_at: Optional[StopCondition] = None) -> List[FetchResult]:
+    """
+    Download all feeds over one pooled HTTP session.
+    
+    Total wall time tracks the slowest feed rather than the sum of all of them.
+    Each feed is bounded by its own timeout, and conditional-GET validators are
+    shared with fetch_dispatch_feed. When enough feeds are fetched, whole
+    documents are parsed in worker processes while the rest still download.
+    
+    Args:
+        feeds: Feeds to fetch
+        concurrency: Maximum number of downloads in flight
+        stop_at: Optional per-feed stop predicate factory (streaming mode)
+        
+    Returns:
+        (feed, result) pairs in registry order
+    """
+    import aiohttp
+    
+    feed_cache = load_state(FEED_CACHE_FILE)
+    semaphore = asyncio.Semaphore(concurrency)
+    # Parse tasks never outnumber the feeds, so the shared pool only
+    # spawns as many workers as this batch can use
+    pool = parse_pool() if not stop_at and parse_workers(len(feeds)) > 1 else None
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    
+    start = time.monotonic()
+    with metrics.span('fetch'):
+        async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+            results = await asyncio.gather(
+                *(_fetch_feed(session, semaphore, feed, feed_cache, stop_at(feed) if stop_at else None, pool)
+                  for feed in feeds)
+            )
+    
+    save_state(FEED_CACHE_FILE, feed_cache)
+    logger.info(f"Fetched {len(feeds)} feeds in {time.monotonic() - start:.2f}s")
+    return list(zip(feeds, results))
+
+
+async def _fetch_feed(session: "aiohttp.ClientSession", semaphore: asyncio.Semaphore,
+                      feed: FeedConfig, feed_cache: Dict,
+                      should_stop: Optional[Callable[[Dict], bool]] = None,
+                      pool: Optional[Executor] = None) -> Optional["feedparser.FeedParserDict"]:
+    """
+    Download and parse a single feed.
+    
+    Args:
+        session: Shared HTTP session
+        semaphore: Concurrency limiter
+        feed: Feed to fetch
+        feed_cache: Loaded feed cache state (updated in place)
+        should_stop: Optional predicate; when given the body is parsed while
+            it streams in and the download stops at the first matching entry
+        pool: Optional parse pool; when given the body is parsed in a worker
+            process and a StreamedFeed is returned
+        
+    Returns:
+        Parsed feed object, FEED_UNCHANGED, or None if error
+    """
+    try:
+        content, headers, handled = await retry_async(
+            lambda: _download(session, semaphore, feed, feed_cache, should_stop), f"Fetching feed {feed.name}"
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out after {feed.timeout}s fetching feed {feed.name}")
+        return None
+    except Exception as e:
+        logger.error(f"Error fetching feed {feed.name}: {e}")
+        return None
+    if content is None:
+        return handled
+    
+    if pool:
+        # Workers report their own parse time, excluding time spent queued
+        parsed = await parse_in_pool(pool, content, headers)
+    else:
+        with metrics.span('parse'):
+            parsed = parse_feed_content(content, headers)
+    if not parsed:
+        return None
+    metrics.incr('entries_parsed', len(parsed.entries))
+    
+    record_feed_validators(feed_cache, feed.url, headers, len(content))
+    logger.info("Successfully fetched %d entries from %s", len(parsed.entries), feed.name)
+    return parsed
+
+
+async def _download(session: "aiohttp.ClientSession", semaphore: asyncio.Semaphore, feed: FeedConfig,
+                    feed_cache: Dict, should_stop: Optional[Callable[[Dict], bool]] = None
+                    ) -> Tuple[Optional[bytes], Optional[Mapping[str, str]], Optional["feedparser.FeedParserDict"]]:
+    """
+    Make one attempt at downloading a feed.
+    
+    The slot in the concurrency limit is only held while downloading, not
+    while waiting to retry. The timeout is capped by the run deadline.
+    
+    Args:
+        session: Shared HTTP session
+        semaphore: Concurrency limiter
+        feed: Feed to fetch
+        feed_cache: Loaded feed cache state (updated in place)
+        should_stop: Optional streaming stop predicate
+        
+    Returns:
+        (body, headers, None) for a full download, or (None, None, result)
+        when the response was handled already (304 Not Modified or streamed)
+        
+    Raises:
+        Exception: On timeouts, connection failures and HTTP error statuses
+    """
+    import aiohttp
+    
+    async with semaphore:
+        logger.info("Fetching feed %s from: %s", feed.name, feed.url)
+        async with session.get(
+            feed.url,
+            headers=conditional_headers(feed_cache.get(feed.url, {})),
+            timeout=aiohttp.ClientTimeout(total=attempt_timeout(feed.timeout))
+        ) as response:
+            if response.status == 304:
+                record_not_modified(feed_cache, feed.url, response.headers)
+                metrics.incr('feeds_unchanged')
+                return None, None, FEED_UNCHANGED
+            response.raise_for_status()
+            if should_stop:
+                return None, None, await _stream_feed(response, feed, feed_cache, should_stop)
+            content = await response.read()
+            metrics.incr('bytes_fetched', len(content))
+            return content, response.headers, None
+
+
+async def _stream_feed(response: "aiohttp.ClientResponse", feed: FeedConfig, feed_cache: Dict,
+                       should_stop: Callable[[Dict], bool]) -> Optional["feedparser.FeedParserDict"]:
+    """
+    Parse a feed incrementally as it downloads, stopping at the first known entry.
+    
+    Falls back to feedparser on the full body if the feed is not well-formed XML.
+    
+    Args:
+        response: Open HTTP response
+        feed: Feed being fetched
+        feed_cache: Loaded feed cache state (updated in place)
+        should_stop: Predicate for the entry at which to stop reading
+        
+    Returns:
+        StreamedFeed with the entries read, or a feedparser result on fallback
+    """
+    parser = FeedStreamParser()
+    received = bytearray()
+    entries = []
+    stopped = False
+    parse_time = 0.0  # parsing is interleaved with the download, so time it chunk by chunk
+    
+    try:
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            received += chunk
+            parse_start = time.monotonic()
+            for entry in parser.feed(chunk):
+                entries.append(entry)
+                if should_stop(entry):
+                    stopped = True
+                    break
+            parse_time += time.monotonic() - parse_start
+            if stopped:
+                break
+    except ET.ParseError as e:
+        logger.warning(f"Streaming parse of {feed.name} failed ({e}), falling back to feedparser")
+        received += await response.read()
+        metrics.incr('bytes_fetched', len(received))
+        with metrics.span('parse'):
+            parsed = parse_feed_content(bytes(received), response.headers)
+        if parsed:
+            metrics.incr('entries_parsed', len(parsed.entries))
+            record_feed_validators(feed_cache, feed.url, response.headers, len(received))
+        return parsed
+    
+    metrics.record('parse', parse_time)
+    metrics.incr('bytes_fetched', len(received))
+    metrics.incr('entries_parsed', len(entries))
+    
+    # Everything new in this version of the feed has been seen, so its
+    # validators are still safe to reuse even if the rest was never read
+    content_length = int(response.headers.get('Content-Length', len(received)))
+    record_feed_validators(feed_cache, feed.url, response.headers, content_length)
+    
+    logger.info("Streamed %d entries (%d bytes) from %s%s", len(entries), len(received), feed.name,
+                ", stopped at first known entry" if stopped else "")
+    return StreamedFeed(entries, parser.channel)
@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+from src.config import DISPATCH_RSS_URL, DISCORD_CHANNEL_ID, DISCORD_CHANNEL_IDS, FEEDS_FILE, FEED_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChannelTarget:
+    """A Discord channel posts are mirrored to, with optional formatting overrides."""
+    channel_id: Optional[str]
+    mention: Optional[str] = None  # prefixed to the message text, e.g. "<@&role_id>"
+    color: Optional[int] = None  # embed color, defaults to the Dispatch blue
+    footer: Optional[str] = None
+    thumbnail: Optional[str] = None
+    
+    def __post_init__(self):
+        # Accept "#ff6600" as well as an integer in the registry
+        if isinstance(self.color, str):
+            self.color = int(self.color.lstrip('#'), 16)
+
+
+def default_channels() -> List[ChannelTarget]:
+    """
+    Get the channels feeds post to when the registry names none.
+    
+    Returns:
+        A target per DISCORD_CHANNEL_IDS entry, or DISCORD_CHANNEL_ID
+    """
+    return [ChannelTarget(channel_id) for channel_id in DISCORD_CHANNEL_IDS] or [ChannelTarget(DISCORD_CHANNEL_ID)]
+
+
+def channel_target(raw: Union[str, Dict, ChannelTarget]) -> ChannelTarget:
+    """
+    Build a channel target from its registry form.
+    
+    Args:
+        raw: Channel ID string, object with ``channel_id`` and overrides, or a
+            ChannelTarget
+            
+    Returns:
+        Channel target
+    """
+    if isinstance(raw, ChannelTarget):
+        return raw
+    if isinstance(raw, dict):
+        return ChannelTarget(**raw)
+    return ChannelTarget(str(raw))
+
+
+@dataclass
+class FeedConfig:
+    """A watched feed and the channels its posts are sent to."""
+    name: str
+    url: str
+    channel_id: Optional[str] = None  # shorthand for a single channel without overrides
+    hours_back: int = 1
+    timeout: float = FEED_TIMEOUT  # seconds, per feed
+    enabled: bool = True
+    channels: List[ChannelTarget] = field(default_factory=list)
+    
+    def __post_init__(self):
+        if self.channels:
+            self.channels = [channel_target(raw) for raw in self.channels]
+        elif self.channel_id:
+            self.channels = [ChannelTarget(self.channel_id)]
+        else:
+            self.channels = default_channels()
+
+
+def channel_targets(feeds: List[FeedConfig]) -> Dict[Optional[str], ChannelTarget]:
+    """
+    Index the channel targets of all feeds by channel ID.
+    
+    Used to format deliveries retried from the queue, which only record the
+    channel. When feeds configure the same channel differently the first wins.
+    
+    Args:
+        feeds: Feed configurations
+        
+    Returns:
+        Channel targets by channel ID
+    """
+    targets = {}
+    for feed in feeds:
+        for target in feed.channels:
+            targets.setdefault(target.channel_id, target)
+    return targets
+
+
+def default_feed() -> FeedConfig:
+    """
+    Get the built-in THOR Collective Dispatch feed.
+    
+    Returns:
+        Feed configuration for DISPATCH_RSS_URL
+    """
+    return FeedConfig(name="THOR Collective Dispatch", url=DISPATCH_RSS_URL)
+
+
+def load_feed_registry(path: str = FEEDS_FILE) -> List[FeedConfig]:
+    """
+    Load the list of watched feeds.
+    
+    The registry is a JSON list of objects with ``name``, ``url`` and optional
+    ``channel_id`` or ``channels``, ``hours_back``, ``timeout`` and ``enabled``
+    keys. ``channels`` lists channel IDs or objects with a ``channel_id`` and
+    optional ``mention``, ``color``, ``footer`` and ``thumbnail`` overrides.
+    Feeds without a channel post to DISCORD_CHANNEL_IDS (or
+    DISCORD_CHANNEL_ID). When the file does not exist only the Dispatch feed
+    is watched.
+    
+    Args:
+        path: Path to the registry JSON file
+        
+    Returns:
+        Enabled feed configurations
+    """
+    if not os.path.exists(path):
+        return [default_feed()]
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw_feeds = json.load(f)
+        
+        feeds = []
+        for raw in raw_feeds:
+            feed = FeedConfig(**raw)
+            if feed.enabled:
+                feeds.append(feed)
+    except (OSError, ValueError, TypeError) as e:
+        logger.error(f"Invalid feed registry {path}: {e}")
+        return [default_feed()]
+    
+    logger.info(f"Loaded {len(feeds)} feeds from {path}")
+    return feeds
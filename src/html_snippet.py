@@ -0,0 +1,108 @@
+import re
+from html.parser import HTMLParser
+from typing import List
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Elements whose text is never shown to readers
+_SKIPPED_TAGS = frozenset({'script', 'style', 'template', 'noscript', 'head', 'title'})
+
+# Elements that separate words even without surrounding whitespace
+_BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption',
+    'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'ol', 'p',
+    'pre', 'section', 'table', 'td', 'th', 'tr', 'ul'
+})
+
+# How much HTML is handed to the parser at a time; parsing stops between chunks
+# once enough text has been collected
+_CHUNK_SIZE = 2048
+
+
+class _SnippetParser(HTMLParser):
+    """HTML parser that collects collapsed visible text up to a budget."""
+    
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.done = False
+        self._parts: List[str] = []
+        self._length = 0
+        self._last_space = True  # drops leading whitespace
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._append(' ')
+    
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self._append(' ')
+    
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in _BLOCK_TAGS:
+            self._append(' ')
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._append(data)
+    
+    def _append(self, text: str) -> None:
+        if self.done:
+            return
+        text = _WHITESPACE_RE.sub(' ', text)
+        if self._last_space and text.startswith(' '):
+            text = text[1:]
+        if not text:
+            return
+        
+        self._parts.append(text)
+        self._length += len(text)
+        self._last_space = text.endswith(' ')
+        # One character past the limit tells us the text has to be cut
+        if self._length > self.limit:
+            self.done = True
+    
+    def text(self) -> str:
+        return ''.join(self._parts).strip()
+
+
+def html_to_snippet(markup: str, limit: int = 300) -> str:
+    """
+    Extract a plain-text preview from an HTML fragment.
+    
+    The markup is parsed in a single pass with ``html.parser`` and parsing stops
+    as soon as enough text has been collected, so the cost depends on the
+    snippet size rather than the article size. Script/style content is
+    dropped, entities are decoded, whitespace is collapsed and over-long text
+    is cut on a word boundary with a trailing "...".
+    
+    Args:
+        markup: HTML (or plain text) to summarize
+        limit: Maximum snippet length in characters, excluding the ellipsis
+        
+    Returns:
+        Plain-text snippet
+    """
+    parser = _SnippetParser(limit)
+    for start in range(0, len(markup), _CHUNK_SIZE):
+        parser.feed(markup[start:start + _CHUNK_SIZE])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    
+    text = parser.text()
+    if len(text) <= limit:
+        return text
+    
+    cut = text[:limit]
+    # Prefer ending on a whole word unless that would throw most of it away
+    boundary = cut.rfind(' ')
+    if boundary > limit // 2:
+        cut = cut[:boundary]
+    return cut.rstrip(' ,;:.-') + "..."
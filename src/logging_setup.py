@@ -0,0 +1,157 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from src.config import (
+    LOG_FORMAT, LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_SAMPLE_BURST, LOG_SAMPLE_WINDOW,
+    LOG_SAMPLING
+)
+
+# Numbers are collapsed when grouping messages for sampling, so
+# "Sending message 3/40" and "Sending message 4/40" count as one message
+_NUMBER_RE = re.compile(r'\d+')
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thin out repetitive INFO and DEBUG messages from chatty loggers.
+    
+    For each configured logger, the first ``burst`` occurrences of a message
+    template (``record.msg``, numbers ignored) in every ``window`` seconds
+    are kept, then only every Nth, so messages that log per entry or per
+    request must pass their variable parts as arguments. Warnings and errors are never dropped, and loggers without a rate
+    are left alone.
+    """
+    
+    def __init__(self, rates: Mapping[str, int] = LOG_SAMPLING, burst: int = LOG_SAMPLE_BURST,
+                 window: float = LOG_SAMPLE_WINDOW):
+        """
+        Args:
+            rates: Keep-one-in-N rate per logger name
+            burst: Occurrences of each message kept per window before sampling starts
+            window: Seconds after which the counts start over
+        """
+        super().__init__()
+        self.rates = dict(rates)
+        self.burst = burst
+        self.window = window
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.window_start = time.time()
+        self.dropped = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.name)
+        if not rate or rate <= 1 or record.levelno >= logging.WARNING:
+            return True
+        
+        if record.created - self.window_start >= self.window:
+            self.counts.clear()
+            self.window_start = record.created
+        
+        # Sample on the template, never the formatted message: per-entry logs
+        # pass titles and IDs as arguments, and dropped records skip formatting
+        key = (record.name, _NUMBER_RE.sub('#', str(record.msg)))
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count <= self.burst or (count - self.burst) % rate == 0:
+            return True
+        self.dropped += 1
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting, including exceptions, to the listener's handlers."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now, as they may be mutated after the call returns, but
+        # keep the record otherwise intact for the JSON formatter
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(log_file: Optional[str] = LOG_FILE, level: str = LOG_LEVEL) -> logging.handlers.QueueListener:
+    """
+    Route all logging through an in-memory queue drained by a background thread.
+    
+    Callers only pay for building and enqueueing a record; console output and
+    the JSON-lines log file (rotated at LOG_MAX_BYTES) are written by the
+    listener thread, so slow disks never block the event loop. Repetitive
+    messages are sampled before they are queued. Queued records are flushed
+    at interpreter exit.
+    
+    Args:
+        log_file: JSON-lines log file path (None or empty for console only)
+        level: Root log level name
+        
+    Returns:
+        The running queue listener
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers = [console]
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, level))
+    
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
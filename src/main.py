@@ -1,22 +1,43 @@
 #!/usr/bin/env python3
+import argparse
 import logging
+import random
+import signal
 import sys
-from src.config import LOG_FORMAT, LOG_LEVEL, DRY_RUN
-from src.rss_handler import fetch_dispatch_feed, get_latest_dispatch_posts
-from src.discord_poster import DispatchDiscordPoster
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format=LOG_FORMAT,
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('dispatch_monitor.log')
-    ]
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from src.config import (
+    BACKFILL_CHECKPOINT_FILE, DRY_RUN, DISCORD_TRANSPORT, EDIT_POSTS, FEED_PARSER, POLL_ADAPTIVE, POLL_INTERVAL,
+    POLL_JITTER, RUN_DEADLINE, WEBSUB_BIND, WEBSUB_CALLBACK_URL
 )
+from src.delivery_queue import DeliveryQueue, delivery_key
+from src.feed_fetcher import fetch_all_feeds
+from src.feeds import ChannelTarget, FeedConfig, channel_targets, load_feed_registry
+from src.logging_setup import configure_logging
+from src.metrics import metrics
+from src.parse_pool import shutdown_parse_pool
+from src.poll_scheduler import PollScheduler
+from src.post import DispatchPost
+from src.posted_messages import PostedMessages
+from src.retry import CircuitBreaker, set_run_deadline
+from src.rss_handler import get_latest_dispatch_posts, reset_feed_validators, stream_stop_condition, FEED_UNCHANGED
+from src.seen_index import SeenIndex
+from src.state import load_state, save_state
+from src.timestamps import parse_timestamp
+
+# src.discord_poster pulls in discord.py; it is imported only on the paths that
+# actually talk to Discord so "nothing new" runs stay cheap
+if TYPE_CHECKING:
+    import feedparser
+    from src.discord_poster import DiscordConnection
 
 logger = logging.getLogger(__name__)
 
+# Serializes polls and WebSub pushes, which share the seen index and the queue
+_delivery_lock = threading.Lock()
+
 
 def handle_error(error: Exception, context: str) -> None:
     """
@@ -31,16 +52,235 @@ def handle_error(error: Exception, context: str) -> None:
     
     # Send Discord notification for critical errors
     try:
+        from src.discord_poster import DispatchDiscordPoster
         discord = DispatchDiscordPoster()
         discord.send_error_notification(error_msg)
     except Exception as e:
         logger.error(f"Failed to send error notification: {e}")
 
 
-def monitor_dispatch() -> bool:
+def deliver_posts(deliveries: Dict[Optional[str], List[DispatchPost]], seen: SeenIndex,
+                  queue: Optional[DeliveryQueue], connection: Optional["DiscordConnection"] = None,
+                  targets: Optional[Dict[Optional[str], ChannelTarget]] = None,
+                  posted: Optional[PostedMessages] = None) -> int:
+    """
+    Fan posts out to their channels, recording each one as soon as Discord confirms it.
+    
+    Args:
+        deliveries: Posts to send, oldest first, by channel ID
+        seen: Index of already-posted entries
+        queue: Delivery queue the posts were enqueued in (None in dry run mode)
+        connection: Optional persistent Discord session (daemon mode)
+        targets: Optional channel targets by channel ID, for formatting overrides
+        posted: Optional record of posted messages, for editing posts later
+        
+    Returns:
+        Number of (channel, post) deliveries made
+    """
+    from src.discord_poster import DispatchDiscordPoster
+    discord_poster = DispatchDiscordPoster(connection=connection)
+    
+    def on_posted(channel_id: Optional[str], post: DispatchPost, message_id: int) -> None:
+        # The GUID stops the post being found again; the per-channel key lets
+        # the queue tell which channels already have it
+        seen.add(post.guid)
+        seen.add(delivery_key(channel_id, post))
+        if queue is not None:
+            queue.ack(channel_id, post, message_id)
+        if posted is not None:
+            posted.record(channel_id, post, message_id)
+    
+    results = discord_poster.fan_out(deliveries, targets, on_posted=on_posted)
+    
+    # Anything not acknowledged stays queued and is retried with backoff
+    if queue is not None:
+        for channel_id, posts in deliveries.items():
+            queue.fail(channel_id, posts)
+        queue.sync()
+    
+    return sum(results.values())
+
+
+def drain_queue(queue: DeliveryQueue, seen: SeenIndex, connection: Optional["DiscordConnection"] = None,
+                targets: Optional[Dict[Optional[str], ChannelTarget]] = None,
+                posted: Optional[PostedMessages] = None) -> Tuple[int, int]:
+    """
+    Send every queued delivery whose retry is due, oldest first per channel.
+    
+    Deliveries the seen index already records were made by a run that stopped
+    before acknowledging them; they are acknowledged without being resent.
+    
+    Args:
+        queue: Delivery queue
+        seen: Index of already-posted entries
+        connection: Optional persistent Discord session (daemon mode)
+        targets: Optional channel targets by channel ID, for formatting overrides
+        posted: Optional record of posted messages, for editing posts later
+        
+    Returns:
+        (deliveries attempted, deliveries made)
+    """
+    pending: Dict[Optional[str], List[DispatchPost]] = {}
+    for channel_id, posts in queue.due().items():
+        for post in posts:
+            if delivery_key(channel_id, post) in seen:
+                queue.ack(channel_id, post, None)
+            else:
+                pending.setdefault(channel_id, []).append(post)
+    
+    attempted = sum(len(posts) for posts in pending.values())
+    if not attempted:
+        return 0, 0
+    logger.info(f"Sending {attempted} queued deliveries to {len(pending)} channels")
+    return attempted, deliver_posts(pending, seen, queue, connection, targets, posted)
+
+
+def edit_changed_posts(feed: "feedparser.FeedParserDict", posted: PostedMessages,
+                       targets: Optional[Dict[Optional[str], ChannelTarget]] = None) -> int:
+    """
+    Edit the Discord messages of already-posted entries whose content changed.
+    
+    A post's new content is stored only once all of its messages were
+    edited, so failed edits are retried on the next run.
+    
+    Args:
+        feed: Freshly fetched feed
+        posted: Record of posted messages
+        targets: Optional channel targets by channel ID, for formatting overrides
+        
+    Returns:
+        Number of posts updated
+    """
+    changed = posted.changed_posts(feed.entries)
+    if not changed:
+        return 0
+    
+    from src.discord_poster import DispatchDiscordPoster
+    edits = posted.edits_for(post for post, _ in changed)
+    logger.info(f"Editing {len(edits)} Discord messages for {len(changed)} changed posts")
+    edited = DispatchDiscordPoster().edit_messages(edits, targets)
+    
+    updated = 0
+    for post, raw in changed:
+        if all(message in edited for message in posted.messages_of(post.guid)):
+            posted.commit(post, raw)
+            updated += 1
+    return updated
+
+
+def process_feed(feed_config: FeedConfig, feed: "feedparser.FeedParserDict", seen: SeenIndex,
+                 queue: Optional[DeliveryQueue], connection: Optional["DiscordConnection"] = None,
+                 targets: Optional[Dict[Optional[str], ChannelTarget]] = None,
+                 posted: Optional[PostedMessages] = None,
+                 hours_back: Optional[float] = None) -> Tuple[List[DispatchPost], int, int]:
+    """
+    Edit a feed's changed posts and fan its new posts out to the feed's channels.
+    
+    Used for polled feeds and for feed bodies pushed by a WebSub hub alike.
+    
+    Args:
+        feed_config: Feed the body belongs to
+        feed: Parsed feed
+        seen: Index of already-posted entries
+        queue: Delivery queue (None in dry run mode)
+        connection: Optional persistent Discord session (daemon mode)
+        targets: Optional channel targets by channel ID, for formatting overrides
+        posted: Optional record of posted messages, for editing posts later
+        hours_back: How far back to look for new posts (defaults to the feed's setting)
+        
+    Returns:
+        (new posts oldest first, deliveries due, deliveries made)
+    """
+    # Edit posted messages whose entries changed, then get posts that have
+    # not been posted yet
+    if posted is not None and EDIT_POSTS:
+        metrics.incr('posts_edited', edit_changed_posts(feed, posted, targets))
+    logger.info(f"Checking for new posts in {feed_config.name}")
+    with metrics.span('filter'):
+        new_posts = get_latest_dispatch_posts(
+            feed, hours_back=feed_config.hours_back if hours_back is None else hours_back, seen=seen,
+            feed_url=feed_config.url
+        )
+    
+    # Reverse the order so oldest posts are sent first (chronological order)
+    new_posts.reverse()
+    
+    # Mirror every post to each of the feed's channels, skipping
+    # deliveries already in the queue waiting for their retry
+    use_queue = queue is not None
+    deliveries = {}
+    for target in feed_config.channels:
+        posts = new_posts
+        if use_queue:
+            posts = [post for post in new_posts if delivery_key(target.channel_id, post) not in queue]
+        if posts:
+            deliveries[target.channel_id] = posts
+    
+    if not deliveries:
+        logger.info(f"No new posts found in {feed_config.name}")
+        return new_posts, 0, 0
+    
+    # Write the posts ahead to the queue so nothing is lost if sending fails
+    if use_queue and not queue.enqueue_all(deliveries):
+        logger.warning("Could not write to the delivery queue, sending without it")
+        use_queue = False
+    
+    # Fan the new posts out to all of the feed's channels at once
+    delivery_count = sum(len(posts) for posts in deliveries.values())
+    logger.info(f"Posting {len(new_posts)} posts from {feed_config.name} to "
+                f"{len(deliveries)} Discord channels...")
+    success_count = deliver_posts(deliveries, seen, queue if use_queue else None, connection, targets, posted)
+    
+    # Without the queue, make sure the next run re-reads the feed for
+    # anything left undelivered
+    if not use_queue and (success_count < delivery_count or DRY_RUN):
+        reset_feed_validators(feed_config.url)
+    
+    return new_posts, delivery_count, success_count
+
+
+def deliver_pushed_feed(feed_config: FeedConfig, feed: "feedparser.FeedParserDict",
+                        connection: Optional["DiscordConnection"] = None) -> int:
+    """
+    Deliver the new posts of a feed body pushed by a WebSub hub.
+    
+    Goes through the same path as a polled feed, so a post found by both a
+    push and a poll is only sent once.
+    
+    Args:
+        feed_config: Feed the body belongs to
+        feed: Parsed pushed body
+        connection: Optional persistent Discord session (daemon mode)
+        
+    Returns:
+        Number of (channel, post) deliveries made
+    """
+    with _delivery_lock:
+        queue = None if DRY_RUN else DeliveryQueue()
+        posted = None if DRY_RUN else PostedMessages()
+        try:
+            targets = channel_targets(load_feed_registry())
+            _, _, delivered = process_feed(feed_config, feed, SeenIndex(), queue, connection, targets, posted)
+            return delivered
+        finally:
+            if queue is not None:
+                queue.close()
+            if posted is not None:
+                posted.close()
+
+
+def monitor_dispatch(connection: Optional["DiscordConnection"] = None, force: bool = False) -> bool:
     """
     Main function to monitor THOR Collective Dispatch feed.
     
+    With adaptive polling only the feeds whose next poll has come are fetched,
+    and feeds whose circuit breaker is open are not fetched at all. Transient
+    failures are retried only while they fit the run deadline.
+    
+    Args:
+        connection: Optional persistent Discord session (daemon mode)
+        force: Poll every feed, ignoring the adaptive schedule
+        
     Returns:
         True if successful, False otherwise
     """
@@ -49,59 +289,365 @@ def monitor_dispatch() -> bool:
     logger.info(f"Dry run mode: {DRY_RUN}")
     logger.info("=" * 50)
     
+    metrics.reset()
+    set_run_deadline(RUN_DEADLINE)
+    success = False
+    
+    # Dry runs never send anything, so they must not leave deliveries behind
+    queue = None if DRY_RUN else DeliveryQueue()
+    posted = None if DRY_RUN else PostedMessages()
+    scheduler = PollScheduler() if POLL_ADAPTIVE else None
+    breaker = CircuitBreaker()
+    
     try:
-        # Step 1: Fetch Dispatch RSS feed
-        logger.info("Fetching THOR Collective Dispatch RSS feed")
-        feed = fetch_dispatch_feed()
-        if not feed:
-            raise Exception("Failed to fetch Dispatch RSS feed")
+        seen = SeenIndex()
+        feeds = load_feed_registry()
+        targets = channel_targets(feeds)
+        total_found = 0
+        total_new = 0
+        total_posted = 0
         
-        # Step 2: Get latest posts (checking last hour)
-        logger.info("Checking for new Dispatch posts")
-        new_posts = get_latest_dispatch_posts(feed, hours_back=1)
+        # Step 1: Retry deliveries left over from earlier runs
+        if queue is not None:
+            total_new, total_posted = drain_queue(queue, seen, connection, targets, posted)
         
-        if not new_posts:
-            logger.info("No new Dispatch posts found")
-            return True
+        # Step 2: Fetch the feeds that are due concurrently, looking back at
+        # least as far as each one's last poll, unless they keep failing
+        due_feeds = feeds if scheduler is None or force else scheduler.due(feeds)
+        metrics.incr('feeds_skipped', len(feeds) - len(due_feeds))
+        open_feeds = [feed_config for feed_config in due_feeds if not breaker.allow(feed_config.url)]
+        for feed_config in open_feeds:
+            retry_at = datetime.fromtimestamp(breaker.open_until(feed_config.url), timezone.utc)
+            logger.warning(f"Skipping {feed_config.name}: circuit open until {retry_at:%H:%M} UTC")
+        if open_feeds:
+            metrics.incr('feeds_circuit_open', len(open_feeds))
+            due_feeds = [feed_config for feed_config in due_feeds if feed_config not in open_feeds]
+        lookback = {
+            feed_config.url: scheduler.lookback_hours(feed_config) if scheduler else feed_config.hours_back
+            for feed_config in due_feeds
+        }
+        results = []
+        if due_feeds:
+            logger.info(f"Fetching {len(due_feeds)} of {len(feeds)} RSS feeds")
+            stop_at = None
+            if FEED_PARSER == 'stream':
+                # Edit detection needs every tracked entry, so streams go on
+                # past the first posted entry down to the oldest tracked post
+                edit_horizon = posted.oldest_published() if posted is not None and EDIT_POSTS else None
+                stop_at = lambda feed_config: stream_stop_condition(
+                    lookback[feed_config.url], seen, feed_config.url, edit_horizon
+                )
+            results = fetch_all_feeds(due_feeds, stop_at=stop_at)
+        elif scheduler is not None:
+            logger.info(f"No feeds due, next poll in {scheduler.seconds_until_due(feeds) / 60:.0f}m")
         
-        # Step 3: Post all new updates to Discord in a single session
-        discord_poster = DispatchDiscordPoster()
+        failed_feeds = []
+        found = {}
         
-        # Reverse the order so oldest posts are sent first (chronological order)
-        new_posts.reverse()
+        for feed_config, feed in results:
+            if not feed:
+                breaker.record_failure(feed_config.url)
+                failed_feeds.append(feed_config.name)
+                continue
+            breaker.record_success(feed_config.url)
+            if feed is FEED_UNCHANGED:
+                logger.info(f"{feed_config.name} unchanged since last run - nothing to do")
+                continue
+            
+            # Steps 3-4: Edit changed posts, then fan the new ones out
+            new_posts, delivery_count, success_count = process_feed(
+                feed_config, feed, seen, queue, connection, targets, posted, lookback[feed_config.url]
+            )
+            total_found += len(new_posts)
+            found[feed_config.url] = new_posts
+            total_new += delivery_count
+            total_posted += success_count
         
-        logger.info(f"Posting {len(new_posts)} posts to Discord...")
-        success_count = discord_poster.post_multiple_to_discord(new_posts)
+        # Step 5: Plan each polled feed's next poll from what it showed
+        if scheduler is not None:
+            for feed_config, feed in results:
+                scheduler.observe(feed_config, feed, found.get(feed_config.url, ()))
+        
+        metrics.incr('deliveries_due', total_new)
+        metrics.incr('feeds_failed', len(failed_feeds))
         
         # Summary
         logger.info("=" * 50)
         logger.info("Dispatch Monitor completed")
-        logger.info(f"New posts found: {len(new_posts)}")
-        logger.info(f"Successfully posted: {success_count}")
+        logger.info(f"Feeds checked: {len(results)}")
+        if len(results) + len(open_feeds) < len(feeds):
+            logger.info(f"Feeds not due yet: {len(feeds) - len(results) - len(open_feeds)}")
+        if open_feeds:
+            logger.info(f"Feeds skipped after repeated failures: {len(open_feeds)}")
+        logger.info(f"New posts found: {total_found}")
+        logger.info(f"Deliveries made: {total_posted}/{total_new}")
+        if queue is not None:
+            logger.info(f"Deliveries pending retry: {len(queue)}")
         logger.info("=" * 50)
         
-        return success_count == len(new_posts)
+        if failed_feeds:
+            raise Exception(f"Failed to fetch RSS feeds: {', '.join(failed_feeds)}")
         
+        success = total_posted == total_new
+        return success
+    
     except Exception as e:
         handle_error(e, "dispatch monitoring")
         return False
+    finally:
+        if queue is not None:
+            metrics.incr('deliveries_pending', len(queue))
+            queue.close()
+        if posted is not None:
+            posted.close()
+        if scheduler is not None:
+            scheduler.close()
+        breaker.close()
+        set_run_deadline(None)
+        metrics.finish(success)
+        metrics.export()
+
+
+def backfill_dispatch(since: float, feed_name: Optional[str] = None) -> bool:
+    """
+    Replay every post published since a date from the feeds' archive listings.
+    
+    Crawled posts that were not posted yet are written to the delivery queue
+    oldest first and then sent, so Discord receives them chronologically under
+    the usual rate limiting. The queue and the seen index double as the
+    checkpoint: rerunning an interrupted backfill skips the crawl for feeds
+    already crawled for the same date and resumes with the undelivered posts.
+    
+    Args:
+        since: Oldest publication time to replay, in epoch seconds
+        feed_name: Optional name of the single feed to backfill
+        
+    Returns:
+        True if everything found was delivered, False otherwise
+    """
+    from src.backfill import crawl_archive
+    
+    logger.info("=" * 50)
+    logger.info(f"Starting backfill since {datetime.fromtimestamp(since, timezone.utc).isoformat()}")
+    logger.info(f"Dry run mode: {DRY_RUN}")
+    logger.info("=" * 50)
+    
+    feeds = [feed for feed in load_feed_registry() if feed_name is None or feed.name == feed_name]
+    if not feeds:
+        logger.error(f"No feed named {feed_name} in the registry")
+        return False
+    
+    targets = channel_targets(feeds)
+    queue = None if DRY_RUN else DeliveryQueue()
+    posted = None if DRY_RUN else PostedMessages()
+    # Whatever does not fit the deadline stays queued for the next backfill run
+    set_run_deadline(RUN_DEADLINE)
+    
+    try:
+        seen = SeenIndex()
+        checkpoint = load_state(BACKFILL_CHECKPOINT_FILE)
+        failed_feeds = []
+        total_new = 0
+        total_posted = 0
+        
+        # Step 1: Crawl each feed's archive and queue what has not been posted
+        for feed_config in feeds:
+            if queue is not None and checkpoint.get(feed_config.url, {}).get('since') == since:
+                logger.info(f"{feed_config.name} already crawled for this backfill, resuming delivery")
+                continue
+            
+            posts = crawl_archive(feed_config, since)
+            if posts is None:
+                failed_feeds.append(feed_config.name)
+                continue
+            
+            posts = [post for post in posts if post.guid not in seen and post.link not in seen]
+            deliveries = {}
+            for target in feed_config.channels:
+                channel_posts = [
+                    post for post in posts
+                    if queue is None or delivery_key(target.channel_id, post) not in queue
+                ]
+                if channel_posts:
+                    deliveries[target.channel_id] = channel_posts
+            logger.info(f"{len(posts)} archived posts from {feed_config.name} still to be posted "
+                        f"to {len(feed_config.channels)} channels")
+            
+            if queue is None:
+                # Dry run: nothing is queued or recorded
+                total_new += sum(len(channel_posts) for channel_posts in deliveries.values())
+                total_posted += deliver_posts(deliveries, seen, None, targets=targets)
+                continue
+            
+            if not queue.enqueue_all(deliveries):
+                failed_feeds.append(feed_config.name)
+                continue
+            checkpoint[feed_config.url] = {'since': since, 'crawled_at': time.time()}
+            save_state(BACKFILL_CHECKPOINT_FILE, checkpoint)
+        
+        # Step 2: Send everything queued, oldest first per channel
+        if queue is not None:
+            attempted, delivered = drain_queue(queue, seen, targets=targets, posted=posted)
+            total_new += attempted
+            total_posted += delivered
+        
+        logger.info("=" * 50)
+        logger.info("Backfill completed")
+        logger.info(f"Deliveries made: {total_posted}/{total_new}")
+        if queue is not None:
+            logger.info(f"Deliveries pending retry: {len(queue)}")
+        logger.info("=" * 50)
+        
+        if failed_feeds:
+            raise Exception(f"Failed to backfill feeds: {', '.join(failed_feeds)}")
+        
+        # Fully delivered, so a later backfill from the same date crawls again
+        if queue is not None and total_posted == total_new:
+            for feed_config in feeds:
+                checkpoint.pop(feed_config.url, None)
+            save_state(BACKFILL_CHECKPOINT_FILE, checkpoint)
+        
+        return total_posted == total_new
+    
+    except Exception as e:
+        handle_error(e, "backfill")
+        return False
+    finally:
+        set_run_deadline(None)
+        if queue is not None:
+            queue.close()
+        if posted is not None:
+            posted.close()
+
+
+def parse_since(value: str) -> float:
+    """
+    Parse the --since argument of the backfill command.
+    
+    Args:
+        value: Date such as ``2025-06-01`` or ``2025-06-01T12:00:00Z``
+        
+    Returns:
+        Epoch seconds
+    """
+    since = parse_timestamp(value)
+    if since is None:
+        raise argparse.ArgumentTypeError(f"invalid date: {value}")
+    return since
+
+
+def run_daemon(interval: float = POLL_INTERVAL, jitter: float = POLL_JITTER, websub: bool = False) -> None:
+    """
+    Keep polling the feeds from one long-lived process.
+    
+    With the gateway transport a single Discord session is kept open across
+    polls. With adaptive polling the process sleeps until the next feed is
+    due, but never less than the interval. With WebSub, pushed feed bodies
+    are delivered as they arrive and polling stays on as the fallback.
+    SIGTERM/SIGINT let the current poll finish and then exit cleanly.
+    
+    Args:
+        interval: Seconds between polls (the shortest wait with adaptive polling)
+        jitter: Random fraction of the interval added or subtracted per poll
+        websub: Also subscribe to the feeds' WebSub hubs and receive pushes
+    """
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        logger.info(f"Received signal {signum}, shutting down after the current poll")
+        stop.set()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    logger.info(f"Starting daemon mode (interval={interval}s, jitter={jitter:.0%})")
+    
+    connection = None
+    if not DRY_RUN and DISCORD_TRANSPORT == 'gateway':
+        from src.discord_poster import DiscordConnection
+        connection = DiscordConnection()
+        if not connection.start():
+            logger.warning("Falling back to a new Discord session per poll")
+            connection = None
+    
+    receiver = None
+    if websub and not WEBSUB_CALLBACK_URL:
+        logger.error("WebSub needs DISPATCH_WEBSUB_CALLBACK (the public URL of this receiver), polling only")
+    elif websub:
+        from src.websub import WebSubReceiver
+        receiver = WebSubReceiver(
+            load_feed_registry(), lambda feed_config, feed: deliver_pushed_feed(feed_config, feed, connection)
+        )
+        host, _, port = WEBSUB_BIND.rpartition(':')
+        receiver.start_in_thread(host or '0.0.0.0', int(port))
+    
+    try:
+        while not stop.is_set():
+            with _delivery_lock:
+                monitor_dispatch(connection)
+            if POLL_ADAPTIVE:
+                # Only ever late, so a feed is never polled before it is due
+                wait = PollScheduler().seconds_until_due(load_feed_registry())
+                delay = max(interval, wait) * (1 + random.uniform(0, jitter))
+            else:
+                delay = interval * (1 + random.uniform(-jitter, jitter))
+            logger.info(f"Next poll in {delay:.1f}s")
+            stop.wait(delay)
+    finally:
+        if receiver:
+            receiver.stop_thread()
+        if connection:
+            connection.close()
+        shutdown_parse_pool()
+        logger.info("Daemon stopped")
 
 
 def main() -> None:
     """
     Main entry point for the Dispatch monitor.
     """
+    arg_parser = argparse.ArgumentParser(description="THOR Collective Dispatch monitor")
+    arg_parser.add_argument("--daemon", action="store_true",
+                            help="keep running and poll on an interval instead of exiting after one run")
+    arg_parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                            help=f"seconds between polls in daemon mode (default: {POLL_INTERVAL})")
+    arg_parser.add_argument("--jitter", type=float, default=POLL_JITTER,
+                            help=f"random fraction of the interval to vary each poll by (default: {POLL_JITTER})")
+    arg_parser.add_argument("--websub", action="store_true",
+                            help="in daemon mode, also receive pushed updates from the feeds' WebSub hubs")
+    arg_parser.add_argument("--force", action="store_true",
+                            help="poll every feed now, ignoring the adaptive polling schedule")
+    commands = arg_parser.add_subparsers(dest="command")
+    backfill_parser = commands.add_parser("backfill", help="replay posts published since a date from the archive")
+    backfill_parser.add_argument("--since", type=parse_since, required=True,
+                                 help="oldest publication date to replay, e.g. 2025-06-01")
+    backfill_parser.add_argument("--feed", help="only backfill the registry feed with this name")
+    args = arg_parser.parse_args()
+    
+    configure_logging()
+    
     try:
         # Test connections if in dry run mode
         if DRY_RUN:
             logger.info("Running in DRY RUN mode - no actual posts will be made")
         
+        if args.command == "backfill":
+            success = backfill_dispatch(args.since, args.feed)
+            sys.exit(0 if success else 1)
+        
+        if args.websub and not args.daemon:
+            arg_parser.error("--websub needs --daemon")
+        
+        if args.daemon:
+            run_daemon(args.interval, args.jitter, args.websub)
+            sys.exit(0)
+        
         # Run main monitoring
-        success = monitor_dispatch()
+        success = monitor_dispatch(force=args.force)
         
         # Exit with appropriate code
         sys.exit(0 if success else 1)
-        
+    
     except KeyboardInterrupt:
         logger.info("Monitor interrupted by user")
         sys.exit(0)
@@ -111,4 +657,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
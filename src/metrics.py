@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Optional
+from src.config import METRICS_TEXTFILE, RUN_SUMMARY_FILE, STAGE_BUDGETS
+
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """
+    Stage timings and counters for one monitor run.
+    
+    Stages are timed with spans on the monotonic clock; a stage entered more
+    than once (such as one span per Discord message) accumulates its total,
+    call count and slowest call. Everything is kept in a few dicts, so
+    instrumenting a hot path costs two clock reads. Safe to update from the
+    Discord connection thread.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Start a new run."""
+        with self._lock:
+            self.started_at = time.time()
+            self._start = time.monotonic()
+            self.stages: Dict[str, List[float]] = {}  # stage -> [total seconds, calls, max seconds]
+            self.counters: Dict[str, float] = {}
+            self.duration: Optional[float] = None
+            self.success: Optional[bool] = None
+    
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """
+        Time the enclosed block as one call of a stage.
+        
+        Args:
+            stage: Stage name, e.g. ``fetch``
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(stage, time.monotonic() - start)
+    
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Add one timed call to a stage.
+        
+        Args:
+            stage: Stage name
+            seconds: Duration of the call
+        """
+        with self._lock:
+            totals = self.stages.get(stage)
+            if totals is None:
+                self.stages[stage] = [seconds, 1, seconds]
+            else:
+                totals[0] += seconds
+                totals[1] += 1
+                totals[2] = max(totals[2], seconds)
+    
+    def incr(self, counter: str, value: float = 1) -> None:
+        """
+        Increase a counter.
+        
+        Args:
+            counter: Counter name, e.g. ``bytes_fetched``
+            value: Amount to add
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+    
+    def finish(self, success: bool) -> None:
+        """
+        Mark the run as finished.
+        
+        Args:
+            success: Whether the run succeeded
+        """
+        self.duration = time.monotonic() - self._start
+        self.success = success
+        self.record('run', self.duration)
+    
+    def slow_stages(self, budgets: Mapping[str, float] = STAGE_BUDGETS) -> Dict[str, float]:
+        """
+        Get the stages whose total time exceeded their budget.
+        
+        Args:
+            budgets: Seconds allowed per stage
+            
+        Returns:
+            Total seconds of each stage over budget
+        """
+        return {stage: totals[0] for stage, totals in self.stages.items()
+                if stage in budgets and totals[0] > budgets[stage]}
+    
+    def summary(self) -> Dict:
+        """
+        Get the run summary.
+        
+        Returns:
+            JSON-serializable run summary
+        """
+        return {
+            'started_at': self.started_at,
+            'duration_seconds': self.duration,
+            'success': self.success,
+            'stages': {
+                stage: {'seconds': round(total, 6), 'calls': calls, 'max_seconds': round(slowest, 6)}
+                for stage, (total, calls, slowest) in self.stages.items()
+            },
+            'counters': dict(self.counters),
+            'slow_stages': sorted(self.slow_stages()),
+        }
+    
+    def prometheus_text(self) -> str:
+        """
+        Render the run in the Prometheus text exposition format.
+        
+        Returns:
+            Metrics text for a node_exporter textfile collector
+        """
+        lines = [
+            "# HELP dispatch_run_timestamp_seconds Start time of the last monitor run.",
+            "# TYPE dispatch_run_timestamp_seconds gauge",
+            f"dispatch_run_timestamp_seconds {self.started_at:.3f}",
+            "# HELP dispatch_run_success Whether the last monitor run succeeded.",
+            "# TYPE dispatch_run_success gauge",
+            f"dispatch_run_success {int(bool(self.success))}",
+            "# HELP dispatch_stage_seconds Time spent in each stage during the last run.",
+            "# TYPE dispatch_stage_seconds gauge",
+        ]
+        lines += [f'dispatch_stage_seconds{{stage="{stage}"}} {total:.6f}'
+                  for stage, (total, _, _) in sorted(self.stages.items())]
+        lines += [
+            "# HELP dispatch_stage_max_seconds Slowest single call of each stage during the last run.",
+            "# TYPE dispatch_stage_max_seconds gauge",
+        ]
+        lines += [f'dispatch_stage_max_seconds{{stage="{stage}"}} {slowest:.6f}'
+                  for stage, (_, _, slowest) in sorted(self.stages.items())]
+        lines += [
+            "# HELP dispatch_stage_calls Number of calls of each stage during the last run.",
+            "# TYPE dispatch_stage_calls gauge",
+        ]
+        lines += [f'dispatch_stage_calls{{stage="{stage}"}} {calls}'
+                  for stage, (_, calls, _) in sorted(self.stages.items())]
+        lines += [
+            "# HELP dispatch_run_count Counters recorded during the last run.",
+            "# TYPE dispatch_run_count gauge",
+        ]
+        lines += [f'dispatch_run_count{{counter="{name}"}} {value:g}'
+                  for name, value in sorted(self.counters.items())]
+        return "\n".join(lines) + "\n"
+    
+    def export(self, textfile: Optional[str] = METRICS_TEXTFILE,
+               summary_file: Optional[str] = RUN_SUMMARY_FILE) -> None:
+        """
+        Log the stage timings and write the Prometheus textfile and JSON summary.
+        
+        Args:
+            textfile: Prometheus textfile path (empty to skip)
+            summary_file: JSON run summary path (empty to skip)
+        """
+        timings = ", ".join(f"{stage}={total:.2f}s" for stage, (total, _, _) in self.stages.items())
+        logger.info(f"Stage timings: {timings}")
+        for stage, seconds in self.slow_stages().items():
+            logger.warning(f"Stage {stage} took {seconds:.2f}s, over its {STAGE_BUDGETS[stage]}s budget")
+        
+        if textfile:
+            _write_atomic(textfile, self.prometheus_text())
+        if summary_file:
+            _write_atomic(summary_file, json.dumps(self.summary(), indent=2))
+
+
+def _write_atomic(path: str, text: str) -> bool:
+    """
+    Replace a file in one step, so collectors never read a partial file.
+    
+    Args:
+        path: File to write
+        text: New contents
+        
+    Returns:
+        True if written successfully, False otherwise
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Could not write metrics to {path}: {e}")
+        return False
+    return True
+
+
+# Metrics of the current run, shared by every instrumented module
+metrics = RunMetrics()
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
+from src.config import PARSE_POOL_MIN_FEEDS, PARSE_WORKERS
+from src.metrics import metrics
+from src.stream_parser import FeedEntry, StreamedFeed
+
+# multiprocessing is only loaded once a pool is actually started
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Entry fields downstream code reads (get_latest_dispatch_posts, entry_digest,
+# extract_post_data and the poll scheduler), in the order they are shipped
+ENTRY_FIELDS = ('id', 'title', 'link', 'summary', 'content', 'author',
+                'published', 'published_parsed', 'updated', 'updated_parsed')
+_PARSED_FIELDS = frozenset({'published_parsed', 'updated_parsed'})
+
+# Channel-level polling hints, under feedparser's key names
+CHANNEL_FIELDS = ('ttl', 'sy_updateperiod', 'sy_updatefrequency')
+
+# (entry rows in ENTRY_FIELDS order, channel hints, bozo message, parse seconds)
+CompactFeed = Tuple[List[tuple], Dict[str, str], Optional[str], float]
+
+_pool: Optional["ProcessPoolExecutor"] = None
+_pool_lock = threading.Lock()
+
+
+def compact_feed(content: bytes, headers: Mapping[str, str]) -> CompactFeed:
+    """
+    Parse a feed body with feedparser and keep only the fields the bot uses.
+    
+    Runs in a worker process. Rows are plain tuples of strings, so they
+    pickle back to the parent far smaller and faster than FeedParserDicts.
+    Bodies are only kept when an entry has no summary, as extract_post_data
+    never reads them otherwise.
+    
+    Args:
+        content: Raw feed bytes
+        headers: Lower-cased HTTP response headers (used for encoding detection)
+        
+    Returns:
+        Compact parse result
+    """
+    import feedparser
+    
+    start = time.process_time()
+    feed = feedparser.parse(content, response_headers=dict(headers))
+    rows = []
+    for entry in feed.entries:
+        summary = entry.get('summary')
+        content_value = None
+        if summary is None and entry.get('content'):
+            content_value = entry.content[0].get('value', '')
+        values = {
+            'id': entry.get('id'),
+            'title': entry.get('title'),
+            'link': entry.get('link'),
+            'summary': summary,
+            'content': content_value,
+            'author': entry.get('author'),
+            'published': entry.get('published'),
+            'published_parsed': tuple(entry.published_parsed) if entry.get('published_parsed') else None,
+            'updated': entry.get('updated'),
+            'updated_parsed': tuple(entry.updated_parsed) if entry.get('updated_parsed') else None,
+        }
+        rows.append(tuple(values[field] for field in ENTRY_FIELDS))
+    
+    channel = {key: str(feed.feed[key]) for key in CHANNEL_FIELDS if feed.feed.get(key)}
+    bozo = str(feed.get('bozo_exception')) if feed.bozo else None
+    return rows, channel, bozo, time.process_time() - start
+
+
+def expand_feed(compact: CompactFeed) -> StreamedFeed:
+    """
+    Rebuild feed entries from a worker's compact parse result.
+    
+    Args:
+        compact: Result of compact_feed
+        
+    Returns:
+        Feed whose entries behave like feedparser's for the bot's purposes
+    """
+    rows, channel, _, _ = compact
+    entries = []
+    for row in rows:
+        entry = FeedEntry()
+        for field, value in zip(ENTRY_FIELDS, row):
+            if value is None:
+                continue
+            if field in _PARSED_FIELDS:
+                value = time.struct_time(value)
+            elif field == 'content':
+                value = [{'value': value}]
+            entry[field] = value
+        entries.append(entry)
+    return StreamedFeed(entries, FeedEntry(channel))
+
+
+def pool_size() -> int:
+    """
+    Get the size of the shared parse pool.
+    
+    Returns:
+        DISPATCH_PARSE_WORKERS if set, otherwise the core count
+    """
+    return PARSE_WORKERS or os.cpu_count() or 1
+
+
+def parse_workers(feed_count: int) -> int:
+    """
+    Get how many worker processes should parse a batch of feeds.
+    
+    Args:
+        feed_count: Feeds about to be parsed
+        
+    Returns:
+        Number of workers; 1 means parse in-process
+    """
+    workers = pool_size()
+    if workers <= 1 or (not PARSE_WORKERS and feed_count < PARSE_POOL_MIN_FEEDS):
+        return 1
+    return min(workers, feed_count)
+
+
+def parse_pool() -> "ProcessPoolExecutor":
+    """
+    Get the shared parse pool, started on first use and kept for later runs.
+    
+    The pool is sized once with pool_size() and never resized; callers
+    limit how many of its workers they use instead, and workers are only
+    spawned as tasks need them. Workers are spawned rather than forked,
+    since the parent already runs logging and Discord threads, and leave
+    Ctrl-C to the parent so a daemon can finish its poll and shut them down.
+    
+    Returns:
+        Process pool
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = pool_size()
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_ignore_interrupts)
+            logger.info(f"Started a pool of up to {workers} feed parser processes")
+        return _pool
+
+
+def _ignore_interrupts() -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the shared parse pool's worker processes."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def _finish(compact: CompactFeed) -> Optional[StreamedFeed]:
+    """Log a compact result's parse issues and rebuild it, like parse_feed_content."""
+    rows, _, bozo, seconds = compact
+    metrics.record('parse', seconds)
+    if bozo:
+        logger.warning(f"Feed parsing had issues but continuing: {bozo}")
+    if not rows:
+        logger.error("No entries found in Dispatch RSS feed")
+        return None
+    return expand_feed(compact)
+
+
+async def parse_in_pool(pool: Executor, content: bytes, headers: Mapping[str, str]) -> Optional[StreamedFeed]:
+    """
+    Parse a downloaded feed body in a worker process.
+    
+    Falls back to parsing in-process if the pool is broken.
+    
+    Args:
+        pool: Parse pool
+        content: Raw feed bytes
+        headers: HTTP response headers
+        
+    Returns:
+        Parsed feed or None if it has no entries
+    """
+    headers = {k.lower(): v for k, v in headers.items()}
+    try:
+        compact = await asyncio.get_running_loop().run_in_executor(pool, compact_feed, content, headers)
+    except Exception as e:
+        logger.warning(f"Parse worker failed, parsing in-process: {e}")
+        compact = compact_feed(content, headers)
+    return _finish(compact)
+
+
+def parse_feeds(bodies: Sequence[Tuple[bytes, Mapping[str, str]]], workers: int) -> List[Optional[StreamedFeed]]:
+    """
+    Parse already downloaded feed bodies, spread over worker processes.
+    
+    Args:
+        bodies: (raw feed bytes, HTTP response headers) pairs
+        workers: Most feeds parsed at once in the shared pool (capped by its
+            size); 1 parses in-process
+            
+    Returns:
+        Parsed feeds in input order (None for feeds without entries)
+    """
+    headers = [{k.lower(): v for k, v in h.items()} for _, h in bodies]
+    contents = [content for content, _ in bodies]
+    if workers <= 1:
+        return [_finish(compact_feed(content, h)) for content, h in zip(contents, headers)]
+    
+    pool = parse_pool()
+    # Holding back submissions keeps this call to its share of the workers
+    slots = threading.BoundedSemaphore(workers)
+    futures = []
+    for content, h in zip(contents, headers):
+        slots.acquire()
+        future = pool.submit(compact_feed, content, h)
+        future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+    return [_finish(future.result()) for future in futures]
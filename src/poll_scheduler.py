@@ -0,0 +1,289 @@
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from src.config import (
+    FEED_CACHE_FILE, POLL_SCHEDULE_FILE, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_DUE_SLACK, POLL_HISTORY_WEEKS,
+    POLL_HOT_SPAN, POLL_HOT_MIN_POSTS
+)
+from src.feeds import FeedConfig
+from src.metrics import metrics
+from src.post import DispatchPost
+from src.rss_handler import FEED_UNCHANGED
+from src.state import load_state, save_state
+from src.timestamps import entry_timestamp, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+WEEK = 7 * 24 * HOUR
+
+# sy:updatePeriod values in seconds
+UPDATE_PERIODS = {
+    'hourly': HOUR,
+    'daily': 24 * HOUR,
+    'weekly': WEEK,
+    'monthly': 30 * 24 * HOUR,
+    'yearly': 365 * 24 * HOUR,
+}
+
+LATENCY_SAMPLES = 50  # detections kept per feed for the latency report
+
+
+class PollScheduler:
+    """
+    Per-feed poll times learned from each feed's publishing rhythm.
+    
+    Publish times of the entries seen in a feed are kept for
+    POLL_HISTORY_WEEKS. A time of week at which at least POLL_HOT_MIN_POSTS
+    past posts came out (within POLL_HOT_SPAN) is a likely publish window:
+    inside one the feed is polled every min_interval, and a quiet feed's
+    exponential backoff is cut short so the next poll lands as a window
+    opens. Outside them the interval doubles with every poll that finds
+    nothing, up to max_interval. The feed's own hints (``<ttl>``,
+    ``sy:updatePeriod``/``sy:updateFrequency`` and the Cache-Control or
+    Expires lifetime of the last response) are never undercut, though they
+    are capped at max_interval so a stray value cannot stall a feed for days.
+    
+    For every post found, the detection latency (time from publication to
+    the poll that found it) is recorded next to the latency the schedule
+    expected, half the planned interval before that poll.
+    
+    The state is a JSON file in the state directory.
+    """
+    
+    def __init__(self, min_interval: float = POLL_MIN_INTERVAL, max_interval: float = POLL_MAX_INTERVAL,
+                 slack: float = POLL_DUE_SLACK):
+        """
+        Load the poll schedule from the state directory.
+        
+        Args:
+            min_interval: Seconds between polls inside likely publish windows
+            max_interval: Longest wait between polls of a quiet feed
+            slack: Feeds due within this many seconds count as due now
+        """
+        # feed URL -> {'published', 'first_poll', 'last_poll', 'interval', 'next_poll',
+        #              'quiet_polls', 'hints', 'latency'}
+        self._feeds: Dict[str, Dict] = load_state(POLL_SCHEDULE_FILE)
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.slack = slack
+        self._feed_cache: Optional[Dict] = None
+    
+    def due(self, feeds: Iterable[FeedConfig], now: Optional[float] = None) -> List[FeedConfig]:
+        """
+        Get the feeds whose next poll has come.
+        
+        Feeds never polled before are always due.
+        
+        Args:
+            feeds: Registered feeds
+            now: Current time in epoch seconds (defaults to time.time())
+            
+        Returns:
+            Feeds to poll now, in registry order
+        """
+        now = time.time() if now is None else now
+        due = []
+        for feed in feeds:
+            next_poll = self._feeds.get(feed.url, {}).get('next_poll')
+            if next_poll is None or next_poll - now <= self.slack:
+                due.append(feed)
+            else:
+                logger.debug("Skipping %s, next poll in %.0fs", feed.name, next_poll - now)
+        return due
+    
+    def seconds_until_due(self, feeds: Iterable[FeedConfig], now: Optional[float] = None) -> float:
+        """
+        Get how long until the first of the given feeds is due.
+        
+        Args:
+            feeds: Registered feeds
+            now: Current time in epoch seconds (defaults to time.time())
+            
+        Returns:
+            Seconds to wait (0 if a feed is due now)
+        """
+        now = time.time() if now is None else now
+        next_polls = [self._feeds.get(feed.url, {}).get('next_poll') for feed in feeds]
+        if not next_polls or None in next_polls:
+            return 0.0
+        return max(0.0, min(next_polls) - now)
+    
+    def lookback_hours(self, feed: FeedConfig, now: Optional[float] = None) -> float:
+        """
+        Get how far back to look for new posts in a feed.
+        
+        Covers at least the time since the feed was last polled, so posts
+        published during a long quiet-period wait are not cut off.
+        
+        Args:
+            feed: Feed about to be checked
+            now: Current time in epoch seconds (defaults to time.time())
+            
+        Returns:
+            Hours back to check
+        """
+        now = time.time() if now is None else now
+        last_poll = self._feeds.get(feed.url, {}).get('last_poll')
+        if last_poll is None:
+            return feed.hours_back
+        return max(feed.hours_back, (now - last_poll + self.slack) / HOUR)
+    
+    def observe(self, feed: FeedConfig, result, new_posts: Sequence[DispatchPost] = (),
+                now: Optional[float] = None) -> float:
+        """
+        Learn from a poll of a feed and plan its next one.
+        
+        Args:
+            feed: Polled feed
+            result: Parsed feed, FEED_UNCHANGED or None if the fetch failed
+            new_posts: Posts the poll found
+            now: Current time in epoch seconds (defaults to time.time())
+            
+        Returns:
+            Seconds until the feed's next poll
+        """
+        now = time.time() if now is None else now
+        state = self._feeds.setdefault(feed.url, {
+            'published': [],
+            'first_poll': now,
+            'last_poll': None,
+            'interval': None,
+            'next_poll': None,
+            'quiet_polls': 0,
+            'hints': {},
+            'latency': [],
+        })
+        
+        if result is not None and result is not FEED_UNCHANGED:
+            self._learn(state, result, now)
+        if new_posts:
+            self._record_latency(feed, state, new_posts, now)
+            state['quiet_polls'] = 0
+        else:
+            state['quiet_polls'] += 1
+        
+        interval, reason = self._plan(feed, state, now)
+        state['last_poll'] = now
+        state['interval'] = interval
+        state['next_poll'] = now + interval
+        logger.info(f"Next poll of {feed.name} in {interval / 60:.0f}m ({reason})")
+        return interval
+    
+    def _learn(self, state: Dict, result, now: float) -> None:
+        """Merge a fetched feed's publish times and polling hints into its state."""
+        cutoff = now - POLL_HISTORY_WEEKS * WEEK
+        published = {int(t) for t in state['published'] if t >= cutoff}
+        for entry in result.entries:
+            entry_time = entry_timestamp(entry)
+            if entry_time is not None and cutoff <= entry_time <= now:
+                published.add(int(entry_time))
+        state['published'] = sorted(published)
+        
+        channel = getattr(result, 'feed', None) or {}
+        hints = {}
+        try:
+            if channel.get('ttl'):
+                hints['ttl'] = float(channel['ttl']) * 60  # minutes
+            period = UPDATE_PERIODS.get(str(channel.get('sy_updateperiod', '')).strip().lower())
+            if period:
+                frequency = max(1, int(channel.get('sy_updatefrequency') or 1))
+                hints['sy:updatePeriod'] = period / frequency
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid polling hint in feed: {e}")
+        state['hints'] = hints
+    
+    def _record_latency(self, feed: FeedConfig, state: Dict, new_posts: Sequence[DispatchPost], now: float) -> None:
+        """Record how long the new posts took to be found, against what the schedule expected."""
+        if state['interval'] is None:
+            return  # first poll: the posts predate the schedule
+        expected = state['interval'] / 2
+        timed = 0
+        for post in new_posts:
+            published = parse_timestamp(post.pub_date)
+            # Posts published before the feed was first polled are catch-up, not detections
+            if published is None or published < state['first_poll'] or published > now:
+                continue
+            achieved = now - published
+            state['latency'].append([round(expected, 1), round(achieved, 1)])
+            metrics.incr('expected_latency_seconds', expected)
+            metrics.incr('detection_latency_seconds', achieved)
+            timed += 1
+        if timed:
+            metrics.incr('latency_samples', timed)
+            state['latency'] = state['latency'][-LATENCY_SAMPLES:]
+            self._report(feed, state)
+    
+    def _plan(self, feed: FeedConfig, state: Dict, now: float) -> Tuple[float, str]:
+        """Pick the next poll interval of a feed and the reason for it."""
+        published = state['published']
+        if self._is_hot(published, now):
+            interval, reason = self.min_interval, "likely publish window"
+        else:
+            interval = min(self.max_interval, self.min_interval * 2 ** min(state['quiet_polls'], 30))
+            reason = f"quiet for {state['quiet_polls']} polls" if state['quiet_polls'] else "just found posts"
+            opens = self._next_hot(published, now, now + interval)
+            if opens is not None:
+                interval, reason = max(self.min_interval, opens - now), "publish window opening"
+        
+        floor, hint = self._hint_floor(feed, state, now)
+        if floor > interval:
+            interval, reason = floor, f"honoring {hint}"
+        return interval, reason
+    
+    def _hint_floor(self, feed: FeedConfig, state: Dict, now: float) -> Tuple[float, str]:
+        """Get the shortest interval the feed's own hints allow."""
+        hints = dict(state['hints'])
+        if self._feed_cache is None:
+            self._feed_cache = load_state(FEED_CACHE_FILE)
+        fresh_until = self._feed_cache.get(feed.url, {}).get('fresh_until')
+        if fresh_until:
+            hints['Cache-Control/Expires'] = fresh_until - now
+        if not hints:
+            return 0.0, ''
+        hint = max(hints, key=hints.get)
+        return min(hints[hint], self.max_interval), hint
+    
+    @staticmethod
+    def _hot_count(published: List[int], when: float) -> int:
+        """Count past posts published within POLL_HOT_SPAN of the same time of week."""
+        offset = when % WEEK
+        count = 0
+        for t in published:
+            distance = abs(t % WEEK - offset)
+            if min(distance, WEEK - distance) <= POLL_HOT_SPAN:
+                count += 1
+        return count
+    
+    def _is_hot(self, published: List[int], when: float) -> bool:
+        return len(published) >= POLL_HOT_MIN_POSTS and self._hot_count(published, when) >= POLL_HOT_MIN_POSTS
+    
+    def _next_hot(self, published: List[int], start: float, end: float) -> Optional[float]:
+        """Get the time in (start, end] at which the next likely publish window opens."""
+        if len(published) < POLL_HOT_MIN_POSTS:
+            return None
+        # Windows can only open where some post's span begins
+        offset = start % WEEK
+        openings = sorted(start + (t % WEEK - POLL_HOT_SPAN - offset) % WEEK for t in published)
+        for when in openings:
+            if when > end:
+                break
+            if when > start and self._is_hot(published, when):
+                return when
+        return None
+    
+    def _report(self, feed: FeedConfig, state: Dict) -> None:
+        """Log a feed's expected versus achieved detection latency."""
+        samples = state['latency']
+        if not samples:
+            return
+        expected = sum(sample[0] for sample in samples) / len(samples)
+        achieved = sorted(sample[1] for sample in samples)
+        p90 = achieved[min(len(achieved) - 1, int(len(achieved) * 0.9))]
+        logger.info(f"Detection latency of {feed.name} over the last {len(samples)} posts: "
+                    f"expected {expected / 60:.1f}m, achieved {sum(achieved) / len(achieved) / 60:.1f}m "
+                    f"(p90 {p90 / 60:.1f}m)")
+    
+    def close(self) -> None:
+        """Save the schedule."""
+        save_state(POLL_SCHEDULE_FILE, self._feeds)
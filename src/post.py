@@ -0,0 +1,173 @@
+import hashlib
+import json
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Embed defaults for Dispatch posts
+EMBED_AUTHOR = 'Ask-a-Thrunter'
+EMBED_AUTHOR_URL = 'https://dispatch.thorcollective.com'
+EMBED_THUMBNAIL = 'https://pbs.twimg.com/profile_images/1719421917473927168/Aaifurr1_400x400.jpg'  # THOR Collective logo
+EMBED_FOOTER = 'THOR Collective Dispatch'
+EMBED_DESCRIPTION_LENGTH = 500
+
+
+class DispatchPost:
+    """
+    A feed entry ready to be posted, normalized once at extraction time.
+    
+    Instances are immutable and slotted, so large backfills cost a fraction of
+    the memory of the equivalent dicts. Posts serialize to a compact JSON
+    array (one per line in JSON-lines files) for queueing and replay.
+    """
+    
+    __slots__ = ('title', 'link', 'guid', 'content_snippet', 'author', 'pub_date')
+    
+    def __init__(self, title: str, link: str, guid: str = '', content_snippet: str = '',
+                 author: Optional[str] = None, pub_date: str = ''):
+        """
+        Create a post, normalizing its fields.
+        
+        Args:
+            title: Post title
+            link: Post URL (a missing scheme is fixed up to https)
+            guid: Stable entry identity used for de-duplication (defaults to the link)
+            content_snippet: Plain-text preview
+            author: Optional author name
+            pub_date: Publication date as given by the feed
+        """
+        link = link.strip()
+        if link and not link.startswith('http'):
+            link = f"https://{link}"
+        
+        set_field = object.__setattr__
+        set_field(self, 'title', title.strip())
+        set_field(self, 'link', link)
+        set_field(self, 'guid', guid or link)
+        set_field(self, 'content_snippet', content_snippet.strip())
+        set_field(self, 'author', author or None)
+        set_field(self, 'pub_date', pub_date)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, field) for field in self.__slots__)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DispatchPost):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __hash__(self) -> int:
+        return hash(self._fields())
+    
+    def __repr__(self) -> str:
+        return f"DispatchPost(title={self.title!r}, link={self.link!r})"
+    
+    def to_embed_data(self) -> Dict[str, str]:
+        """
+        Build the embed data used by both Discord transports.
+        
+        Returns:
+            Embed data dictionary
+        """
+        return {
+            'title': self.title,
+            'description': self.content_snippet[:EMBED_DESCRIPTION_LENGTH],
+            'url': self.link,
+            'author': self.author or EMBED_AUTHOR,
+            'author_url': EMBED_AUTHOR_URL,
+            'thumbnail': EMBED_THUMBNAIL,
+            'footer': EMBED_FOOTER
+        }
+    
+    def digest(self) -> str:
+        """
+        Hash the normalized content shown in Discord.
+        
+        The GUID and publication date are left out, so an entry that is only
+        re-dated does not count as edited.
+        
+        Returns:
+            Hex digest of the title, link, visible description and author
+        """
+        shown = [self.title, self.link, self.content_snippet[:EMBED_DESCRIPTION_LENGTH], self.author]
+        data = json.dumps(shown, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def to_json(self) -> str:
+        """
+        Serialize the post as a compact JSON array.
+        
+        Returns:
+            JSON text without a trailing newline
+        """
+        return json.dumps(self._fields(), ensure_ascii=False, separators=(',', ':'))
+    
+    @classmethod
+    def from_json(cls, text: str) -> "DispatchPost":
+        """
+        Load a post serialized with to_json.
+        
+        Args:
+            text: JSON text
+            
+        Returns:
+            The post
+        """
+        return cls.from_fields(json.loads(text))
+    
+    def to_fields(self) -> List[Any]:
+        """
+        Get the post fields in serialization order.
+        
+        Returns:
+            List of field values
+        """
+        return list(self._fields())
+    
+    @classmethod
+    def from_fields(cls, fields: Sequence[Any]) -> "DispatchPost":
+        """
+        Load a post from fields returned by to_fields.
+        
+        Args:
+            fields: Field values in serialization order
+            
+        Returns:
+            The post
+        """
+        # Fields are already normalized, so skip __init__
+        post = object.__new__(cls)
+        for name, value in zip(cls.__slots__, fields):
+            object.__setattr__(post, name, value)
+        return post
+
+
+def dump_posts(posts: Iterable[DispatchPost], fp: IO[str]) -> None:
+    """
+    Write posts to a JSON-lines stream.
+    
+    Args:
+        posts: Posts to write
+        fp: Text stream opened for writing
+    """
+    for post in posts:
+        fp.write(post.to_json() + '\n')
+
+
+def load_posts(fp: IO[str]) -> Iterator[DispatchPost]:
+    """
+    Lazily read posts from a JSON-lines stream.
+    
+    Args:
+        fp: Text stream opened for reading
+        
+    Yields:
+        Posts in file order
+    """
+    for line in fp:
+        if line.strip():
+            yield DispatchPost.from_json(line)
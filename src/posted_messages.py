@@ -0,0 +1,213 @@
+import logging
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from src.config import EDIT_TRACK_HOURS, POSTED_MESSAGES_FILE
+from src.post import DispatchPost
+from src.rss_handler import entry_digest, extract_post_data, get_entry_key
+from src.state import load_state, save_state
+from src.timestamps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class MessageEdit(NamedTuple):
+    """A posted Discord message to rewrite with its posts' current content."""
+    channel_id: str
+    message_id: str
+    posts: List[DispatchPost]  # in embed order
+
+
+class PostedMessages:
+    """
+    Discord messages carrying posted entries, with the content digest of each entry.
+    
+    Every delivered post is recorded with the messages it went out in and a
+    digest of its normalized content. On later runs each tracked entry still
+    in the feed is checked against its digest: first cheaply against the raw
+    entry fields, and only if those changed by extracting the post again.
+    Posts whose visible content changed are edited in place, so a fixed typo
+    costs one PATCH per message instead of a duplicate post.
+    
+    The state is a JSON file in the state directory. Posts are tracked for
+    EDIT_TRACK_HOURS after they were sent.
+    """
+    
+    def __init__(self, max_age_hours: float = EDIT_TRACK_HOURS):
+        """
+        Load the posted messages from the state directory.
+        
+        Args:
+            max_age_hours: How long posts are watched for edits
+        """
+        state = load_state(POSTED_MESSAGES_FILE)
+        # guid -> {'fields', 'digest', 'raw', 'posted_at', 'messages': {channel_id: message_id}}
+        self._posts: Dict[str, Dict] = state.get('posts', {})
+        # "channel_id/message_id" -> guids in embed order
+        self._messages: Dict[str, List[str]] = state.get('messages', {})
+        self.max_age = max_age_hours * 3600
+        self._dirty = False
+    
+    def __contains__(self, guid: str) -> bool:
+        return guid in self._posts
+    
+    def __len__(self) -> int:
+        return len(self._posts)
+    
+    def oldest_published(self) -> Optional[float]:
+        """
+        Get the publication time of the oldest tracked post.
+        
+        A streamed feed read has to get this far for every tracked entry still
+        in the feed to be checked for edits.
+        
+        Returns:
+            Epoch seconds, 0.0 if a tracked post has no usable date, or None if
+            no posts are tracked
+        """
+        oldest = None
+        for record in self._posts.values():
+            published = parse_timestamp(DispatchPost.from_fields(record['fields']).pub_date)
+            if published is None:
+                return 0.0
+            if oldest is None or published < oldest:
+                oldest = published
+        return oldest
+    
+    def record(self, channel_id: Optional[str], post: DispatchPost, message_id: int) -> None:
+        """
+        Record a post delivered to a channel.
+        
+        Posts are recorded in the order their embeds appear in the message.
+        
+        Args:
+            channel_id: Discord channel the post was sent to
+            post: Delivered post
+            message_id: ID of the Discord message carrying the post
+        """
+        record = self._posts.setdefault(post.guid, {
+            'fields': post.to_fields(),
+            'digest': post.digest(),
+            'raw': None,
+            'posted_at': time.time(),
+            'messages': {},
+        })
+        record['messages'][channel_id or ''] = str(message_id)
+        
+        guids = self._messages.setdefault(f"{channel_id or ''}/{message_id}", [])
+        if post.guid not in guids:
+            guids.append(post.guid)
+        self._dirty = True
+    
+    def changed_posts(self, entries: Iterable) -> List[Tuple[DispatchPost, str]]:
+        """
+        Find tracked entries whose visible content changed since they were posted.
+        
+        Entries whose raw fields changed without affecting what Discord shows
+        only have their raw digest updated.
+        
+        Args:
+            entries: Entries of a freshly fetched feed
+            
+        Returns:
+            (current post, raw digest) pairs to edit and then pass to commit()
+        """
+        changed = []
+        for entry in entries:
+            record = self._posts.get(get_entry_key(entry))
+            if record is None:
+                continue
+            
+            raw = entry_digest(entry)
+            if raw == record['raw']:
+                continue
+            
+            post = extract_post_data(entry)
+            if post.digest() == record['digest']:
+                record['raw'] = raw
+                self._dirty = True
+                continue
+            
+            logger.info(f"Post changed since it was sent: {post.title}")
+            changed.append((post, raw))
+        return changed
+    
+    def edits_for(self, posts: Iterable[DispatchPost]) -> List[MessageEdit]:
+        """
+        Get the messages to rewrite so they show the given posts' new content.
+        
+        Other posts sharing a message are rebuilt from their recorded content.
+        
+        Args:
+            posts: Changed posts
+            
+        Returns:
+            One edit per affected message
+        """
+        current = {post.guid: post for post in posts}
+        edits = []
+        for guid in current:
+            for channel_id, message_id in self._posts[guid]['messages'].items():
+                if any(edit.channel_id == channel_id and edit.message_id == message_id for edit in edits):
+                    continue
+                message_posts = [
+                    current.get(other) or DispatchPost.from_fields(self._posts[other]['fields'])
+                    for other in self._messages.get(f"{channel_id}/{message_id}", [guid])
+                    if other in self._posts
+                ]
+                edits.append(MessageEdit(channel_id, message_id, message_posts))
+        return edits
+    
+    def messages_of(self, guid: str) -> List[Tuple[str, str]]:
+        """
+        Get the messages a post was sent in.
+        
+        Args:
+            guid: Post GUID
+            
+        Returns:
+            (channel_id, message_id) pairs
+        """
+        return list(self._posts[guid]['messages'].items())
+    
+    def commit(self, post: DispatchPost, raw: str) -> None:
+        """
+        Store a post's new content once all of its messages were edited.
+        
+        Args:
+            post: Edited post
+            raw: Raw digest of the entry it was extracted from
+        """
+        record = self._posts[post.guid]
+        record['fields'] = post.to_fields()
+        record['digest'] = post.digest()
+        record['raw'] = raw
+        self._dirty = True
+    
+    def prune(self, now: Optional[float] = None) -> None:
+        """
+        Stop tracking posts sent more than max_age ago.
+        
+        Args:
+            now: Current time in epoch seconds (defaults to time.time())
+        """
+        cutoff = (time.time() if now is None else now) - self.max_age
+        expired = [guid for guid, record in self._posts.items() if record['posted_at'] < cutoff]
+        if not expired:
+            return
+        
+        for guid in expired:
+            for channel_id, message_id in self._posts.pop(guid)['messages'].items():
+                key = f"{channel_id}/{message_id}"
+                guids = [other for other in self._messages.get(key, []) if other in self._posts]
+                if guids:
+                    self._messages[key] = guids
+                else:
+                    self._messages.pop(key, None)
+        self._dirty = True
+    
+    def close(self) -> None:
+        """Prune expired posts and save the state if it changed."""
+        self.prune()
+        if self._dirty:
+            save_state(POSTED_MESSAGES_FILE, {'posts': self._posts, 'messages': self._messages})
+            self._dirty = False
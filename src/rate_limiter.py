@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Snowflakes after a major parameter (channels/guilds/webhooks) are kept in the
+# route key; any other ID segment is collapsed so e.g. every message edit in a
+# channel shares one bucket, matching how Discord groups routes.
+_MINOR_ID_RE = re.compile(r'(?<!/channels)(?<!/guilds)(?<!/webhooks)/\d{5,}')
+_MAJOR_PARAM_RE = re.compile(r'/(?:channels|guilds|webhooks)/(\d+)')
+
+
+def route_key(method: str, path: str) -> str:
+    """
+    Get the rate-limit route key for a request.
+    
+    Args:
+        method: HTTP method
+        path: API path
+        
+    Returns:
+        Route key such as ``POST /channels/123/messages``
+    """
+    return f"{method} {_MINOR_ID_RE.sub('/{id}', path)}"
+
+
+def major_parameter(route: str) -> str:
+    """
+    Get the major parameter (channel, guild or webhook ID) of a route key.
+    
+    Args:
+        route: Route key from route_key()
+        
+    Returns:
+        The first major ID in the route, or an empty string if it has none
+    """
+    match = _MAJOR_PARAM_RE.search(route)
+    return match.group(1) if match else ''
+
+
+class _Bucket:
+    __slots__ = ('limit', 'remaining', 'reset_at', 'retry_at')
+    
+    def __init__(self):
+        self.limit = 1
+        self.remaining = 1
+        self.reset_at = 0.0
+        self.retry_at = 0.0  # set by a 429, independent of the bucket's budget
+
+
+class RateLimiter:
+    """
+    Send scheduler driven by Discord's rate-limit headers.
+    
+    Each response updates its route's bucket from ``X-RateLimit-Bucket``,
+    ``X-RateLimit-Remaining`` and ``X-RateLimit-Reset-After``. Discord scopes
+    a bucket hash to the route's major parameter, so buckets are kept per
+    (hash, channel/guild/webhook ID): every channel's message sends report the
+    same hash but have a budget of their own. Requests go out
+    back-to-back while a bucket has budget, and only wait once it is exhausted
+    or after a 429, for exactly as long as Discord asked. A global 429 pauses
+    every route.
+    """
+    
+    def __init__(self):
+        self._route_buckets: Dict[str, str] = {}
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._global_reset_at = 0.0
+        
+        self.requests = 0
+        self.rate_limited = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+    
+    def _bucket_key(self, route: str) -> Tuple[str, str]:
+        """Key of a route's bucket: its hash (or the route until one is known) and major parameter."""
+        return self._route_buckets.get(route, route), major_parameter(route)
+    
+    def _bucket(self, route: str) -> Optional[_Bucket]:
+        return self._buckets.get(self._bucket_key(route))
+    
+    async def acquire(self, route: str) -> None:
+        """
+        Wait until a request on the route is allowed, then reserve it.
+        
+        Args:
+            route: Route key from route_key()
+        """
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            while True:
+                now = time.monotonic()
+                wait = self._global_reset_at - now
+                bucket = self._bucket(route)
+                if bucket:
+                    wait = max(wait, bucket.retry_at - now)
+                    if bucket.reset_at <= now:
+                        bucket.remaining = max(bucket.remaining, bucket.limit)
+                    elif bucket.remaining <= 0:
+                        wait = max(wait, bucket.reset_at - now)
+                if wait <= 0:
+                    break
+                
+                self.waits += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                logger.info("Rate limit budget exhausted for %s, waiting %.2fs", route, wait)
+                await asyncio.sleep(wait)
+            
+            if bucket:
+                bucket.remaining -= 1
+            self.requests += 1
+        finally:
+            self.queue_depth -= 1
+    
+    def update(self, route: str, headers: Mapping[str, str]) -> None:
+        """
+        Record the bucket state reported by a response.
+        
+        Args:
+            route: Route key the request was made on
+            headers: Response headers
+        """
+        bucket_id = headers.get('X-RateLimit-Bucket')
+        if bucket_id:
+            self._route_buckets[route] = bucket_id
+        
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is None or reset_after is None:
+            return
+        
+        bucket = self._buckets.setdefault(self._bucket_key(route), _Bucket())
+        try:
+            bucket.limit = int(headers.get('X-RateLimit-Limit', bucket.limit))
+            bucket.remaining = int(remaining)
+            bucket.reset_at = time.monotonic() + float(reset_after)
+        except ValueError:
+            logger.warning(f"Ignoring malformed rate limit headers for {route}")
+    
+    def rate_limited_for(self, route: str, retry_after: float, is_global: bool = False,
+                         shared: bool = False) -> None:
+        """
+        Record a 429 response so the next acquire waits exactly retry_after.
+        
+        Args:
+            route: Route key the request was made on
+            retry_after: Seconds Discord asked us to wait
+            is_global: Whether the global rate limit was hit
+            shared: Whether the limit was a shared per-resource one
+                (``X-RateLimit-Scope: shared``), which does not use up the
+                bucket's own budget
+        """
+        self.rate_limited += 1
+        reset_at = time.monotonic() + retry_after
+        if is_global:
+            self._global_reset_at = max(self._global_reset_at, reset_at)
+            logger.warning(f"Hit global rate limit, pausing all requests for {retry_after:.2f}s")
+            return
+        
+        bucket = self._buckets.setdefault(self._bucket_key(route), _Bucket())
+        bucket.retry_at = max(bucket.retry_at, reset_at)
+        if not shared:
+            bucket.remaining = 0
+            bucket.reset_at = reset_at
+        logger.warning(f"Rate limited on {route}, retrying in {retry_after:.2f}s")
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Get scheduler statistics.
+        
+        Returns:
+            Request, 429, wait-time and queue-depth counters
+        """
+        return {
+            'requests': self.requests,
+            'rate_limited': self.rate_limited,
+            'waits': self.waits,
+            'total_wait': round(self.total_wait, 3),
+            'max_wait': round(self.max_wait, 3),
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth
+        }
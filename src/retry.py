@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from src.config import (
+    BREAKER_COOLDOWN, BREAKER_FAILURE_THRESHOLD, BREAKER_FILE, BREAKER_MAX_COOLDOWN, MAX_RETRIES, RETRY_DELAY,
+    RETRY_MAX_DELAY
+)
+from src.metrics import metrics
+from src.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# HTTP statuses worth retrying: timeouts, rate limits and server-side failures
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Monotonic time by which the current run must be done (None: no deadline)
+_deadline: Optional[float] = None
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting or retrying work the run deadline leaves no time for."""
+
+
+def set_run_deadline(seconds: Optional[float]) -> None:
+    """
+    Start (or clear) the deadline every retry of the current run must fit.
+    
+    Args:
+        seconds: Time the run may still take, or None (or 0) for no deadline
+    """
+    global _deadline
+    _deadline = time.monotonic() + seconds if seconds and seconds > 0 else None
+
+
+def remaining_time() -> float:
+    """
+    Get how long the current run may still take.
+    
+    Returns:
+        Seconds until the run deadline (infinite without one)
+    """
+    if _deadline is None:
+        return float('inf')
+    return max(0.0, _deadline - time.monotonic())
+
+
+def attempt_timeout(timeout: float) -> float:
+    """
+    Cap a per-attempt timeout so the attempt ends by the run deadline.
+    
+    Args:
+        timeout: Usual timeout in seconds
+        
+    Returns:
+        Timeout to use for this attempt
+        
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    remaining = remaining_time()
+    if remaining <= 0:
+        raise DeadlineExceeded("run deadline reached")
+    return min(timeout, remaining)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Classify an error as transient (worth retrying) or fatal.
+    
+    HTTP errors from aiohttp, requests, discord.py and the Discord REST
+    client are classified by status, except that a 429 from either Discord
+    client is fatal: both wait out rate limits themselves and only raise once
+    those retries are used up. Timeouts and connection failures are
+    transient; anything else (bad data, auth, TLS or filesystem errors,
+    missing resources) is fatal.
+    
+    Args:
+        error: Error raised by an attempt
+        
+    Returns:
+        True if the operation may succeed when retried
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    status = getattr(error, 'status', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    if isinstance(status, int):
+        if status == 429 and _is_discord_error(error):
+            return False
+        return status in RETRYABLE_STATUSES
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    aiohttp = sys.modules.get('aiohttp')
+    if aiohttp and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return not isinstance(error, aiohttp.ClientSSLError)
+    requests = sys.modules.get('requests')
+    if requests and isinstance(error, (requests.ConnectionError, requests.Timeout,
+                                       requests.exceptions.ChunkedEncodingError)):
+        return not isinstance(error, requests.exceptions.SSLError)
+    return False
+
+
+def _is_discord_error(error: BaseException) -> bool:
+    """Check whether an error was raised by the Discord REST client or discord.py."""
+    # Looked up rather than imported, as src.discord_rest imports this module
+    discord_rest = sys.modules.get('src.discord_rest')
+    if discord_rest and isinstance(error, discord_rest.DiscordRestError):
+        return True
+    discord = sys.modules.get('discord')
+    return bool(discord) and isinstance(error, discord.HTTPException)
+
+
+def backoff_delay(attempt: int, error: Optional[BaseException] = None) -> float:
+    """
+    Get the wait before a retry: exponential backoff with full jitter.
+    
+    The wait is drawn uniformly from [0, min(RETRY_MAX_DELAY, RETRY_DELAY * 2^attempt)],
+    which spreads out retries from concurrent callers, but never undercuts a
+    retry_after the server asked for.
+    
+    Args:
+        attempt: Number of the failed attempt, starting at 0
+        error: Error the attempt failed with
+        
+    Returns:
+        Seconds to wait
+    """
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_DELAY * 2 ** attempt))
+    retry_after = getattr(error, 'retry_after', None)
+    if isinstance(retry_after, (int, float)):
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _next_delay(what: str, attempt: int, retries: int, error: Exception) -> Optional[float]:
+    """Decide whether a failed attempt is retried, and after how long."""
+    if attempt >= retries or not is_retryable(error):
+        return None
+    delay = backoff_delay(attempt, error)
+    if delay >= remaining_time():
+        logger.warning(f"{what} failed, not retrying as the run deadline leaves no time: {error}")
+        metrics.incr('retries_abandoned')
+        return None
+    logger.warning(f"{what} failed (attempt {attempt + 1}/{retries + 1}), retrying in {delay:.1f}s: {error}")
+    metrics.incr('retries')
+    return delay
+
+
+async def retry_async(operation: Callable[[], Awaitable[T]], what: str, retries: int = MAX_RETRIES) -> T:
+    """
+    Await an operation, retrying transient failures within the run deadline.
+    
+    Args:
+        operation: Function starting a fresh attempt
+        what: Description of the operation for log messages
+        retries: Retries after the first attempt
+        
+    Returns:
+        Result of the first successful attempt
+        
+    Raises:
+        DeadlineExceeded: If the deadline passed before the first attempt
+        Exception: The last attempt's error, once it is fatal, retries are
+            exhausted or the next retry would not fit the deadline
+    """
+    attempt = 0
+    while True:
+        if remaining_time() <= 0:
+            raise DeadlineExceeded(f"run deadline reached before {what}")
+        try:
+            return await operation()
+        except Exception as e:
+            delay = _next_delay(what, attempt, retries, e)
+            if delay is None:
+                raise
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def retry_call(operation: Callable[[], T], what: str, retries: int = MAX_RETRIES) -> T:
+    """
+    Call an operation, retrying transient failures within the run deadline.
+    
+    Synchronous counterpart of retry_async.
+    
+    Args:
+        operation: Function making a fresh attempt
+        what: Description of the operation for log messages
+        retries: Retries after the first attempt
+        
+    Returns:
+        Result of the first successful attempt
+    """
+    attempt = 0
+    while True:
+        if remaining_time() <= 0:
+            raise DeadlineExceeded(f"run deadline reached before {what}")
+        try:
+            return operation()
+        except Exception as e:
+            delay = _next_delay(what, attempt, retries, e)
+            if delay is None:
+                raise
+        time.sleep(delay)
+        attempt += 1
+
+
+class CircuitBreaker:
+    """
+    Per-feed circuit breakers, persisted between runs.
+    
+    After BREAKER_FAILURE_THRESHOLD consecutive failed fetches a feed's
+    circuit opens and the feed is not requested at all for a cooldown that
+    starts at BREAKER_COOLDOWN and doubles each time the circuit re-opens, up
+    to BREAKER_MAX_COOLDOWN. Once the cooldown is over a single trial fetch
+    is let through: success closes the circuit, failure re-opens it.
+    """
+    
+    def __init__(self, name: str = BREAKER_FILE):
+        """
+        Load the breaker state.
+        
+        Args:
+            name: State file name
+        """
+        self.name = name
+        self.circuits: Dict[str, Dict] = load_state(name)
+        self._dirty = False
+    
+    def allow(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether a feed may be requested.
+        
+        Args:
+            key: Feed URL
+            now: Current time (defaults to time.time())
+            
+        Returns:
+            False while the feed's circuit is open
+        """
+        now = time.time() if now is None else now
+        return self.circuits.get(key, {}).get('open_until', 0) <= now
+    
+    def open_until(self, key: str) -> float:
+        """Get when a feed's circuit lets the next trial fetch through (0 if closed)."""
+        return self.circuits.get(key, {}).get('open_until', 0)
+    
+    def record_success(self, key: str) -> None:
+        """
+        Close a feed's circuit after a successful fetch.
+        
+        Args:
+            key: Feed URL
+        """
+        if self.circuits.pop(key, None) is not None:
+            logger.info(f"Circuit closed for {key}")
+            self._dirty = True
+    
+    def record_failure(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Count a failed fetch, opening the circuit at the threshold.
+        
+        Args:
+            key: Feed URL
+            now: Current time (defaults to time.time())
+            
+        Returns:
+            True if the circuit opened
+        """
+        now = time.time() if now is None else now
+        circuit = self.circuits.setdefault(key, {'failures': 0, 'trips': 0, 'open_until': 0})
+        circuit['failures'] += 1
+        self._dirty = True
+        if circuit['failures'] < BREAKER_FAILURE_THRESHOLD:
+            return False
+        
+        cooldown = min(BREAKER_MAX_COOLDOWN, BREAKER_COOLDOWN * 2 ** circuit['trips'])
+        circuit['trips'] += 1
+        circuit['open_until'] = now + cooldown
+        logger.error(f"Circuit opened for {key} after {circuit['failures']} consecutive failures, "
+                     f"next try in {cooldown / 60:.0f}m")
+        metrics.incr('circuits_opened')
+        return True
+    
+    def close(self) -> None:
+        """Persist the breaker state if it changed."""
+        if self._dirty:
+            save_state(self.name, self.circuits)
+            self._dirty = False
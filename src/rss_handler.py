@@ -1,33 +1,78 @@
-import feedparser
+import hashlib
+import html
 import logging
-from typing import Dict, Optional, List
-from datetime import datetime
-from src.config import DISPATCH_RSS_URL, USER_AGENT
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Mapping, Optional, List
+from src.config import DISPATCH_RSS_URL, USER_AGENT, FETCH_TIMEOUT, FEED_CACHE_FILE, SEEN_MAX_AGE_HOURS, SNIPPET_LENGTH
+from src.html_snippet import html_to_snippet
+from src.post import DispatchPost
+from src.retry import attempt_timeout, retry_call
+from src.seen_index import SeenIndex
+from src.state import load_state, save_state
+from src.timestamps import entry_timestamp, parse_timestamp
+
+# feedparser and requests are imported where they are used so that runs which
+# find the feed unchanged never pay for loading them
+if TYPE_CHECKING:
+    import feedparser
+    import requests
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_dispatch_feed() -> Optional[feedparser.FeedParserDict]:
+class _UnchangedFeed:
+    """Empty feed result for a 304 Not Modified response."""
+    status = 304
+    bozo = False
+    entries = []
+
+
+# Returned by fetch_dispatch_feed when the server answers 304 Not Modified
+FEED_UNCHANGED = _UnchangedFeed()
+
+
+def fetch_dispatch_feed(url: str = DISPATCH_RSS_URL) -> Optional["feedparser.FeedParserDict"]:
     """
     Fetch the THOR Collective Dispatch RSS feed.
     
+    Sends the ETag/Last-Modified validators stored by the previous run so an
+    unchanged feed costs a bodyless 304 instead of a full download and parse.
+    
+    Args:
+        url: Feed URL to fetch
+        
     Returns:
-        Parsed feed object or None if error
+        Parsed feed object, FEED_UNCHANGED if the feed has not changed
+        since the last run, or None if error
     """
     try:
-        logger.info(f"Fetching Dispatch RSS feed from: {DISPATCH_RSS_URL}")
+        logger.info(f"Fetching Dispatch RSS feed from: {url}")
+        
+        feed_cache = load_state(FEED_CACHE_FILE)
+        headers = conditional_headers(feed_cache.get(url, {}))
         
-        # Set user agent
-        feedparser.USER_AGENT = USER_AGENT
+        import requests
         
-        feed = feedparser.parse(DISPATCH_RSS_URL)
+        def get() -> "requests.Response":
+            response = requests.get(url, headers=headers, timeout=attempt_timeout(FETCH_TIMEOUT))
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
         
-        if feed.bozo:
-            logger.warning(f"Feed parsing had issues but continuing: {feed.bozo_exception}")
+        # Transient failures are retried with backoff instead of failing the run
+        response = retry_call(get, "Fetching Dispatch RSS feed")
         
-        if not feed.entries:
-            logger.error("No entries found in Dispatch RSS feed")
+        if response.status_code == 304:
+            record_not_modified(feed_cache, url, response.headers)
+            save_state(FEED_CACHE_FILE, feed_cache)
+            return FEED_UNCHANGED
+        
+        feed = parse_feed_content(response.content, response.headers)
+        if not feed:
             return None
+        
+        record_feed_validators(feed_cache, url, response.headers, len(response.content))
+        save_state(FEED_CACHE_FILE, feed_cache)
             
         logger.info(f"Successfully fetched {len(feed.entries)} entries from Dispatch RSS feed")
         return feed
@@ -37,13 +82,167 @@ def fetch_dispatch_feed() -> Optional[feedparser.FeedParserDict]:
         return None
 
 
-def get_latest_dispatch_posts(feed: feedparser.FeedParserDict, hours_back: int = 1) -> List[Dict[str, str]]:
+def conditional_headers(validators: Dict) -> Dict[str, str]:
+    """
+    Build request headers for a conditional feed fetch.
+    
+    Args:
+        validators: Validators stored for the feed by a previous run
+        
+    Returns:
+        Request headers including If-None-Match/If-Modified-Since when known
+    """
+    headers = {'User-Agent': USER_AGENT}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('modified'):
+        headers['If-Modified-Since'] = validators['modified']
+    return headers
+
+
+def parse_feed_content(content: bytes, headers: Mapping[str, str]) -> Optional["feedparser.FeedParserDict"]:
+    """
+    Parse a downloaded feed body.
+    
+    Args:
+        content: Raw feed bytes
+        headers: HTTP response headers (used for encoding detection)
+        
+    Returns:
+        Parsed feed object or None if it has no entries
+    """
+    import feedparser
+    feed = feedparser.parse(
+        content,
+        response_headers={k.lower(): v for k, v in headers.items()}
+    )
+    
+    if feed.bozo:
+        logger.warning(f"Feed parsing had issues but continuing: {feed.bozo_exception}")
+    
+    if not feed.entries:
+        logger.error("No entries found in Dispatch RSS feed")
+        return None
+    
+    return feed
+
+
+def cache_lifetime(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Get how long a feed response may be reused according to its cache headers.
+    
+    Cache-Control max-age (less the response's Age) wins over Expires, which
+    is taken relative to the server's Date header.
+    
+    Args:
+        headers: HTTP response headers
+        
+    Returns:
+        Seconds the response stays fresh, or None if the headers do not say
+    """
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        name = name.lower()
+        if name in ('no-cache', 'no-store'):
+            return 0.0
+        if name == 'max-age':
+            try:
+                age = float(headers.get('Age') or 0)
+                return max(0.0, float(value.strip('"')) - age)
+            except ValueError:
+                return None
+    
+    raw_expires = headers.get('Expires')
+    if not raw_expires:
+        return None
+    # Invalid dates such as "0" or "-1" mean already expired
+    expires = None if raw_expires.strip().lstrip('-').isdigit() else parse_timestamp(raw_expires)
+    if expires is None:
+        return 0.0
+    date = parse_timestamp(headers.get('Date')) or time.time()
+    return max(0.0, expires - date)
+
+
+def _record_freshness(validators: Dict, headers: Mapping[str, str]) -> None:
+    """Store until when the feed's response is fresh, for the poll scheduler."""
+    lifetime = cache_lifetime(headers)
+    validators['fresh_until'] = time.time() + lifetime if lifetime is not None else None
+
+
+def record_feed_validators(feed_cache: Dict, url: str, headers: Mapping[str, str], content_length: int) -> None:
+    """
+    Remember a feed's validators so the next run can make a conditional request.
+    
+    Args:
+        feed_cache: Loaded feed cache state (updated in place)
+        url: Feed URL
+        headers: HTTP response headers
+        content_length: Size of the downloaded body in bytes
+    """
+    validators = feed_cache.get(url, {})
+    feed_cache[url] = {
+        'etag': headers.get('ETag'),
+        'modified': headers.get('Last-Modified'),
+        'content_length': content_length,
+        'bytes_saved': validators.get('bytes_saved', 0)
+    }
+    _record_freshness(feed_cache[url], headers)
+
+
+def record_not_modified(feed_cache: Dict, url: str, headers: Optional[Mapping[str, str]] = None) -> None:
+    """
+    Account for a 304 response in the bytes-saved counter.
+    
+    Args:
+        feed_cache: Loaded feed cache state (updated in place)
+        url: Feed URL
+        headers: Optional HTTP response headers (refresh the cache lifetime)
+    """
+    validators = feed_cache.setdefault(url, {})
+    if headers is not None:
+        _record_freshness(validators, headers)
+    bytes_saved = validators.get('content_length', 0)
+    validators['bytes_saved'] = validators.get('bytes_saved', 0) + bytes_saved
+    logger.info("Feed unchanged since last run (304), skipped download and parse "
+                "(saved %d bytes, %d total): %s", bytes_saved, validators['bytes_saved'], url)
+
+
+def reset_feed_validators(url: str = DISPATCH_RSS_URL) -> None:
+    """
+    Forget the stored validators for a feed so the next fetch is unconditional.
+    
+    Used when a run could not deliver everything it found; otherwise the next
+    run would get a 304 and never look at the undelivered entries again.
+    
+    Args:
+        url: Feed URL
+    """
+    feed_cache = load_state(FEED_CACHE_FILE)
+    validators = feed_cache.get(url)
+    if validators:
+        validators['etag'] = None
+        validators['modified'] = None
+        save_state(FEED_CACHE_FILE, feed_cache)
+
+
+def get_latest_dispatch_posts(feed: "feedparser.FeedParserDict", hours_back: int = 1,
+                              seen: Optional[SeenIndex] = None,
+                              feed_url: str = DISPATCH_RSS_URL) -> List[DispatchPost]:
     """
-    Get Dispatch posts from the last N hours.
+    Get new Dispatch posts from the feed.
+    
+    Without a seen index, posts from the last N hours are considered new. With
+    one, every entry not yet in the index (and younger than SEEN_MAX_AGE_HOURS)
+    is new, so late, skipped or re-triggered runs neither miss nor duplicate
+    posts. A feed the index has not been seeded from yet (first run, newly
+    added feed or lost cache) is bootstrapped from its own time window: older
+    entries are recorded as seen instead of being posted.
     
     Args:
         feed: Parsed RSS feed
         hours_back: How many hours back to check for new posts
+        seen: Optional index of already-posted entries
+        feed_url: URL of the feed, for tracking which feeds are seeded
         
     Returns:
         List of new post data
@@ -52,54 +251,143 @@ def get_latest_dispatch_posts(feed: feedparser.FeedParserDict, hours_back: int =
         logger.error("No entries in feed")
         return []
     
-    # Get current time and calculate cutoff
-    now = datetime.now()
-    cutoff_time = now.timestamp() - (hours_back * 3600)  # Convert hours to seconds
+    bootstrap = seen is not None and not seen.is_seeded(feed_url)
+    cutoff_time = _cutoff_time(hours_back, seen, feed_url)
     
     new_posts = []
     
     for entry in feed.entries:
-        # Parse the publication date
-        entry_time = None
-        
-        # Try to get publication time from various fields
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            import time
-            entry_time = time.mktime(entry.published_parsed)
-        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-            import time
-            entry_time = time.mktime(entry.updated_parsed)
-        elif hasattr(entry, 'published'):
-            try:
-                from dateutil import parser
-                parsed_date = parser.parse(entry.published)
-                entry_time = parsed_date.timestamp()
-            except:
-                logger.warning(f"Could not parse date: {entry.published}")
+        entry_time = entry_timestamp(entry)
         
         # If we can't determine the time, skip this entry
         if entry_time is None:
             logger.warning(f"Could not determine publication time for: {entry.get('title', 'Unknown')}")
             continue
         
+        if seen is not None:
+            key = get_entry_key(entry)
+            if key in seen:
+                logger.debug("Post already posted: %s", entry.get('title', 'Unknown'))
+                continue
+            if bootstrap and entry_time < cutoff_time:
+                seen.add(key)
+                continue
+        
         # Check if this post is within our time window
         if entry_time >= cutoff_time:
             post_data = extract_post_data(entry)
             new_posts.append(post_data)
-            logger.info(f"Found new post within {hours_back} hours: {post_data['title']}")
-        else:
+            logger.info("Found new post: %s", post_data.title)
+        elif not bootstrap:
             # Since RSS feeds are typically ordered by date (newest first), 
             # we can break early once we hit an old post
-            logger.debug(f"Post too old: {entry.get('title', 'Unknown')}")
+            logger.debug("Post too old: %s", entry.get('title', 'Unknown'))
             break
     
+    if bootstrap:
+        logger.info(f"Seeded seen index from {feed_url}, posting only the last {hours_back} hours")
+        seen.mark_seeded(feed_url)
+    
     if not new_posts:
-        logger.info(f"No new posts found in the last {hours_back} hours")
+        logger.info("No new posts found")
     
     return new_posts
 
 
-def extract_post_data(entry: Dict) -> Dict[str, str]:
+def _cutoff_time(hours_back: int, seen: Optional[SeenIndex], feed_url: str) -> float:
+    """
+    Get the oldest publication time that can still count as new.
+    
+    Args:
+        hours_back: Time window used without a seen index seeded from the feed
+        seen: Optional index of already-posted entries
+        feed_url: URL of the feed
+        
+    Returns:
+        Cutoff as epoch seconds
+    """
+    now = time.time()
+    if seen is not None and seen.is_seeded(feed_url):
+        return now - (SEEN_MAX_AGE_HOURS * 3600)
+    return now - (hours_back * 3600)  # Convert hours to seconds
+
+
+def stream_stop_condition(hours_back: int = 1, seen: Optional[SeenIndex] = None,
+                          feed_url: str = DISPATCH_RSS_URL,
+                          edit_horizon: Optional[float] = None) -> Callable[[Dict], bool]:
+    """
+    Build the predicate that ends a streamed feed read early.
+    
+    Feeds list newest entries first, so once the stream reaches an entry that
+    is already posted or older than the cutoff, nothing after it can be new.
+    The stopping entry itself is still handed to get_latest_dispatch_posts,
+    which lets an unseeded feed record it as the bootstrap boundary.
+    
+    With an edit horizon the read also goes on until the entries are older
+    than it, so every post still watched for edits is checked.
+    
+    Args:
+        hours_back: How many hours back to check for new posts
+        seen: Optional index of already-posted entries
+        feed_url: URL of the feed
+        edit_horizon: Optional publication time (epoch seconds) of the oldest
+            post watched for edits
+        
+    Returns:
+        Function returning True for the entry at which to stop reading
+    """
+    cutoff_time = _cutoff_time(hours_back, seen, feed_url)
+    if edit_horizon is not None:
+        cutoff_time = min(cutoff_time, edit_horizon)
+    
+    def should_stop(entry: Dict) -> bool:
+        entry_time = entry_timestamp(entry)
+        if seen is not None and get_entry_key(entry) in seen:
+            if edit_horizon is None:
+                return True
+            return entry_time is not None and entry_time < edit_horizon
+        return entry_time is not None and entry_time < cutoff_time
+    
+    return should_stop
+
+
+def get_entry_key(entry: Dict) -> str:
+    """
+    Get the stable identity of a feed entry used for de-duplication.
+    
+    Args:
+        entry: RSS feed entry
+        
+    Returns:
+        Entry GUID, falling back to its link
+    """
+    return entry.get('id') or entry.get('link', '')
+
+
+def entry_digest(entry: Dict) -> str:
+    """
+    Hash the raw fields extract_post_data reads from an entry.
+    
+    Much cheaper than extracting the post, so it is used to skip entries that
+    have not changed at all before their normalized content is compared.
+    
+    Args:
+        entry: RSS feed entry
+        
+    Returns:
+        Hex digest of the entry's raw title, link, body and author
+    """
+    content = entry.get('content')
+    raw = "\0".join(str(value) for value in (
+        entry.get('title', ''),
+        entry.get('link', ''),
+        entry.get('summary') or entry.get('description') or (content[0].get('value', '') if content else ''),
+        entry.get('author') or entry.get('dc_creator') or '',
+    ))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def extract_post_data(entry: Dict) -> DispatchPost:
     """
     Extract standardized post data from RSS entry.
     
@@ -107,7 +395,7 @@ def extract_post_data(entry: Dict) -> Dict[str, str]:
         entry: RSS feed entry
         
     Returns:
-        Standardized post data dictionary
+        Normalized post
     """
     # Extract content snippet
     content_snippet = ""
@@ -118,14 +406,9 @@ def extract_post_data(entry: Dict) -> Dict[str, str]:
     elif hasattr(entry, 'content') and entry.content:
         content_snippet = entry.content[0].get('value', '')
     
-    # Clean HTML from snippet if present
-    import re
-    import html
-    content_snippet = re.sub(r'<[^>]+>', '', content_snippet)
-    # Decode HTML entities
-    content_snippet = html.unescape(content_snippet)
-    # Limit snippet length for Discord
-    content_snippet = content_snippet[:300] + "..." if len(content_snippet) > 300 else content_snippet
+    # Strip HTML and limit snippet length for Discord, reading only as much
+    # of the body as the snippet needs
+    content_snippet = html_to_snippet(content_snippet, SNIPPET_LENGTH)
     
     # Extract author
     author = "THOR Collective"
@@ -141,13 +424,14 @@ def extract_post_data(entry: Dict) -> Dict[str, str]:
     elif hasattr(entry, 'updated'):
         pub_date = entry.updated
     
-    post_data = {
-        "title": html.unescape(entry.get('title', 'No Title')),
-        "link": entry.get('link', ''),
-        "content_snippet": content_snippet,
-        "author": author,
-        "pub_date": pub_date
-    }
+    post = DispatchPost(
+        title=html.unescape(entry.get('title', 'No Title')),
+        link=entry.get('link', ''),
+        guid=get_entry_key(entry),
+        content_snippet=content_snippet,
+        author=author,
+        pub_date=pub_date
+    )
     
-    logger.info(f"Extracted post data: {post_data['title']}")
-    return post_data
\ No newline at end of file
+    logger.info("Extracted post data: %s", post.title)
+    return post
\ No newline at end of file
@@ -0,0 +1,147 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+from src.config import SEEN_FEEDS_FILE, SEEN_INDEX_FILE, SEEN_INDEX_MAX_ENTRIES
+from src.state import load_state, save_state, state_path
+
+logger = logging.getLogger(__name__)
+
+
+class SeenIndex:
+    """
+    On-disk index of feed entries that have already been posted.
+    
+    Keys (entry GUIDs or links) are kept in an append-only log with one key per
+    line and mirrored in memory, so membership checks are O(1) and recording a
+    post is a single appended line. Only the newest ``max_entries`` keys are
+    retained; the log is compacted once it grows past twice that size.
+    
+    The index also remembers which feeds it has been seeded from, so a feed
+    added later is bootstrapped on its own instead of counting as set up
+    because other feeds already filled the index.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = SEEN_INDEX_MAX_ENTRIES,
+                 feeds_name: str = SEEN_FEEDS_FILE):
+        """
+        Load the index from disk.
+        
+        Args:
+            path: Log file path (defaults to the state directory)
+            max_entries: Number of most recent keys to retain
+            feeds_name: State file name of the seeded feeds
+        """
+        self.path = path or state_path(SEEN_INDEX_FILE)
+        self.max_entries = max_entries
+        self.feeds_name = feeds_name
+        # Insertion order gives us oldest-first eviction
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+        self._log_lines = 0
+        self._feeds = load_state(feeds_name)
+        self._load()
+    
+    def _load(self) -> None:
+        """Read the append-only log into memory."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    key = line.rstrip('\n')
+                    if not key:
+                        continue
+                    self._log_lines += 1
+                    self._keys[key] = None
+                    self._keys.move_to_end(key)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not read seen index {self.path}: {e}")
+            return
+        
+        self._trim()
+        logger.info(f"Loaded {len(self._keys)} seen posts from {self.path}")
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def is_seeded(self, feed_url: str) -> bool:
+        """
+        Check whether the index has been seeded from a feed.
+        
+        Args:
+            feed_url: Feed URL
+            
+        Returns:
+            True once the feed's existing entries have been recorded
+        """
+        return feed_url in self._feeds
+    
+    def mark_seeded(self, feed_url: str) -> None:
+        """
+        Record that the index has been seeded from a feed.
+        
+        Args:
+            feed_url: Feed URL
+        """
+        if feed_url in self._feeds:
+            return
+        # Merge with the file, which a WebSub push may have updated meanwhile
+        self._feeds.update(load_state(self.feeds_name))
+        self._feeds[feed_url] = time.time()
+        save_state(self.feeds_name, self._feeds)
+    
+    def add(self, key: str) -> None:
+        """
+        Record a key as posted and append it to the log.
+        
+        Args:
+            key: Entry GUID or link
+        """
+        key = key.strip()
+        if not key or key in self._keys:
+            return
+        
+        self._keys[key] = None
+        self._trim()
+        
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(key + '\n')
+            self._log_lines += 1
+        except OSError as e:
+            logger.error(f"Could not append to seen index {self.path}: {e}")
+            return
+        
+        if self._log_lines > 2 * self.max_entries:
+            self.compact()
+    
+    def compact(self) -> bool:
+        """
+        Rewrite the log so it only contains the retained keys.
+        
+        Returns:
+            True if compacted successfully, False otherwise
+        """
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(key + '\n' for key in self._keys)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not compact seen index {self.path}: {e}")
+            return False
+        
+        logger.info(f"Compacted seen index from {self._log_lines} to {len(self._keys)} lines")
+        self._log_lines = len(self._keys)
+        return True
+    
+    def _trim(self) -> None:
+        """Drop the oldest keys beyond the retention cap."""
+        while len(self._keys) > self.max_entries:
+            self._keys.popitem(last=False)
@@ -0,0 +1,66 @@
+import json
+import logging
+import os
+from typing import Any, Dict
+from src.config import STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def state_path(name: str) -> str:
+    """
+    Get the full path of a file inside the local state directory.
+    
+    Args:
+        name: File name relative to the state directory
+        
+    Returns:
+        Path to the state file
+    """
+    return os.path.join(STATE_DIR, name)
+
+
+def load_state(name: str) -> Dict[str, Any]:
+    """
+    Load a JSON state file persisted by a previous run.
+    
+    Args:
+        name: File name relative to the state directory
+        
+    Returns:
+        Stored state, or an empty dict if missing or unreadable
+    """
+    path = state_path(name)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read state file {path}: {e}")
+        return {}
+
+
+def save_state(name: str, data: Dict[str, Any]) -> bool:
+    """
+    Atomically write a JSON state file for the next run.
+    
+    Args:
+        name: File name relative to the state directory
+        data: JSON-serializable state
+        
+    Returns:
+        True if written successfully, False otherwise
+    """
+    path = state_path(name)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not write state file {path}: {e}")
+        return False
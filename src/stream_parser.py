@@ -0,0 +1,195 @@
+import logging
+import time
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, List, Optional
+from src.timestamps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+_DC_CREATOR = '{http://purl.org/dc/elements/1.1/}creator'
+_SY = '{http://purl.org/rss/1.0/modules/syndication/}'
+
+# Channel-level polling hints, under feedparser's key names
+_CHANNEL_HINTS = {
+    'ttl': 'ttl',
+    _SY + 'updatePeriod': 'sy_updateperiod',
+    _SY + 'updateFrequency': 'sy_updatefrequency',
+}
+
+
+class FeedEntry(dict):
+    """
+    Normalized feed entry with attribute access.
+    
+    Uses the same key names as feedparser (title, link, id, summary, content,
+    author, published, published_parsed) so it can be passed straight to
+    get_latest_dispatch_posts and extract_post_data.
+    """
+    
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class StreamedFeed:
+    """Entries read from a feed before the stream was stopped, or rebuilt from a parse worker."""
+    
+    bozo = False
+    
+    def __init__(self, entries: List[FeedEntry], channel: Optional[FeedEntry] = None):
+        self.entries = entries
+        # Polling hints from the channel (ttl, sy_updateperiod, sy_updatefrequency)
+        # seen before the stream stopped, like feedparser's feed.feed
+        self.feed = channel if channel is not None else FeedEntry()
+
+
+def _parse_date(text: Optional[str]) -> Optional[time.struct_time]:
+    """Parse a feed date into a UTC struct_time, like feedparser's *_parsed fields."""
+    epoch = parse_timestamp(text)
+    return time.gmtime(epoch) if epoch is not None else None
+
+
+def _rss_entry(item: ET.Element) -> FeedEntry:
+    """Normalize an RSS <item>."""
+    entry = FeedEntry()
+    summary = None
+    content = None
+    
+    for child in item:
+        tag = child.tag
+        text = child.text or ''
+        if tag == 'title':
+            entry['title'] = text.strip()
+        elif tag == 'link':
+            entry['link'] = text.strip()
+        elif tag == 'guid':
+            entry['id'] = text.strip()
+        elif tag == 'pubDate':
+            entry['published'] = text.strip()
+        elif tag == 'description':
+            summary = text
+        elif tag == _CONTENT_ENCODED:
+            content = text
+        elif tag in ('author', _DC_CREATOR):
+            entry.setdefault('author', text.strip())
+    
+    if summary is not None:
+        entry['summary'] = summary
+    elif content is not None:
+        # Only keep the full body when there is nothing shorter to show
+        entry['content'] = [{'value': content}]
+    
+    if 'published' in entry:
+        entry['published_parsed'] = _parse_date(entry['published'])
+    return entry
+
+
+def _atom_entry(item: ET.Element) -> FeedEntry:
+    """Normalize an Atom <entry>."""
+    entry = FeedEntry()
+    summary = None
+    content = None
+    
+    for child in item:
+        tag = child.tag
+        text = child.text or ''
+        if tag == _ATOM + 'title':
+            entry['title'] = text.strip()
+        elif tag == _ATOM + 'link':
+            if child.get('rel', 'alternate') == 'alternate' and 'link' not in entry:
+                entry['link'] = child.get('href', '')
+        elif tag == _ATOM + 'id':
+            entry['id'] = text.strip()
+        elif tag == _ATOM + 'published':
+            entry['published'] = text.strip()
+        elif tag == _ATOM + 'updated':
+            entry['updated'] = text.strip()
+        elif tag == _ATOM + 'summary':
+            summary = text
+        elif tag == _ATOM + 'content':
+            content = text
+        elif tag == _ATOM + 'author':
+            name = child.find(_ATOM + 'name')
+            if name is not None and name.text:
+                entry.setdefault('author', name.text.strip())
+    
+    if summary is not None:
+        entry['summary'] = summary
+    elif content is not None:
+        entry['content'] = [{'value': content}]
+    
+    if 'published' in entry:
+        entry['published_parsed'] = _parse_date(entry['published'])
+    elif 'updated' in entry:
+        entry['updated_parsed'] = _parse_date(entry['updated'])
+    return entry
+
+
+class FeedStreamParser:
+    """
+    Incremental RSS/Atom parser built on ElementTree's pull parser.
+    
+    Feed raw bytes as they arrive; each completed <item>/<entry> is yielded as
+    a FeedEntry and then dropped from the tree, so memory stays bounded by the
+    largest single entry rather than the whole document.
+    """
+    
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._parents: List[ET.Element] = []
+        self.channel = FeedEntry()  # channel-level polling hints read so far
+    
+    def feed(self, chunk: bytes) -> Iterator[FeedEntry]:
+        """
+        Parse a chunk of the document.
+        
+        Args:
+            chunk: Next bytes of the feed
+            
+        Yields:
+            Entries completed by this chunk
+            
+        Raises:
+            xml.etree.ElementTree.ParseError: If the document is not well-formed
+        """
+        self._parser.feed(chunk)
+        for event, elem in self._parser.read_events():
+            if event == 'start':
+                self._parents.append(elem)
+                continue
+            
+            self._parents.pop()
+            if elem.tag == 'item':
+                entry = _rss_entry(elem)
+            elif elem.tag == _ATOM + 'entry':
+                entry = _atom_entry(elem)
+            else:
+                if elem.tag in _CHANNEL_HINTS and self._parents and self._parents[-1].tag == 'channel':
+                    self.channel[_CHANNEL_HINTS[elem.tag]] = (elem.text or '').strip()
+                continue
+            
+            # Free the finished entry before moving on
+            if self._parents:
+                self._parents[-1].remove(elem)
+            yield entry
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[FeedEntry]:
+    """
+    Lazily yield normalized entries from a stream of feed bytes.
+    
+    Stop iterating to stop reading; remaining chunks are never consumed.
+    
+    Args:
+        chunks: Iterable of raw feed byte chunks
+        
+    Yields:
+        Normalized feed entries in document order
+    """
+    parser = FeedStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
@@ -0,0 +1,160 @@
+import calendar
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# RFC 822 zone names, as offsets in minutes
+_ZONES = {
+    'UT': 0, 'UTC': 0, 'GMT': 0, 'Z': 0,
+    'EST': -300, 'EDT': -240, 'CST': -360, 'CDT': -300,
+    'MST': -420, 'MDT': -360, 'PST': -480, 'PDT': -420
+}
+
+_RFC822_RE = re.compile(
+    r'\s*(?:[A-Za-z]{3},?\s*)?'
+    r'(\d{1,2})\s+([A-Za-z]{3})[a-z]*\s+(\d{2,4})\s+'
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?'
+    r'\s*([+-]\d{4}|[A-Za-z]{1,3})?\s*$'
+)
+
+
+def parse_rfc822(text: str) -> Optional[float]:
+    """
+    Parse an RFC 822 date as used by RSS ``pubDate``.
+    
+    Args:
+        text: Date string, e.g. ``Mon, 04 Aug 2025 12:00:00 GMT``
+        
+    Returns:
+        UTC epoch seconds, or None if the string is not in this format
+    """
+    match = _RFC822_RE.match(text)
+    if not match:
+        return None
+    
+    day, month_name, year, hour, minute, second, zone = match.groups()
+    month = _MONTHS.get(month_name[:3].lower())
+    if month is None:
+        return None
+    
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    
+    if zone is None:
+        offset = 0
+    elif zone[0] in '+-':
+        offset = int(zone[1:3]) * 60 + int(zone[3:5])
+        if zone[0] == '-':
+            offset = -offset
+    else:
+        offset = _ZONES.get(zone.upper())
+        if offset is None:
+            return None
+    
+    try:
+        epoch = calendar.timegm((year, month, int(day), int(hour), int(minute), int(second or 0), 0, 0, 0))
+        # Reject impossible dates like 31 Feb, which timegm would silently roll over
+        datetime(year, month, int(day))
+    except ValueError:
+        return None
+    return float(epoch - offset * 60)
+
+
+def parse_iso8601(text: str) -> Optional[float]:
+    """
+    Parse an ISO 8601 date as used by Atom ``published``/``updated``.
+    
+    Args:
+        text: Date string, e.g. ``2025-08-04T12:00:00Z``
+        
+    Returns:
+        UTC epoch seconds (naive values are taken as UTC), or None if the
+        string is not in this format
+    """
+    try:
+        parsed = datetime.fromisoformat(text.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+@lru_cache(maxsize=1024)
+def _parse_with_dateutil(text: str) -> Optional[float]:
+    """Parse any other date format with dateutil, remembering the result."""
+    from dateutil import parser
+    
+    try:
+        parsed = parser.parse(text)
+    except (ValueError, OverflowError) as e:
+        logger.warning(f"Could not parse date: {text} ({e})")
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_timestamp(text: Optional[str]) -> Optional[float]:
+    """
+    Parse a feed date string into UTC epoch seconds.
+    
+    Tries the RFC 822 and ISO 8601 fast paths first and only falls back to
+    dateutil (memoized) for anything else.
+    
+    Args:
+        text: Date string
+        
+    Returns:
+        UTC epoch seconds, or None if unparseable
+    """
+    if not text:
+        return None
+    epoch = parse_rfc822(text)
+    if epoch is None:
+        epoch = parse_iso8601(text)
+    if epoch is None:
+        epoch = _parse_with_dateutil(text)
+    return epoch
+
+
+def struct_time_to_epoch(value: time.struct_time) -> float:
+    """
+    Convert a UTC struct_time (as produced by feedparser) into epoch seconds.
+    
+    Unlike time.mktime, this does not interpret the value as local time.
+    
+    Args:
+        value: UTC struct_time
+        
+    Returns:
+        UTC epoch seconds
+    """
+    return float(calendar.timegm(value))
+
+
+def entry_timestamp(entry: Dict) -> Optional[float]:
+    """
+    Get the publication time of a feed entry.
+    
+    Args:
+        entry: Feed entry (feedparser or stream parser)
+        
+    Returns:
+        UTC epoch seconds, or None if unknown
+    """
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if parsed:
+        return struct_time_to_epoch(parsed)
+    return parse_timestamp(entry.get('published') or entry.get('updated'))
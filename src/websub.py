@@ -0,0 +1,387 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urljoin
+import aiohttp
+from aiohttp import web
+from src.config import (
+    USER_AGENT, FEED_TIMEOUT, WEBSUB_CALLBACK_URL, WEBSUB_HUB, WEBSUB_STATE_FILE, WEBSUB_LEASE_SECONDS,
+    WEBSUB_RENEW_FRACTION, WEBSUB_RETRY_BASE, WEBSUB_RETRY_MAX, WEBSUB_CHECK_INTERVAL, WEBSUB_MAX_BODY
+)
+from src.feeds import FeedConfig
+from src.rss_handler import parse_feed_content
+from src.state import load_state, save_state
+
+if TYPE_CHECKING:
+    import feedparser
+
+logger = logging.getLogger(__name__)
+
+CALLBACK_PATH = "/websub/"
+# Signature algorithms a hub may use in X-Hub-Signature
+SIGNATURE_ALGORITHMS = {'sha1': hashlib.sha1, 'sha256': hashlib.sha256,
+                        'sha384': hashlib.sha384, 'sha512': hashlib.sha512}
+LATENCY_SAMPLES = 1000  # push-to-post latencies kept for the report
+
+# Called from the delivery thread with a pushed feed; returns deliveries made
+PushHandler = Callable[[FeedConfig, "feedparser.FeedParserDict"], int]
+
+
+def hub_links(headers: Mapping[str, str], feed) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Find the hub and the canonical topic URL a feed advertises.
+    
+    HTTP Link headers take precedence over the links in the document, as the
+    WebSub spec asks.
+    
+    Args:
+        headers: HTTP response headers of the feed
+        feed: Parsed feed (feedparser)
+        
+    Returns:
+        (hub URL, self URL), either None when not advertised
+    """
+    links = {}
+    for value in headers.getall('Link', []) if hasattr(headers, 'getall') else [headers.get('Link', '')]:
+        for link in value.split(','):
+            url, _, params = link.partition(';')
+            for param in params.split(';'):
+                name, _, rel = param.strip().partition('=')
+                if name.lower() == 'rel':
+                    for rel_value in rel.strip('"').split():
+                        links.setdefault(rel_value.lower(), url.strip().strip('<>'))
+    for link in feed.feed.get('links', []):
+        if link.get('rel') in ('hub', 'self') and link.get('href'):
+            links.setdefault(link['rel'], link['href'])
+    return links.get('hub'), links.get('self')
+
+
+def verify_signature(secret: str, body: bytes, header: Optional[str]) -> bool:
+    """
+    Check the HMAC signature a hub sent with a pushed body.
+    
+    Args:
+        secret: Secret given to the hub when subscribing
+        body: Raw request body
+        header: X-Hub-Signature value, e.g. ``sha256=<hex>``
+        
+    Returns:
+        True if the signature matches
+    """
+    if not header:
+        return False
+    algorithm, _, signature = header.partition('=')
+    digestmod = SIGNATURE_ALGORITHMS.get(algorithm.strip().lower())
+    if digestmod is None:
+        return False
+    expected = hmac.new(secret.encode(), body, digestmod).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+
+class WebSubReceiver:
+    """
+    Small HTTP server that subscribes the feeds to their WebSub hubs and takes pushed updates.
+    
+    Each feed's hub is discovered from its Link headers or <atom:link
+    rel="hub"> (or taken from WEBSUB_HUB), and the feed is subscribed with a
+    callback under callback_url and a random secret. The receiver answers the
+    hub's verification challenge, renews each lease before it runs out and
+    retries failed subscriptions with exponential backoff. Pushed bodies whose
+    HMAC signature matches are acknowledged right away and handed, one at a
+    time, to the push handler on a worker thread, so posting never blocks the
+    server. Subscriptions and their secrets are kept in the state directory,
+    so a restart keeps receiving on the leases it already holds.
+    """
+    
+    def __init__(self, feeds: List[FeedConfig], on_push: PushHandler, callback_url: str = WEBSUB_CALLBACK_URL,
+                 hub_url: str = WEBSUB_HUB, lease_seconds: int = WEBSUB_LEASE_SECONDS):
+        """
+        Configure the receiver.
+        
+        Args:
+            feeds: Feeds to subscribe
+            on_push: Handler delivering a pushed feed's new posts
+            callback_url: Public base URL the hub can reach this receiver at
+            hub_url: Hub for feeds that do not advertise one (empty for none)
+            lease_seconds: Lease to ask the hub for
+        """
+        self.feeds = feeds
+        self.on_push = on_push
+        self.callback_url = callback_url.rstrip('/')
+        self.hub_url = hub_url
+        self.lease_seconds = lease_seconds
+        # callback key -> {'feed_url', 'topic', 'hub', 'callback', 'secret', 'verified', 'expires',
+        #                  'lease_seconds', 'attempts', 'retry_at'}
+        self.subscriptions: Dict[str, Dict] = load_state(WEBSUB_STATE_FILE)
+        self.stats: Dict[str, int] = {'pushes': 0, 'rejected': 0, 'posts': 0, 'verified': 0, 'denied': 0}
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._feeds_by_url = {feed.url: feed for feed in feeds}
+        self._pending: Dict[str, str] = {}  # callback key -> mode awaiting verification
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="websub-push")
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._maintainer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @staticmethod
+    def callback_key(topic: str) -> str:
+        """Get the callback path segment of a topic."""
+        return hashlib.sha256(topic.encode()).hexdigest()[:16]
+    
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(client_max_size=WEBSUB_MAX_BODY)
+        app.router.add_get(CALLBACK_PATH + "{key}", self._verify)
+        app.router.add_post(CALLBACK_PATH + "{key}", self._receive)
+        return app
+    
+    async def start(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+        """
+        Start serving on the running event loop and subscribe every feed.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind
+        """
+        self._session = aiohttp.ClientSession(headers={'User-Agent': USER_AGENT},
+                                              timeout=aiohttp.ClientTimeout(total=FEED_TIMEOUT))
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info(f"WebSub receiver listening on {host}:{port}, callbacks at {self.callback_url}{CALLBACK_PATH}")
+        
+        await asyncio.gather(*(self._discover(feed) for feed in self.feeds))
+        self._maintainer = asyncio.create_task(self._maintain())
+    
+    async def stop(self) -> None:
+        """Stop serving, wait for pushes being delivered and save the subscriptions."""
+        if self._maintainer:
+            self._maintainer.cancel()
+            self._maintainer = None
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        save_state(WEBSUB_STATE_FILE, self.subscriptions)
+        self.report()
+    
+    def start_in_thread(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+        """
+        Serve from a background thread, next to the polling loop.
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind
+        """
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.start(host, port))
+            except Exception as e:
+                logger.error(f"Could not start the WebSub receiver: {e}")
+            finally:
+                started.set()
+            self._loop.run_forever()
+        
+        threading.Thread(target=run, name="websub", daemon=True).start()
+        started.wait()
+    
+    def stop_thread(self) -> None:
+        """Stop a receiver started with start_in_thread."""
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+    
+    async def _discover(self, feed: FeedConfig) -> None:
+        """Find a feed's hub and make sure it holds a subscription for it."""
+        try:
+            async with self._session.get(feed.url) as response:
+                response.raise_for_status()
+                body = await response.read()
+                headers = response.headers
+        except Exception as e:
+            logger.warning(f"Could not fetch {feed.name} to discover its WebSub hub: {e}")
+            return
+        
+        # Discovery only needs the channel's links, so an empty feed is fine here
+        import feedparser
+        parsed = feedparser.parse(body, response_headers={k.lower(): v for k, v in headers.items()})
+        hub, topic = hub_links(headers, parsed)
+        hub = hub or self.hub_url
+        if not hub:
+            logger.info(f"{feed.name} does not advertise a WebSub hub, polling only")
+            return
+        topic = urljoin(feed.url, topic) if topic else feed.url
+        hub = urljoin(feed.url, hub)
+        
+        key = self.callback_key(topic)
+        callback = f"{self.callback_url}{CALLBACK_PATH}{key}"
+        subscription = self.subscriptions.get(key)
+        if (subscription and subscription['hub'] == hub and subscription['callback'] == callback
+                and subscription['verified']
+                and not self._needs_renewal(subscription, time.time())):
+            logger.info(f"{feed.name} already subscribed at {hub} until "
+                        f"{time.strftime('%Y-%m-%d %H:%M', time.gmtime(subscription['expires']))} UTC")
+            return
+        self.subscriptions[key] = {
+            'feed_url': feed.url, 'topic': topic, 'hub': hub, 'callback': callback,
+            'secret': subscription['secret'] if subscription else secrets.token_hex(32),
+            'verified': False, 'expires': None, 'lease_seconds': None, 'attempts': 0, 'retry_at': 0,
+        }
+        await self.subscribe(key)
+    
+    async def subscribe(self, key: str, mode: str = 'subscribe') -> bool:
+        """
+        Ask the hub to (un)subscribe a topic; the hub then verifies the intent.
+        
+        Args:
+            key: Callback key of the subscription
+            mode: ``subscribe`` or ``unsubscribe``
+            
+        Returns:
+            True if the hub accepted the request
+        """
+        subscription = self.subscriptions[key]
+        self._pending[key] = mode
+        form = {
+            'hub.mode': mode,
+            'hub.topic': subscription['topic'],
+            'hub.callback': subscription['callback'],
+            'hub.lease_seconds': str(self.lease_seconds),
+            'hub.secret': subscription['secret'],
+        }
+        try:
+            async with self._session.post(subscription['hub'], data=form) as response:
+                if response.status in (202, 204):
+                    logger.info(f"Requested WebSub {mode} for {subscription['topic']} at {subscription['hub']}")
+                    return True
+                error = f"HTTP {response.status}: {(await response.text())[:200]}"
+        except Exception as e:
+            error = str(e)
+        
+        subscription['attempts'] += 1
+        delay = min(WEBSUB_RETRY_MAX, WEBSUB_RETRY_BASE * 2 ** (subscription['attempts'] - 1))
+        subscription['retry_at'] = time.time() + delay
+        logger.warning(f"WebSub {mode} for {subscription['topic']} failed ({error}), retrying in {delay:.0f}s")
+        return False
+    
+    def _needs_renewal(self, subscription: Dict, now: float) -> bool:
+        expires = subscription.get('expires')
+        if not expires:
+            return False
+        lease = subscription.get('lease_seconds') or self.lease_seconds
+        return expires - now <= lease * WEBSUB_RENEW_FRACTION
+    
+    async def _maintain(self) -> None:
+        """Renew leases before they run out and retry failed subscriptions."""
+        while True:
+            await asyncio.sleep(WEBSUB_CHECK_INTERVAL)
+            now = time.time()
+            for key, subscription in list(self.subscriptions.items()):
+                if subscription['feed_url'] not in self._feeds_by_url:
+                    continue
+                if subscription['verified'] and self._needs_renewal(subscription, now):
+                    logger.info(f"Renewing WebSub lease for {subscription['topic']}")
+                    await self.subscribe(key)
+                elif not subscription['verified'] and subscription['attempts'] and now >= subscription['retry_at']:
+                    await self.subscribe(key)
+            save_state(WEBSUB_STATE_FILE, self.subscriptions)
+    
+    async def _verify(self, request: web.Request) -> web.Response:
+        """Answer the hub's verification of intent (or its denial of a subscription)."""
+        key = request.match_info['key']
+        subscription = self.subscriptions.get(key)
+        mode = request.query.get('hub.mode')
+        topic = request.query.get('hub.topic')
+        if subscription is None or topic != subscription['topic']:
+            return web.Response(status=404)
+        
+        if mode == 'denied':
+            self.stats['denied'] += 1
+            subscription['verified'] = False
+            logger.warning(f"WebSub hub denied the subscription for {topic}: "
+                           f"{request.query.get('hub.reason', 'no reason given')}")
+            return web.Response(text="ok")
+        
+        if mode != self._pending.get(key):
+            logger.warning(f"Rejecting unexpected WebSub {mode} verification for {topic}")
+            return web.Response(status=404)
+        del self._pending[key]
+        
+        if mode == 'subscribe':
+            try:
+                lease = int(request.query.get('hub.lease_seconds', self.lease_seconds))
+            except ValueError:
+                lease = self.lease_seconds
+            subscription.update(verified=True, expires=time.time() + lease, lease_seconds=lease,
+                                attempts=0, retry_at=0)
+            self.stats['verified'] += 1
+            logger.info(f"WebSub subscription verified for {topic} (lease {lease / 3600:.1f}h)")
+        else:
+            subscription.update(verified=False, expires=None)
+        save_state(WEBSUB_STATE_FILE, self.subscriptions)
+        return web.Response(text=request.query.get('hub.challenge', ''))
+    
+    async def _receive(self, request: web.Request) -> web.Response:
+        """Accept a pushed feed body and queue it for delivery."""
+        received = time.monotonic()
+        key = request.match_info['key']
+        subscription = self.subscriptions.get(key)
+        feed = self._feeds_by_url.get(subscription['feed_url']) if subscription else None
+        if feed is None:
+            return web.Response(status=410)  # tells the hub to drop the subscription
+        
+        body = await request.read()
+        # Bad signatures still get a 2xx, so the hub cannot probe for the secret
+        if not verify_signature(subscription['secret'], body, request.headers.get('X-Hub-Signature')):
+            self.stats['rejected'] += 1
+            logger.warning(f"Ignoring WebSub push for {feed.name} with a missing or invalid signature")
+            return web.Response(status=202)
+        
+        self.stats['pushes'] += 1
+        logger.info(f"WebSub push for {feed.name} ({len(body)} bytes)")
+        headers = dict(request.headers)
+        asyncio.get_running_loop().run_in_executor(self._executor, self._deliver, feed, body, headers, received)
+        return web.Response(status=202)
+    
+    def _deliver(self, feed: FeedConfig, body: bytes, headers: Dict[str, str], received: float) -> None:
+        """Parse a pushed body and deliver its new posts (worker thread)."""
+        try:
+            parsed = parse_feed_content(body, headers)
+            if not parsed:
+                return
+            delivered = self.on_push(feed, parsed)
+        except Exception as e:
+            logger.error(f"Error delivering WebSub push for {feed.name}: {e}", exc_info=True)
+            return
+        
+        if delivered:
+            latency = time.monotonic() - received
+            self.latencies.append(latency)
+            self.stats['posts'] += delivered
+            logger.info(f"Delivered {delivered} pushed posts from {feed.name}, {latency:.2f}s after the push")
+    
+    def report(self) -> None:
+        """Log the push counters and push-to-post latency."""
+        stats = ", ".join(f"{name}={count}" for name, count in self.stats.items())
+        if not self.latencies:
+            logger.info(f"WebSub stats: {stats}")
+            return
+        ordered = sorted(self.latencies)
+        p50 = ordered[len(ordered) // 2]
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        logger.info(f"WebSub stats: {stats}; push-to-post latency p50 {p50:.2f}s, p99 {p99:.2f}s")
@@ -0,0 +1,99 @@
+"""Tests for the write-ahead delivery queue."""
+
+from src.delivery_queue import DeliveryQueue, delivery_key
+from src.post import DispatchPost
+
+CHANNEL = "100000000000000001"
+NOW = 1_800_000_000.0
+
+
+def make_posts(count):
+    return [DispatchPost(title=f"Post {i}", link=f"https://dispatch.example.com/p/{i}") for i in range(count)]
+
+
+def reopen(queue):
+    queue.close()
+    return DeliveryQueue(queue.path, queue.max_attempts, queue.backoff_base, queue.backoff_max)
+
+
+def test_enqueued_posts_are_due_until_acked(state_dir):
+    queue = DeliveryQueue(str(state_dir / "queue.log"))
+    posts = make_posts(3)
+    assert queue.enqueue(CHANNEL, posts)
+    assert queue.due(NOW) == {CHANNEL: posts}
+
+    queue.ack(CHANNEL, posts[1], 42)
+    queue = reopen(queue)
+
+    assert len(queue) == 2
+    assert [post.guid for post in queue.due(NOW)[CHANNEL]] == [posts[0].guid, posts[2].guid]
+    assert delivery_key(CHANNEL, posts[1]) not in queue
+
+
+def test_enqueue_skips_posts_already_queued(state_dir):
+    queue = DeliveryQueue(str(state_dir / "queue.log"))
+    posts = make_posts(2)
+    queue.enqueue(CHANNEL, posts)
+    queue.enqueue(CHANNEL, posts)
+
+    assert len(queue) == 2
+
+
+def test_failed_delivery_backs_off_exponentially(state_dir):
+    queue = DeliveryQueue(str(state_dir / "queue.log"), max_attempts=5, backoff_base=60, backoff_max=3600)
+    post, = make_posts(1)
+    queue.enqueue(CHANNEL, [post])
+
+    queue.fail(CHANNEL, [post], now=NOW)
+    assert queue.due(NOW + 59) == {}
+    assert queue.due(NOW + 60) == {CHANNEL: [post]}
+
+    queue.fail(CHANNEL, [post], now=NOW + 60)
+    queue = reopen(queue)
+
+    assert queue.due(NOW + 60 + 119) == {}
+    assert queue.due(NOW + 60 + 120) == {CHANNEL: [post]}
+
+
+def test_fail_ignores_posts_acked_meanwhile(state_dir):
+    queue = DeliveryQueue(str(state_dir / "queue.log"))
+    posts = make_posts(2)
+    queue.enqueue(CHANNEL, posts)
+    queue.ack(CHANNEL, posts[0], 42)
+
+    queue.fail(CHANNEL, posts, now=NOW)
+
+    assert len(queue) == 1
+    assert queue.due(NOW) == {}
+
+
+def test_delivery_is_dead_lettered_after_max_attempts(state_dir):
+    queue = DeliveryQueue(str(state_dir / "queue.log"), max_attempts=3, backoff_base=1)
+    post, = make_posts(1)
+    queue.enqueue(CHANNEL, [post])
+    for attempt in range(3):
+        queue.fail(CHANNEL, [post], now=NOW + attempt * 10)
+    queue = reopen(queue)
+
+    assert len(queue) == 0
+    assert queue.due(NOW + 10 ** 6) == {}
+    dead, = queue.dead_letters()
+    assert (dead.post.guid, dead.attempts) == (post.guid, 3)
+    # A dead letter is still known, so the post is not queued again
+    assert delivery_key(CHANNEL, post) in queue
+
+
+def test_compaction_keeps_pending_and_dead_deliveries(state_dir):
+    path = state_dir / "queue.log"
+    queue = DeliveryQueue(str(path), max_attempts=1)
+    posts = make_posts(100)
+    queue.enqueue(CHANNEL, posts)
+    for post in posts[:97]:
+        queue.ack(CHANNEL, post, 42)
+    queue.fail(CHANNEL, [posts[97]], now=NOW)
+    queue = reopen(queue)
+
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 4  # three enqueues and one dead letter
+    assert len(queue) == 2
+    assert [dead.post.guid for dead in queue.dead_letters()] == [posts[97].guid]
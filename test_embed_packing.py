@@ -0,0 +1,48 @@
+"""Tests for packing embeds into as few Discord messages as allowed."""
+
+from src.embed_packing import (
+    EMBED_DESCRIPTION_LIMIT, EMBED_FOOTER_LIMIT, EMBED_TITLE_LIMIT, EMBED_TOTAL_LIMIT, EMBEDS_PER_MESSAGE, embed_length,
+    pack_embeds, trim_embed
+)
+
+
+def embed(description_length=10):
+    return {"title": "Title", "description": "x" * description_length, "author": "Author", "url": "https://x"}
+
+
+def test_packs_up_to_ten_embeds_per_message():
+    groups = pack_embeds([embed() for _ in range(23)])
+
+    assert [len(group) for group in groups] == [EMBEDS_PER_MESSAGE, EMBEDS_PER_MESSAGE, 3]
+    assert [i for group in groups for i in group] == list(range(23))
+
+
+def test_splits_messages_at_the_character_budget():
+    embeds = [embed(2000) for _ in range(5)]
+    groups = pack_embeds(embeds)
+
+    assert [len(group) for group in groups] == [2, 2, 1]
+    for group in groups:
+        assert sum(embed_length(embeds[i]) for i in group) <= EMBED_TOTAL_LIMIT
+
+
+def test_large_embeds_never_share_a_message():
+    large = trim_embed(embed(10000))
+    groups = pack_embeds([embed(), large, large, embed()])
+
+    assert groups == [[0, 1], [2, 3]]
+
+
+def test_trim_embed_enforces_field_limits():
+    trimmed = trim_embed({"title": "t" * 1000, "description": "d" * 10000, "url": "https://x"})
+
+    assert len(trimmed["title"]) == EMBED_TITLE_LIMIT and trimmed["title"].endswith("…")
+    assert len(trimmed["description"]) == EMBED_DESCRIPTION_LIMIT
+    assert trimmed["url"] == "https://x"
+
+
+def test_trim_embed_enforces_the_embed_total():
+    trimmed = trim_embed({"title": "t" * 300, "description": "d" * 5000, "author": "a" * 300, "footer": "f" * 3000})
+
+    assert embed_length(trimmed) == EMBED_TOTAL_LIMIT
+    assert len(trimmed["footer"]) == EMBED_FOOTER_LIMIT and trimmed["description"].endswith("…")
@@ -0,0 +1,47 @@
+"""Tests for turning post HTML into a plain-text preview."""
+
+import src.html_snippet
+from src.html_snippet import html_to_snippet
+
+
+def test_extracts_visible_text():
+    markup = ("<html><head><title>Page</title><style>p {color: red}</style></head>"
+              "<body><script>alert('x')</script><p>Hunting&nbsp;&amp; <b>detection</b></p>"
+              "<p>notes</p></body></html>")
+
+    assert html_to_snippet(markup) == "Hunting & detection notes"
+
+
+def test_block_tags_separate_words_and_whitespace_collapses():
+    assert html_to_snippet("<p>one</p><p>two</p>two<br>three<li>four</li>") == "one two two three four"
+    assert html_to_snippet("  lots \n\n of \t space  ") == "lots of space"
+
+
+def test_plain_text_passes_through():
+    assert html_to_snippet("Just text") == "Just text"
+    assert html_to_snippet("") == ""
+
+
+def test_long_text_is_cut_on_a_word_boundary():
+    snippet = html_to_snippet("<p>" + "hunting notes, " * 100 + "</p>", limit=50)
+
+    assert snippet == "hunting notes, hunting notes, hunting notes..."
+    assert len(snippet) <= 50 + 3
+
+
+def test_long_word_is_cut_mid_word():
+    assert html_to_snippet("x" * 100, limit=10) == "x" * 10 + "..."
+
+
+def test_text_exactly_at_the_limit_is_not_cut():
+    assert html_to_snippet("<p>" + "x" * 10 + "</p>", limit=10) == "x" * 10
+
+
+def test_stops_parsing_once_the_snippet_is_full(monkeypatch):
+    fed = []
+    original = src.html_snippet._SnippetParser.feed
+    monkeypatch.setattr(src.html_snippet._SnippetParser, "feed", lambda self, data: fed.append(data) or original(self, data))
+
+    html_to_snippet("<p>" + "word " * 1_000_000 + "</p>", limit=300)
+
+    assert len(fed) == 1
@@ -0,0 +1,59 @@
+"""Tests for sampling repetitive log messages."""
+
+import logging
+from src.logging_setup import SamplingFilter
+from src.rss_handler import extract_post_data
+from src.stream_parser import FeedEntry
+
+
+def record(msg, *args, name="src.rss_handler", level=logging.INFO, created=1000.0):
+    entry = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    entry.created = created
+    return entry
+
+
+def kept(sampler, records):
+    return sum(sampler.filter(entry) for entry in records)
+
+
+def test_keeps_the_burst_then_one_in_n():
+    sampler = SamplingFilter({"src.rss_handler": 10}, burst=5, window=60)
+
+    assert kept(sampler, [record("Found new post: %s", f"Post {i}") for i in range(55)]) == 5 + 5
+    assert sampler.dropped == 45
+
+
+def test_messages_are_grouped_by_template():
+    sampler = SamplingFilter({"src.rss_handler": 10}, burst=1, window=60)
+    records = [record("Found new post: %s", "Hunting notes"), record("Extracted post data: %s", "Hunting notes"),
+               record("Sending message 3/40"), record("Sending message 4/40")]
+
+    assert [sampler.filter(entry) for entry in records] == [True, True, True, False]
+
+
+def test_per_entry_logs_are_sampled(caplog):
+    sampler = SamplingFilter({"src.rss_handler": 10}, burst=2, window=60)
+    caplog.handler.addFilter(sampler)
+
+    with caplog.at_level(logging.INFO, logger="src.rss_handler"):
+        for i in range(12):
+            extract_post_data(FeedEntry(title=f"Post {i}", link=f"https://x/{i}", summary="Body"))
+
+    assert [entry.getMessage() for entry in caplog.records] == [
+        "Extracted post data: Post 0", "Extracted post data: Post 1", "Extracted post data: Post 11"
+    ]
+
+
+def test_warnings_and_other_loggers_are_never_dropped():
+    sampler = SamplingFilter({"src.rss_handler": 10}, burst=0, window=60)
+
+    assert kept(sampler, [record("Feed failed: %s", "x", level=logging.WARNING) for _ in range(5)]) == 5
+    assert kept(sampler, [record("Run started", name="src.main") for _ in range(5)]) == 5
+
+
+def test_counts_start_over_each_window():
+    sampler = SamplingFilter({"src.rss_handler": 10}, burst=1, window=60)
+    sampler.window_start = 1000.0
+
+    assert kept(sampler, [record("Found new post: %s", "x", created=1000.0) for _ in range(3)]) == 1
+    assert kept(sampler, [record("Found new post: %s", "x", created=1061.0) for _ in range(3)]) == 1
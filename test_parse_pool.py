@@ -0,0 +1,73 @@
+"""Tests for parsing feeds in worker processes."""
+
+import pickle
+import feedparser
+import pytest
+from benchmarks.synthetic import make_feed
+from src.parse_pool import compact_feed, expand_feed, parse_feeds, parse_pool, shutdown_parse_pool
+from src.rss_handler import entry_digest, extract_post_data, get_entry_key
+from src.timestamps import entry_timestamp
+
+ATOM = b"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>
+<entry><title>A &amp;amp; b</title><link href="https://x/a"/><id>urn:a</id><updated>2025-08-04T12:00:00Z</updated>
+<content type="html">&lt;p&gt;Body only&lt;/p&gt;</content><author><name>Ann</name></author></entry>
+<entry><title>No date</title><link href="https://x/b"/><summary>s</summary></entry></feed>"""
+
+RSS_WITH_HINTS = b"""<?xml version="1.0"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"
+xmlns:sy="http://purl.org/rss/1.0/modules/syndication/"><channel><title>t</title><ttl>30</ttl>
+<sy:updatePeriod>hourly</sy:updatePeriod><item><title>C</title><link>https://x/c</link>
+<pubDate>Mon, 04 Aug 2025 12:00:00 GMT</pubDate><content:encoded><![CDATA[<p>Only content</p>]]></content:encoded>
+</item></channel></rss>"""
+
+
+@pytest.fixture(autouse=True)
+def stop_pool():
+    yield
+    shutdown_parse_pool()
+
+
+@pytest.mark.parametrize("body", [make_feed(20, body_size=500), ATOM, RSS_WITH_HINTS])
+def test_compact_results_read_like_feedparser(body):
+    parsed = feedparser.parse(body)
+    rebuilt = expand_feed(compact_feed(body, {}))
+
+    assert len(rebuilt.entries) == len(parsed.entries) > 0
+    for original, entry in zip(parsed.entries, rebuilt.entries):
+        assert get_entry_key(entry) == get_entry_key(original)
+        assert entry_digest(entry) == entry_digest(original)
+        assert entry_timestamp(entry) == entry_timestamp(original)
+        assert extract_post_data(entry) == extract_post_data(original)
+
+
+def test_channel_hints_survive():
+    rebuilt = expand_feed(compact_feed(RSS_WITH_HINTS, {}))
+
+    assert rebuilt.feed == {"ttl": "30", "sy_updateperiod": "hourly"}
+
+
+def test_compact_results_are_smaller_than_feedparser_results():
+    body = make_feed(20)
+
+    assert len(pickle.dumps(compact_feed(body, {}))) < len(pickle.dumps(feedparser.parse(body))) / 2
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_feeds_keeps_input_order(workers):
+    bodies = [(make_feed(count, body_size=200), {"Content-Type": "application/rss+xml"}) for count in (3, 1, 2)]
+    bodies.append((b"<rss><channel></channel></rss>", {}))
+
+    feeds = parse_feeds(bodies, workers)
+
+    assert [len(feed.entries) for feed in feeds[:3]] == [3, 1, 2]
+    assert feeds[3] is None
+
+
+def test_pool_is_started_once_whatever_the_batch_size():
+    bodies = [(make_feed(2, body_size=200), {})] * 4
+
+    parse_feeds(bodies, 2)
+    pool = parse_pool()
+    parse_feeds(bodies, 3)
+    parse_feeds(bodies[:1], 2)
+
+    assert parse_pool() is pool
@@ -0,0 +1,62 @@
+"""
+Behavior checks for the pipeline stages timed by benchmarks/bench_pipeline.py.
+
+The benchmark measures how fast each stage is; these tests run the same
+stages on small synthetic feeds and check what they produce.
+"""
+
+import feedparser
+import pytest
+from benchmarks.synthetic import html_body, make_feed
+from src.config import SNIPPET_LENGTH
+from src.discord_poster import DispatchDiscordPoster, build_embeds
+from src.embed_packing import EMBED_TOTAL_LIMIT, EMBEDS_PER_MESSAGE, embed_length, pack_embeds
+from src.rss_handler import extract_post_data, get_latest_dispatch_posts
+from src.stream_parser import FeedEntry
+
+SIZE = 25
+
+
+@pytest.fixture(scope="module")
+def feed():
+    # Entries an hour apart, so a one-hour window sees one new post
+    return feedparser.parse(make_feed(SIZE, body_size=200))
+
+
+def test_filter_finds_posts_in_the_window(feed):
+    assert [post.guid for post in get_latest_dispatch_posts(feed, hours_back=1)] == ["post-0"]
+    assert len(get_latest_dispatch_posts(feed, hours_back=SIZE + 1)) == SIZE
+
+
+@pytest.mark.parametrize("body_size", [1_000, 1_000_000])
+def test_extract_post_data_bounds_the_snippet(body_size):
+    entry = FeedEntry(title="Dispatch post: hunting notes", link="https://dispatch.thorcollective.com/p/post",
+                      id="post", author="Ask-a-Thrunter", published="Mon, 04 Aug 2025 12:00:00 GMT",
+                      summary=html_body(body_size))
+
+    post = extract_post_data(entry)
+
+    assert post.guid == "post" and post.author == "Ask-a-Thrunter"
+    assert 0 < len(post.content_snippet) <= SNIPPET_LENGTH + 3
+    assert "<" not in post.content_snippet
+
+
+def test_format_dispatch_message_fits_discord_limit():
+    content = "Threat hunting notes. " * 250
+    message = DispatchDiscordPoster(channel_id="0").format_dispatch_message(
+        "Dispatch post", "dispatch.thorcollective.com/p/post", content
+    )
+
+    assert len(message) <= 2000
+    assert "https://dispatch.thorcollective.com/p/post" in message
+
+
+def test_embeds_are_packed_into_messages(feed):
+    posts = get_latest_dispatch_posts(feed, hours_back=SIZE + 1)
+    embeds = build_embeds(posts)
+    groups = pack_embeds(embeds)
+
+    assert len(embeds) == SIZE
+    assert len(groups) == -(-SIZE // EMBEDS_PER_MESSAGE)
+    for group in groups:
+        assert sum(embed_length(embeds[i]) for i in group) <= EMBED_TOTAL_LIMIT
@@ -0,0 +1,44 @@
+"""Tests for the adaptive poll schedule."""
+
+from src.feeds import FeedConfig
+from src.poll_scheduler import PollScheduler
+
+FEED = FeedConfig(name="Dispatch", url="https://dispatch.example.com/feed", channel_id="1")
+NOW = 1_800_000_000.0
+
+
+def test_new_feed_is_due():
+    assert PollScheduler().due([FEED], now=NOW) == [FEED]
+
+
+def test_quiet_feed_backs_off_up_to_the_cap():
+    scheduler = PollScheduler(min_interval=300, max_interval=2400, slack=0)
+    now = NOW
+    intervals = []
+    for _ in range(6):
+        interval = scheduler.observe(FEED, None, now=now)
+        intervals.append(interval)
+        assert scheduler.due([FEED], now=now + interval - 1) == []
+        now += interval
+        assert scheduler.due([FEED], now=now) == [FEED]
+
+    assert intervals == [600, 1200, 2400, 2400, 2400, 2400]
+
+
+def test_lookback_covers_time_since_last_poll():
+    scheduler = PollScheduler(min_interval=300, max_interval=4 * 3600, slack=0)
+    assert scheduler.lookback_hours(FEED, now=NOW) == FEED.hours_back
+
+    scheduler.observe(FEED, None, now=NOW)
+
+    assert scheduler.lookback_hours(FEED, now=NOW + 3 * 3600) == 3
+
+
+def test_schedule_is_persisted():
+    scheduler = PollScheduler(min_interval=300, max_interval=2400, slack=0)
+    interval = scheduler.observe(FEED, None, now=NOW)
+    scheduler.close()
+
+    reloaded = PollScheduler(min_interval=300, max_interval=2400, slack=0)
+
+    assert reloaded.due([FEED], now=NOW + interval - 1) == []
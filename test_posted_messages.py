@@ -0,0 +1,126 @@
+"""Tests for post content digests and detecting edited posts."""
+
+import time
+from email.utils import formatdate
+from src.post import EMBED_DESCRIPTION_LENGTH, DispatchPost
+from src.posted_messages import PostedMessages
+from src.rss_handler import extract_post_data, stream_stop_condition
+from src.seen_index import SeenIndex
+from src.stream_parser import FeedEntry
+
+
+def entry(guid, title="Hunting notes", summary="<p>What we found.</p>", **fields):
+    return FeedEntry({"id": guid, "title": title, "link": f"https://dispatch.example.com/p/{guid}", "summary": summary,
+                      "author": "Ask-a-Thrunter", "published": "Mon, 04 Aug 2025 12:00:00 GMT", **fields})
+
+
+def posted(*entries, channel_id="42", message_id=1000):
+    messages = PostedMessages()
+    for item in entries:
+        messages.record(channel_id, extract_post_data(item), message_id)
+    return messages
+
+
+def test_digest_covers_only_what_discord_shows():
+    post = extract_post_data(entry("a"))
+
+    assert post.digest() == extract_post_data(entry("other-guid", link=post.link)).digest()
+    assert post.digest() == extract_post_data(entry("a", published="Tue, 05 Aug 2025 12:00:00 GMT")).digest()
+    assert post.digest() != extract_post_data(entry("a", title="Hunting notes, fixed")).digest()
+    assert post.digest() != extract_post_data(entry("a", author="Someone else")).digest()
+
+
+def test_digest_ignores_text_past_the_embed_description():
+    base = DispatchPost("Title", "https://x", content_snippet="x" * EMBED_DESCRIPTION_LENGTH)
+    longer = DispatchPost("Title", "https://x", content_snippet="x" * EMBED_DESCRIPTION_LENGTH + "more")
+
+    assert base.digest() == longer.digest()
+
+
+def test_unchanged_and_untracked_entries_are_not_edited():
+    messages = posted(entry("a"))
+
+    assert messages.changed_posts([entry("a"), entry("untracked", title="Changed?")]) == []
+
+
+def test_changed_entries_are_found():
+    messages = posted(entry("a"), entry("b"))
+
+    changed = messages.changed_posts([entry("a", title="Hunting notes, fixed"), entry("b")])
+
+    assert [(post.guid, post.title) for post, _ in changed] == [("a", "Hunting notes, fixed")]
+
+
+def test_invisible_raw_changes_are_remembered_without_an_edit():
+    messages = posted(entry("a"))
+    reformatted = entry("a", summary="<div>What   we found.</div>")
+
+    assert messages.changed_posts([reformatted]) == []
+    assert messages._posts["a"]["raw"] is not None
+
+    # The next run skips the entry on the raw digest alone
+    messages._posts["a"]["digest"] = "stale"
+    assert messages.changed_posts([reformatted]) == []
+
+
+def test_edits_rebuild_every_post_of_a_shared_message():
+    messages = posted(entry("a"), entry("b"))
+    messages.record("43", extract_post_data(entry("a")), 2000)
+    fixed = extract_post_data(entry("a", title="Hunting notes, fixed"))
+
+    edits = messages.edits_for([fixed])
+
+    assert [(edit.channel_id, edit.message_id) for edit in edits] == [("42", "1000"), ("43", "2000")]
+    assert [post.title for post in edits[0].posts] == ["Hunting notes, fixed", "Hunting notes"]
+    assert edits[1].posts == [fixed]
+
+
+def test_committed_edits_are_not_repeated():
+    messages = posted(entry("a"))
+    (post, raw), = messages.changed_posts([entry("a", title="Hunting notes, fixed")])
+
+    messages.commit(post, raw)
+
+    assert messages.changed_posts([entry("a", title="Hunting notes, fixed")]) == []
+
+
+def test_tracked_posts_persist_and_expire():
+    messages = posted(entry("a"))
+    messages.close()
+
+    reloaded = PostedMessages()
+    assert "a" in reloaded
+    assert reloaded.messages_of("a") == [("42", "1000")]
+
+    reloaded.prune(now=time.time() + reloaded.max_age + 1)
+    assert len(reloaded) == 0
+    assert reloaded._messages == {}
+
+
+def test_oldest_published_bounds_the_tracked_posts():
+    assert PostedMessages().oldest_published() is None
+
+    messages = posted(entry("a"), entry("b", published="Sun, 03 Aug 2025 12:00:00 GMT"))
+    assert messages.oldest_published() == 1754222400.0
+
+    messages.record("42", extract_post_data(entry("c", published="")), 1001)
+    assert messages.oldest_published() == 0.0
+
+
+def test_stream_reads_on_to_the_oldest_tracked_post():
+    now = time.time()
+    feed_url = "https://dispatch.example.com/feed"
+    entries = [entry(f"p{age}", published=formatdate(now - age * 3600, usegmt=True)) for age in (0.5, 2, 30, 100)]
+    seen = SeenIndex()
+    seen.mark_seeded(feed_url)
+    for item in entries[1:]:
+        seen.add(item["id"])
+
+    def stops(edit_horizon=None):
+        should_stop = stream_stop_condition(1, seen, feed_url, edit_horizon)
+        return [item["id"] for item in entries if should_stop(item)]
+
+    assert stops() == ["p2", "p30", "p100"]
+    # Posted entries newer than the horizon may still have been edited
+    assert stops(edit_horizon=now - 50 * 3600) == ["p100"]
+    assert stops(edit_horizon=0.0) == []
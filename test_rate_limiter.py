@@ -0,0 +1,81 @@
+"""Tests for the header-driven Discord rate limiter."""
+
+import asyncio
+import time
+import pytest
+from src.rate_limiter import RateLimiter, major_parameter, route_key
+
+CHANNEL_1 = route_key("POST", "/channels/100000000000000001/messages")
+CHANNEL_2 = route_key("POST", "/channels/100000000000000002/messages")
+
+
+def headers(remaining, reset_after, bucket="channel-messages-hash"):
+    return {"X-RateLimit-Bucket": bucket, "X-RateLimit-Limit": "5",
+            "X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset-After": str(reset_after)}
+
+
+def blocks(limiter, route, timeout=0.2):
+    """Whether acquiring the route would wait longer than timeout."""
+    async def attempt():
+        try:
+            await asyncio.wait_for(limiter.acquire(route), timeout)
+        except asyncio.TimeoutError:
+            return True
+        return False
+    return asyncio.run(attempt())
+
+
+def test_route_key_keeps_major_parameter():
+    assert route_key("PATCH", "/channels/123456789/messages/987654321") == "PATCH /channels/123456789/messages/{id}"
+    assert major_parameter(CHANNEL_1) == "100000000000000001"
+    assert major_parameter(route_key("GET", "/users/@me")) == ""
+
+
+def test_channels_sharing_a_bucket_hash_keep_separate_budgets():
+    limiter = RateLimiter()
+    # Discord reports the same hash for both channels, but the heavy channel
+    # is exhausted while the light one still has budget
+    limiter.update(CHANNEL_1, headers(remaining=0, reset_after=5))
+    limiter.update(CHANNEL_2, headers(remaining=4, reset_after=5))
+
+    assert blocks(limiter, CHANNEL_1)
+    assert not blocks(limiter, CHANNEL_2)
+
+
+def test_light_channel_is_not_held_up_by_a_heavy_one():
+    limiter = RateLimiter()
+    limiter.update(CHANNEL_2, headers(remaining=4, reset_after=5))
+    limiter.update(CHANNEL_1, headers(remaining=0, reset_after=5))
+
+    assert not blocks(limiter, CHANNEL_2)
+    assert limiter.waits == 0
+
+
+def test_budget_is_spent_per_request_until_reset():
+    limiter = RateLimiter()
+    limiter.update(CHANNEL_1, headers(remaining=2, reset_after=5))
+
+    assert not blocks(limiter, CHANNEL_1)
+    assert not blocks(limiter, CHANNEL_1)
+    assert blocks(limiter, CHANNEL_1)
+
+
+def test_429_pauses_only_its_channel():
+    limiter = RateLimiter()
+    limiter.update(CHANNEL_1, headers(remaining=3, reset_after=5))
+    limiter.update(CHANNEL_2, headers(remaining=3, reset_after=5))
+    limiter.rate_limited_for(CHANNEL_1, retry_after=5)
+
+    assert blocks(limiter, CHANNEL_1)
+    assert not blocks(limiter, CHANNEL_2)
+
+
+@pytest.mark.parametrize("is_global", [True, False])
+def test_429_waits_exactly_retry_after(is_global):
+    limiter = RateLimiter()
+    limiter.rate_limited_for(CHANNEL_1, retry_after=0.3, is_global=is_global)
+
+    start = time.monotonic()
+    asyncio.run(limiter.acquire(CHANNEL_2 if is_global else CHANNEL_1))
+
+    assert 0.25 <= time.monotonic() - start < 1.0
@@ -0,0 +1,190 @@
+"""Tests for the retry policy, run deadline and per-feed circuit breaker."""
+
+import asyncio
+import ssl
+import aiohttp
+import pytest
+import requests
+import src.retry
+from src.config import BREAKER_COOLDOWN, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_COOLDOWN
+from src.discord_rest import DiscordRestError
+from src.retry import (
+    CircuitBreaker, DeadlineExceeded, backoff_delay, is_retryable, retry_async, retry_call, set_run_deadline
+)
+
+FEED = "https://dispatch.example.com/feed"
+NOW = 1_800_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(src.retry, "RETRY_DELAY", 0.001)
+
+
+def failing(errors, result="ok"):
+    """Operation raising the given errors in turn, then returning result."""
+    errors = list(errors)
+    calls = []
+
+    def operation():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+    operation.calls = calls
+    return operation
+
+
+def test_errors_are_classified_by_status_and_type():
+    assert is_retryable(DiscordRestError(503, "Service Unavailable"))
+    assert not is_retryable(DiscordRestError(403, "Missing Access"))
+    assert is_retryable(asyncio.TimeoutError())
+    assert is_retryable(ConnectionResetError())
+    assert not is_retryable(ValueError("bad feed"))
+    assert not is_retryable(DeadlineExceeded())
+
+
+def test_permanent_os_errors_are_not_retried():
+    assert not is_retryable(FileNotFoundError("feeds.json"))
+    assert not is_retryable(PermissionError("state dir"))
+    assert not is_retryable(ssl.SSLCertVerificationError("certificate verify failed"))
+
+
+def test_client_library_errors_are_classified():
+    assert is_retryable(aiohttp.ServerDisconnectedError())
+    assert is_retryable(aiohttp.ClientPayloadError("truncated body"))
+    assert not is_retryable(aiohttp.ClientSSLError(None, ssl.SSLError()))
+    assert is_retryable(requests.ConnectionError())
+    assert is_retryable(requests.Timeout())
+    assert not is_retryable(requests.exceptions.SSLError())
+    assert not is_retryable(requests.HTTPError(response=type("Response", (), {"status_code": 404})()))
+
+
+def test_discord_rate_limits_are_only_retried_by_the_client():
+    # Discord clients raise a 429 only after waiting out retry_after themselves
+    assert not is_retryable(DiscordRestError(429, "Too Many Requests", retry_after=1))
+    assert is_retryable(aiohttp.ClientResponseError(None, (), status=429))
+
+
+def test_backoff_is_jittered_and_respects_retry_after():
+    delays = [backoff_delay(3) for _ in range(200)]
+    assert all(0 <= delay <= src.retry.RETRY_DELAY * 8 for delay in delays)
+    assert len(set(delays)) > 1
+    assert backoff_delay(0, DiscordRestError(429, "Too Many Requests", retry_after=2.5)) >= 2.5
+
+
+def test_transient_failures_are_retried():
+    operation = failing([ConnectionResetError(), DiscordRestError(502, "Bad Gateway")])
+
+    assert retry_call(operation, "test", retries=3) == "ok"
+    assert len(operation.calls) == 3
+
+
+def test_fatal_failures_are_not_retried():
+    operation = failing([DiscordRestError(404, "Unknown Channel")])
+
+    with pytest.raises(DiscordRestError):
+        retry_call(operation, "test", retries=3)
+    assert len(operation.calls) == 1
+
+
+def test_retries_give_up_after_the_limit():
+    operation = failing([TimeoutError()] * 5)
+
+    with pytest.raises(TimeoutError):
+        retry_call(operation, "test", retries=2)
+    assert len(operation.calls) == 3
+
+
+def test_retries_stop_at_the_run_deadline():
+    set_run_deadline(0.05)
+    operation = failing([DiscordRestError(503, "Service Unavailable", retry_after=1)])
+
+    with pytest.raises(DiscordRestError):
+        retry_call(operation, "test", retries=3)
+    assert len(operation.calls) == 1
+
+
+def test_nothing_starts_after_the_run_deadline():
+    set_run_deadline(0.001)
+    asyncio.run(asyncio.sleep(0.01))
+
+    async def operation():
+        return "ok"
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(retry_async(operation, "test"))
+
+
+def test_async_retries():
+    attempts = []
+
+    async def operation():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise asyncio.TimeoutError()
+        return "ok"
+
+    assert asyncio.run(retry_async(operation, "test")) == "ok"
+    assert len(attempts) == 2
+
+
+def open_circuit(breaker, now=NOW):
+    opened = [breaker.record_failure(FEED, now=now) for _ in range(BREAKER_FAILURE_THRESHOLD)]
+    assert opened == [False] * (BREAKER_FAILURE_THRESHOLD - 1) + [True]
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker()
+    open_circuit(breaker)
+
+    assert not breaker.allow(FEED, now=NOW + BREAKER_COOLDOWN - 1)
+    assert breaker.open_until(FEED) == NOW + BREAKER_COOLDOWN
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker()
+    breaker.record_failure(FEED, now=NOW)
+    breaker.record_failure(FEED, now=NOW)
+    breaker.record_success(FEED)
+
+    assert not breaker.record_failure(FEED, now=NOW)
+    assert breaker.allow(FEED, now=NOW)
+
+
+def test_half_open_trial_success_closes_the_circuit():
+    breaker = CircuitBreaker()
+    open_circuit(breaker)
+
+    # After the cooldown one trial fetch is let through
+    assert breaker.allow(FEED, now=NOW + BREAKER_COOLDOWN)
+    breaker.record_success(FEED)
+
+    assert breaker.open_until(FEED) == 0
+    assert not breaker.record_failure(FEED, now=NOW + BREAKER_COOLDOWN)
+
+
+def test_half_open_trial_failure_reopens_for_longer():
+    breaker = CircuitBreaker()
+    open_circuit(breaker)
+    now = NOW + BREAKER_COOLDOWN
+
+    assert breaker.record_failure(FEED, now=now)
+    assert breaker.open_until(FEED) == now + 2 * BREAKER_COOLDOWN
+
+    # The cooldown keeps doubling up to the cap
+    for _ in range(10):
+        now = breaker.open_until(FEED)
+        breaker.record_failure(FEED, now=now)
+    assert breaker.open_until(FEED) == now + BREAKER_MAX_COOLDOWN
+
+
+def test_circuit_state_is_persisted():
+    breaker = CircuitBreaker()
+    open_circuit(breaker)
+    breaker.close()
+
+    reloaded = CircuitBreaker()
+
+    assert not reloaded.allow(FEED, now=NOW + 1)
+    assert reloaded.allow("https://other.example.com/feed", now=NOW + 1)
@@ -0,0 +1,99 @@
+"""Tests for the seen index and the per-feed bootstrap of new posts."""
+
+import time
+from email.utils import formatdate
+from src.rss_handler import get_latest_dispatch_posts
+from src.seen_index import SeenIndex
+from src.stream_parser import FeedEntry, StreamedFeed
+
+FEED_A = "https://a.example.com/feed"
+FEED_B = "https://b.example.com/feed"
+
+
+def make_feed(name, hours_old):
+    """Feed with one entry per age, newest first."""
+    now = time.time()
+    return StreamedFeed([
+        FeedEntry(id=f"{name}-{age}", title=f"{name} post {age}h old", link=f"https://{name}.example.com/p/{age}",
+                  published=formatdate(now - age * 3600, usegmt=True), summary="Summary")
+        for age in hours_old
+    ])
+
+
+def test_first_run_posts_only_the_feeds_window():
+    seen = SeenIndex()
+    posts = get_latest_dispatch_posts(make_feed("a", [0.5, 30, 100]), hours_back=1, seen=seen, feed_url=FEED_A)
+
+    assert [post.guid for post in posts] == ["a-0.5"]
+    assert "a-30" in seen and "a-100" in seen
+    assert seen.is_seeded(FEED_A)
+
+
+def test_feed_added_later_is_bootstrapped_on_its_own():
+    seen = SeenIndex()
+    get_latest_dispatch_posts(make_feed("a", [0.5, 2]), hours_back=1, seen=seen, feed_url=FEED_A)
+    assert len(seen) > 0
+
+    # The index is no longer empty, but feed B has never been seeded
+    posts = get_latest_dispatch_posts(make_feed("b", [0.5, 30, 60, 100]), hours_back=1, seen=seen, feed_url=FEED_B)
+
+    assert [post.guid for post in posts] == ["b-0.5"]
+    assert all(f"b-{age}" in seen for age in (30, 60, 100))
+    assert seen.is_seeded(FEED_B)
+
+
+def test_seeded_feed_catches_up_on_unseen_posts():
+    seen = SeenIndex()
+    get_latest_dispatch_posts(make_feed("a", [2]), hours_back=1, seen=seen, feed_url=FEED_A)
+
+    # A post missed by skipped runs is still new while younger than SEEN_MAX_AGE_HOURS
+    posts = get_latest_dispatch_posts(make_feed("a", [30, 2]), hours_back=1, seen=seen, feed_url=FEED_A)
+
+    assert [post.guid for post in posts] == ["a-30"]
+
+
+def test_seeded_feeds_are_persisted():
+    get_latest_dispatch_posts(make_feed("a", [2]), hours_back=1, seen=SeenIndex(), feed_url=FEED_A)
+
+    reloaded = SeenIndex()
+
+    assert reloaded.is_seeded(FEED_A)
+    assert not reloaded.is_seeded(FEED_B)
+
+
+def test_keeps_newest_keys_and_compacts_log(state_dir):
+    path = str(state_dir / "seen.log")
+    seen = SeenIndex(path, max_entries=3)
+    for i in range(7):
+        seen.add(f"key-{i}")
+
+    assert len(seen) == 3
+    assert "key-3" not in seen and "key-6" in seen
+    # The 7th append took the log past twice the cap and rewrote it
+    with open(path, encoding="utf-8") as f:
+        assert f.read().split() == ["key-4", "key-5", "key-6"]
+
+    reloaded = SeenIndex(path, max_entries=3)
+    assert ["key-4" in reloaded, "key-5" in reloaded, "key-6" in reloaded] == [True, True, True]
+
+
+def test_duplicate_keys_are_not_logged_twice(state_dir):
+    path = str(state_dir / "seen.log")
+    seen = SeenIndex(path)
+    seen.add("key")
+    seen.add(" key ")
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "key\n"
+
+
+def test_membership_survives_a_reload(state_dir):
+    path = str(state_dir / "seen.log")
+    seen = SeenIndex(path)
+    seen.add("https://dispatch.example.com/p/1")
+
+    reloaded = SeenIndex(path)
+
+    assert "https://dispatch.example.com/p/1" in reloaded
+    assert "https://dispatch.example.com/p/2" not in reloaded
+    assert len(reloaded) == 1
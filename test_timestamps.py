@@ -0,0 +1,88 @@
+"""Tests for feed date normalization."""
+
+import time
+import pytest
+import src.timestamps
+from src.timestamps import entry_timestamp, parse_iso8601, parse_rfc822, parse_timestamp, struct_time_to_epoch
+
+# 2025-08-04 12:00:00 UTC
+NOON = 1754308800.0
+
+
+@pytest.mark.parametrize("text", [
+    "Mon, 04 Aug 2025 12:00:00 GMT",
+    "Mon, 04 Aug 2025 12:00:00 +0000",
+    "04 Aug 2025 12:00 UT",
+    "Mon,04 August 2025 12:00:00 Z",
+    "Mon, 04 Aug 25 12:00:00 GMT",
+    "Mon, 04 Aug 2025 08:00:00 EDT",
+    "Mon, 04 Aug 2025 14:30:00 +0230",
+    "Mon, 04 Aug 2025 12:00:00",
+])
+def test_rfc822_fast_path(text):
+    assert parse_rfc822(text) == NOON
+
+
+@pytest.mark.parametrize("text", [
+    "Mon, 31 Feb 2025 12:00:00 GMT",  # impossible date
+    "Mon, 04 Foo 2025 12:00:00 GMT",  # unknown month
+    "Mon, 04 Aug 2025 12:00:00 XYZ",  # unknown zone
+    "2025-08-04T12:00:00Z",
+])
+def test_rfc822_rejects_other_formats(text):
+    assert parse_rfc822(text) is None
+
+
+@pytest.mark.parametrize("text", [
+    "2025-08-04T12:00:00Z",
+    "2025-08-04T12:00:00+00:00",
+    "2025-08-04T14:00:00+02:00",
+    "2025-08-04T12:00:00",  # naive values are UTC
+    "2025-08-04T12:00:00.000Z",
+])
+def test_iso8601_fast_path(text):
+    assert parse_iso8601(text) == NOON
+
+
+def test_dateutil_is_only_the_fallback(monkeypatch):
+    calls = []
+    fallback = src.timestamps._parse_with_dateutil
+    monkeypatch.setattr(src.timestamps, "_parse_with_dateutil", lambda text: calls.append(text) or fallback(text))
+
+    assert parse_timestamp("Mon, 04 Aug 2025 12:00:00 GMT") == NOON
+    assert parse_timestamp("2025-08-04T12:00:00Z") == NOON
+    assert calls == []
+
+    assert parse_timestamp("August 4, 2025 12:00 UTC") == NOON
+    assert calls == ["August 4, 2025 12:00 UTC"]
+
+
+def test_unparseable_dates():
+    assert parse_timestamp(None) is None
+    assert parse_timestamp("") is None
+    assert parse_timestamp("not a date") is None
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    """Run with the runner's clock set far from UTC."""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_struct_time_is_read_as_utc_whatever_the_local_zone(local_timezone):
+    value = time.gmtime(NOON)
+
+    # time.mktime would read the UTC value as local time and be hours off
+    assert time.mktime(value) != NOON
+    assert struct_time_to_epoch(value) == NOON
+
+
+def test_entry_timestamp_prefers_parsed_fields():
+    assert entry_timestamp({"published_parsed": time.gmtime(NOON), "published": "garbage"}) == NOON
+    assert entry_timestamp({"updated_parsed": time.gmtime(NOON)}) == NOON
+    assert entry_timestamp({"updated": "2025-08-04T12:00:00Z"}) == NOON
+    assert entry_timestamp({}) is None
@@ -0,0 +1,30 @@
+"""Tests for the WebSub push signature check."""
+
+import hashlib
+import hmac
+from src.websub import verify_signature
+
+SECRET = "subscription-secret"
+BODY = b"<rss><channel><item><title>Pushed</title></item></channel></rss>"
+
+
+def sign(algorithm, secret=SECRET, body=BODY):
+    return f"{algorithm}=" + hmac.new(secret.encode(), body, getattr(hashlib, algorithm)).hexdigest()
+
+
+def test_accepts_valid_signatures():
+    for algorithm in ("sha1", "sha256", "sha384", "sha512"):
+        assert verify_signature(SECRET, BODY, sign(algorithm))
+    assert verify_signature(SECRET, BODY, sign("sha256").upper().replace("SHA256=", "sha256="))
+
+
+def test_rejects_wrong_secret_or_body():
+    assert not verify_signature(SECRET, BODY, sign("sha256", secret="wrong"))
+    assert not verify_signature(SECRET, BODY + b" ", sign("sha256"))
+
+
+def test_rejects_missing_or_unknown_signatures():
+    assert not verify_signature(SECRET, BODY, None)
+    assert not verify_signature(SECRET, BODY, "")
+    assert not verify_signature(SECRET, BODY, "md5=" + hashlib.md5(BODY).hexdigest())
+    assert not verify_signature(SECRET, BODY, "sha256")